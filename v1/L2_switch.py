@@ -1,12 +1,12 @@
 #!/usr/bin/python3
-import re
+from typing import Any
 from collections import defaultdict
-from datetime import datetime
 from pexpect import TIMEOUT
 # user's modules
 from base_switch import BaseSwitch
 from const import Provider, CitySwitch
 from my_exception import MyException, ExceptionType
+from log_parser import PortFlapLogParser
 import commands
 
 
@@ -15,6 +15,7 @@ import commands
 class L2Switch(BaseSwitch):
     __ports: int
     __user_port: str
+    __tables: dict[str, Any]
 
     # L2 manager inits by user's port and base constructor
     def __init__(self, ipaddress: str, user_port: int, print_output: bool = False) -> None:
@@ -23,10 +24,26 @@ class L2Switch(BaseSwitch):
         # user's port
         self.__user_port = user_port
 
+        # switch-wide outputs, filled only when all users of switch are diagnosed by one session
+        self.__tables = {}
+
         # remember number of ports for this switch and then save base model for further diagnosing
         self.__ports = commands.SWITCHES[self._model]["ports"]
         self._model = commands.SWITCHES[self._model]["base_switch"]
     
+    # move to another user's port of the same switch
+    def set_user_port(self, user_port: int) -> None:
+        self.__user_port = user_port
+    
+    # read switch-wide tables once, then every port is parsed from them without new commands
+    def preload_switch_tables(self) -> None:
+        # tables are read from switch even if they were preloaded before
+        self.__tables = {}
+        self.__tables = {"vlans": self.get_switch_vlans(),
+                         "dhcp_relay": self.get_dhcp_relay(),
+                         "acl": self.__read_access_profile(),
+                         "fdb": self.__read_fdb()}
+    
     # return True is user's port is inside switch's portlist
     def check_port_in_portlist(self) -> bool:
         return self.__user_port <= self.__ports
@@ -82,73 +99,37 @@ class L2Switch(BaseSwitch):
 
         # save output and test different patterns
         temp = self._session.before.decode("utf-8")
-        match = re.search(command_regex["regex"], temp)
+        match = commands.pattern(command_regex["regex"]).search(temp)
         
         # if it's patterns with pairs' lengths, return list
         if match.group(1):
-            return re.findall(command_regex["findall"], temp)
+            return commands.pattern(command_regex["findall"]).findall(temp)
         # if it's just a diagnose, return string
         return match.group(11)
     
-    # check log if port is flapping
+    # check log if port is flapping, scrolling stops as soon as next pages can't change the verdict
     def get_log_port_flapping(self) -> tuple[int, int]:
         # clipaging is necessary to check limited log output
         self._turn_on_clipaging()
         
         # command, expect log's continuation or end
         command_regex = commands.show_log(self._model, self.__user_port)
+        parser = PortFlapLogParser(self._model, command_regex)
         self._session.sendline(command_regex["command"])
         index = self._session.expect(["CTRL", "#"])
         
-        # save and parse log
-        log = self._session.before.decode("utf-8")
-        match = re.search(command_regex["login_and_first"], log)
-        
-        # try to parse datetime while scrolling log
+        # parse each page once while scrolling log
         try:
-            # find login and the earliest displayed time, for 1210, datetime consists of month, day and day, year is current year
-            if self._model == "DGS-1210-28/ME":
-                login_datetime = datetime.strptime(str(datetime.now().year) + " " + " ".join(match.group(1, 2, 3)), command_regex["format"])
-                first_datetime = datetime.strptime(str(datetime.now().year) + " " + " ".join(match.group(4, 5, 6)), command_regex["format"])
-                # when new year comes
-                if first_datetime.month > login_datetime.month:
-                    first_datetime = first_datetime.replace(year=first_datetime.year - 1)
-            # for other, datetime consists of date and time
-            else:
-                login_datetime = datetime.strptime(match.group(1) + " " + match.group(2), command_regex["format"])
-                first_datetime = datetime.strptime(match.group(3) + " " + match.group(4), command_regex["format"])
+            parser.feed(self._session.before.decode("utf-8"))
             
-            # find the difference between login time and the earliest displayed time
-            range_minutes_difference = int((login_datetime - first_datetime).total_seconds() // 60)
-            
-            # scroll until end found or range max time difference reached
-            while index == 0 and range_minutes_difference < CitySwitch.MAX_MINUTE_RANGE_PORT_FLAPPING:
+            # scroll until end found or verdict is known
+            while index == 0 and not parser.is_decided():
                 # command to scroll, decide is it continuation or end
                 self._session.send(" ")
                 index = self._session.expect(["CTRL", "#"])
-                
-                # parse current log output
-                current_log = self._session.before.decode("utf-8")
-                match = re.search(command_regex["first"], current_log)
-                
-                # if no datetime found while new page scanning, it means new page is empty
-                if not match:
+                parser.feed(self._session.before.decode("utf-8"))
+                if parser.empty_page:
                     break
-                
-                # find the earliest displayed time, for 1210, also check year's switching
-                if self._model == "DGS-1210-28/ME":
-                    first_datetime = datetime.strptime(str(datetime.now().year) + " " + " ".join(match.group(1, 2, 3)), command_regex["format"])
-                    if first_datetime.month > login_datetime.month:
-                        first_datetime = first_datetime.replace(year=first_datetime.year - 1)
-                # for other
-                else:
-                    first_datetime = datetime.strptime(match.group(1) + " " + match.group(2), command_regex["format"])
-                
-                # update range time difference
-                range_minutes_difference = int((login_datetime - first_datetime).total_seconds() // 60)
-                
-                # update log variable
-                log += current_log
         
         # if datetime on switch is couldn't be parsed
         except ValueError:
@@ -166,29 +147,21 @@ class L2Switch(BaseSwitch):
         # get back to disabled clipaging
         self._turn_off_clipaging()
         
-        # try to find last port flapping, return 0 if not found
-        match = re.search(command_regex["regex"], log)
-        if not match:
-            return 0, 0
-        
-        # find last port flap, for 1210
-        if self._model == "DGS-1210-28/ME":
-            last_flap_datetime = datetime.strptime(str(datetime.now().year) + " " + " ".join(match.group(1, 2, 3)), command_regex["format"])
-        # for other
-        else:
-            last_flap_datetime = datetime.strptime(match.group(1) + " " + match.group(2), command_regex["format"])
-        
-        # find the difference between login time and last port flapping time
-        last_flap_login_minutes_difference = int((login_datetime - last_flap_datetime).total_seconds() // 60)
-        
-        # find the count of port flapping and return it with the time difference
-        count_port_flapping = len(re.findall(command_regex["findall"], log))
-        return count_port_flapping, last_flap_login_minutes_difference
+        # count of port flapping found before verdict and time difference between login and last flap, 0 if not found
+        return parser.count, parser.last_flap_minutes
     
     # get mac addresses on port, method is used for L2Protocol
     def get_mac_addresses(self) -> set[str]:
-        # command, expect cli prompt or timeout 
         command_regex = commands.show_fdb(self._model, self.__user_port)
+        
+        # from preloaded fdb, mac flooding is decided by count as output of the whole table is long anyway
+        if "fdb" in self.__tables:
+            macs = {i[2] for i in commands.pattern(command_regex["regex"]).findall(self.__tables["fdb"])}
+            if len(macs) >= CitySwitch.MAC_FLOODING_COUNT:
+                raise MyException(ExceptionType.MAC_FLOODING_ON_PORT)
+            return macs
+        
+        # command, expect cli prompt or timeout 
         self._session.sendline(command_regex["command"])
         index = self._session.expect(["#", TIMEOUT], timeout=2)
 
@@ -202,7 +175,7 @@ class L2Switch(BaseSwitch):
             raise MyException(ExceptionType.MAC_FLOODING_ON_PORT)
         
         # otherwise, get rows as "vid vlan mac type" and return set of macs
-        matches = re.findall(command_regex["regex"], self._session.before.decode("utf-8"))
+        matches = commands.pattern(command_regex["regex"]).findall(self._session.before.decode("utf-8"))
         return {i[2] for i in matches}
     
     # get port security state on port
@@ -245,15 +218,25 @@ class L2Switch(BaseSwitch):
         # return rx and tx bytes as integers
         return tuple(map(int, match.group(2, 3)))
 
+    # read the whole fdb of switch
+    def __read_fdb(self) -> str:
+        self._session.sendline("show fdb")
+        self._session.expect("#", timeout=CitySwitch.SWITCH_TABLE_TIMEOUT)
+        return self._session.before.decode("utf-8")
+    
     # get all vlans on switch
     def get_switch_vlans(self) -> dict[int, str]:
+        # preloaded for all ports
+        if "vlans" in self.__tables:
+            return self.__tables["vlans"]
+        
         # command
         command_regex = commands.show_vlan(self._model)
         self._session.sendline(command_regex["command"])
         self._session.expect("#")
         
         # get vlan_id: vlan_name
-        return {int(vlan_id): vlan_name for vlan_id, vlan_name in re.findall(command_regex["regex"], self._session.before.decode("utf-8"))}
+        return {int(vlan_id): vlan_name for vlan_id, vlan_name in commands.pattern(command_regex["regex"]).findall(self._session.before.decode("utf-8"))}
     
     # get vlans on port
     def get_port_vlans(self) -> dict[str, list[int]]:
@@ -266,7 +249,7 @@ class L2Switch(BaseSwitch):
         port_vlans = defaultdict(list)
         
         # parse entry, X means actual status
-        for match in re.finditer(command_regex["regex"], self._session.before.decode("utf-8")):
+        for match in commands.pattern(command_regex["regex"]).finditer(self._session.before.decode("utf-8")):
             if int(match[1]) not in Provider.VLAN_SKIPPING:   # skip old iptv vlan
                 port_vlans[next(key for key, val in match.groupdict().items() if val == "X")].append(int(match[1]))
         
@@ -275,6 +258,10 @@ class L2Switch(BaseSwitch):
     
     # get dhcp servers and vlan ids from switch's dhcp relay
     def get_dhcp_relay(self) -> tuple[None, None] | tuple[tuple[str], int] | tuple[tuple[str], list[str]]:
+        # preloaded for all ports
+        if "dhcp_relay" in self.__tables:
+            return self.__tables["dhcp_relay"]
+        
         # command
         command_regex = commands.show_dhcp_relay(self._model)
         self._session.sendline(command_regex["command"])
@@ -282,7 +269,7 @@ class L2Switch(BaseSwitch):
 
         # find dhcp servers' addresses
         temp = self._session.before.decode("utf-8")
-        match_servers = re.search(command_regex["servers"], temp)
+        match_servers = commands.pattern(command_regex["servers"]).search(temp)
         
         # if no servers found
         if not match_servers:
@@ -290,13 +277,13 @@ class L2Switch(BaseSwitch):
         
         # for 1210, get vlan ids from vid list
         if self._model == "DGS-1210-28/ME":
-            match_vlan_ids = re.search(command_regex["regex"], temp)
+            match_vlan_ids = commands.pattern(command_regex["regex"]).search(temp)
             return match_servers.group("dhcp_server1", "dhcp_server2"), [i.strip() for i in match_vlan_ids.group("vlan_ids_list").split(",")]
         
         # for 3120 and 3000, check servers and list of vlan ids with servers
         elif self._model in ["DGS-3120-24TC", "DGS-3000-24TC"]:
             # get two strings with primary and secondary dhcp servers and their vlan ids lists
-            servers_vlan_ids = re.search(command_regex["regex"], temp)
+            servers_vlan_ids = commands.pattern(command_regex["regex"]).search(temp)
             # if not found, servers differs from previously found ones or vlan ids lists are different, return empty vlan ids list
             if (not servers_vlan_ids or servers_vlan_ids.group("dhcp_server1", "dhcp_server2") != match_servers.group("dhcp_server1", "dhcp_server2")
                     or servers_vlan_ids.group("vlan_ids_list1") != servers_vlan_ids.group("vlan_ids_list2")):
@@ -310,18 +297,36 @@ class L2Switch(BaseSwitch):
 
     # get acl options on port from overall output
     def get_port_acl(self) -> list[str]:
+        # permit entries of all ports are the same output, preloaded or read now
+        acl = self.__tables["acl"] if "acl" in self.__tables else self.__read_access_profile()
+        command_regex = commands.show_access_profile(self._model, self.__user_port)
+
+        # return found entries
+        if self._model == "DES-3028":
+            # for 3028 two indentical entries
+            return commands.pattern(command_regex["regex"]).findall(acl)
+        elif self._model == "DES-3200-28":
+            # for 3200-28 two identical entries constructed from parts
+            return [l + r for l, r in commands.pattern(command_regex["regex"]).findall(acl)]
+        elif self._model in {"DGS-1210-28/ME", "DGS-3120-24TC", "DGS-3000-24TC", "DGS-3200-24", "DES-3526"}:
+            # for other two different entries for different protocols, one separated in parts
+            match = commands.pattern(command_regex["regex"]).search(acl)
+            return [match.group(1) + match.group(2), match.group(3)] if match else []
+    
+    # read access profiles until permit block ends and clean output
+    def __read_access_profile(self) -> str:
         # clipaging is necessary because it's much faster on some models to scroll by space
         self._turn_on_clipaging()
 
-        # command
-        command_regex = commands.show_access_profile(self._model, self.__user_port)
+        # command, it's the same for all ports
+        command_regex = commands.show_access_profile(self._model, 0)
         self._session.sendline(command_regex["command"])
         # for 1210, it's important to skip ## sequence and expect only one # symbol
         index = self._session.expect(["CTRL", r"(?<!#)#(?!#)"])
 
         # save output and try to find end of permit block
         acl = self._session.before.decode("utf-8")
-        match = re.search("Deny", acl)
+        match = "Deny" in acl
         
         # scroll until end reached or deny block started
         while index == 0 and not match:
@@ -331,8 +336,9 @@ class L2Switch(BaseSwitch):
             index = self._session.expect(["CTRL", r"(?<!#)#(?!#)"])
 
             # try to find end of permit block and concatenate output
-            match = re.search("Deny", self._session.before.decode("utf-8"))
-            acl += self._session.before.decode("utf-8")
+            page = self._session.before.decode("utf-8")
+            match = "Deny" in page
+            acl += page
 
         # if still acl continuation, quit
         if index == 0:
@@ -343,28 +349,15 @@ class L2Switch(BaseSwitch):
 
         # clean ansi sequences
         acl = acl.replace("\x00", "")
-        ansi_escape = re.compile(r'\x1b\[[0-?]*[ -/]*[@-~]')
-        acl = ansi_escape.sub('', acl)
+        acl = commands.ANSI_ESCAPE.sub("", acl)
 
         # filter lines to get only useful ones
         filtered_lines = [
             line for line in acl.splitlines()   # splitlines accurately split with all space symbols
             if line.strip()   # if line is not empty
-            and not re.search(r'\[[0-9;]*[mK]', line)   # if line is not some skipped ansi symbol 
-            and not re.search(r'Quit|Next Page|Next Entry|ALL', line)   # if it's not hint line
+            and not commands.ANSI_LEFTOVER.search(line)   # if line is not some skipped ansi symbol 
+            and not commands.PAGING_HINT.search(line)   # if it's not hint line
         ]
 
         # collect filtered lines in one big text
-        acl = "\n".join(filtered_lines).strip()
-
-        # return found entries
-        if self._model == "DES-3028":
-            # for 3028 two indentical entries
-            return re.findall(command_regex["regex"], acl)
-        elif self._model == "DES-3200-28":
-            # for 3200-28 two identical entries constructed from parts
-            return [l + r for l, r in re.findall(command_regex["regex"], acl)]
-        elif self._model in {"DGS-1210-28/ME", "DGS-3120-24TC", "DGS-3000-24TC", "DGS-3200-24", "DES-3526"}:
-            # for other two different entries for different protocols, one separated in parts
-            match = re.search(command_regex["regex"], acl)
-            return [match.group(1) + match.group(2), match.group(3)] if match else []
\ No newline at end of file
+        return "\n".join(filtered_lines).strip()
\ No newline at end of file
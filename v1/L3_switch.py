@@ -1,5 +1,4 @@
 #!/usr/bin/python3
-import re
 from ipaddress import IPv4Address, IPv4Network
 # user's modules
 from base_switch import BaseSwitch
@@ -31,7 +30,7 @@ class L3Switch(BaseSwitch):
             index = self._session.expect(["CTRL", "#"])
             
             # parse output without saving as all rows are separated
-            match = re.search(command_regex["regex"], self._session.before.decode("utf-8"))
+            match = commands.pattern(command_regex["regex"]).search(self._session.before.decode("utf-8"))
             
             # scroll until end found or range max time difference reached
             while index == 0 and not match:
@@ -40,7 +39,7 @@ class L3Switch(BaseSwitch):
                 index = self._session.expect(["CTRL", "#"])
                 
                 # parse current output
-                match = re.search(command_regex["regex"], self._session.before.decode("utf-8"))
+                match = commands.pattern(command_regex["regex"]).search(self._session.before.decode("utf-8"))
             
             # if still output continuation, quit
             if index == 0:
@@ -56,11 +55,11 @@ class L3Switch(BaseSwitch):
             self._session.expect("#")
             
             # parsing
-            match = re.search(command_regex["regex"], self._session.before.decode("utf-8"))
+            match = commands.pattern(command_regex["regex"]).search(self._session.before.decode("utf-8"))
             
             # if strict ip route not found, try to find subnet route
             if not match:
-                match = re.search(command_regex["subnet_regex"], self._session.before.decode("utf-8"))
+                match = commands.pattern(command_regex["subnet_regex"]).search(self._session.before.decode("utf-8"))
 
                 # subnet route as "X.X.115.0/24 X.X.X.248" is correct because mask >= 24 and next hop ip is in L3 24-bit subnet, None otherwise
                 if not match or int(match.group("mask")) < 24 or not self.__ip_in_L3_subnet(match.group("next_hop")):
@@ -84,7 +83,7 @@ class L3Switch(BaseSwitch):
         self._session.expect("#")
         
         # find one or several subnets
-        match = re.findall(command_regex["regex"], self._session.before.decode("utf-8"))
+        match = commands.pattern(command_regex["regex"]).findall(self._session.before.decode("utf-8"))
         
         # on d-link, get back to disabled clipaging
         if self._model != commands.CISCO_SWITCH:
@@ -104,7 +103,7 @@ class L3Switch(BaseSwitch):
         self._session.expect("#")
         
         # parse and find mac address for this ip
-        match = re.search(command_regex["regex"], self._session.before.decode("utf-8"))
+        match = commands.pattern(command_regex["regex"]).search(self._session.before.decode("utf-8"))
         
         # if there's arp, return mac
         if match:
@@ -119,7 +118,7 @@ class L3Switch(BaseSwitch):
         self._session.expect("#")
         
         # parse and find all ip addresses for this mac
-        matches = re.finditer(command_regex["regex"], self._session.before.decode("utf-8"))
+        matches = commands.pattern(command_regex["regex"]).finditer(self._session.before.decode("utf-8"))
         
         # if found, return list of ip addresses
         if matches:
@@ -134,5 +133,5 @@ class L3Switch(BaseSwitch):
         self._session.expect("#")
         
         # return True if error when trying to find mac address
-        match = re.search(command_regex["regex"], self._session.before.decode("utf-8"))
+        match = commands.pattern(command_regex["regex"]).search(self._session.before.decode("utf-8"))
         return not match
\ No newline at end of file
@@ -3,10 +3,11 @@ from __future__ import annotations
 import pexpect
 import sys
 from abc import ABC, abstractmethod
-from icmplib import ping
-from typing import TYPE_CHECKING
+from typing import Any, TYPE_CHECKING
 # user's modules
+from const import SessionPool
 from my_exception import MyException
+from session_pool import PooledSession
 
 # import as type only by Pylance (for VS Code)
 if TYPE_CHECKING:
@@ -19,7 +20,10 @@ class BaseNetworkDevice(ABC):
     _ipaddress: str
     __device_type_name: str
     _output: BufferedWriter | None
-    _session: pexpect.spawn
+    _session: pexpect.spawn | PooledSession
+    _session_state: dict[str, Any]
+    _exit_commands: list[str]
+    __logged_in: bool
 
     # all devices init by ip
     def __init__(self, ipaddress: str, device_type_name: str, print_output: bool) -> None:
@@ -30,6 +34,11 @@ class BaseNetworkDevice(ABC):
         self.__device_type_name = device_type_name
         self._output = sys.stdout.buffer if print_output else None
 
+        # state saved with pooled session for the next device and commands to run when pool closes it
+        self._session_state = {}
+        self._exit_commands = []
+        self.__logged_in = False
+
         # connect
         self.__start_connection()
     
@@ -73,9 +82,24 @@ class BaseNetworkDevice(ABC):
         
         # actions that needed right after connection
         self._enter_action()
+        self.__logged_in = True
         
         print("Success")
 
+    # session lent by pool daemon if it's running, own session otherwise
+    def _spawn(self, command: str, timeout: float, prompt: str) -> pexpect.spawn | PooledSession:
+        if SessionPool.SOCKET:
+            try:
+                return PooledSession(self._ipaddress, command, timeout, prompt, self._output)
+            except ConnectionError:
+                pass
+        return pexpect.spawn(command, timeout=timeout, logfile=self._output)
+
+    # session lent by pool is already logged in and prepared by previous device
+    @property
+    def _session_reused(self) -> bool:
+        return isinstance(self._session, PooledSession) and self._session.reused
+
     # commands to try connecting to device
     @abstractmethod
     def _connection_attempt(self):
@@ -93,6 +117,7 @@ class BaseNetworkDevice(ABC):
     
     # check switch availability by 4 icmp packets and return packet loss
     def __check_ping(self) -> float:
+        from icmplib import ping
         return ping(self._ipaddress, count=4, timeout=1, interval=0.25, privileged=False).packet_loss
 
     # delete, close connection
@@ -101,6 +126,18 @@ class BaseNetworkDevice(ABC):
         if not self._session.isalive():
             return
         
+        # pooled session stays logged in, exit actions are done when pool closes it
+        if isinstance(self._session, PooledSession):
+            # session after failed login or abandoned in the middle of command output isn't lent again
+            if self.__logged_in and self._session.at_prompt:
+                print(f"Releasing connection to {self.__device_type_name}...")
+                self._session.release(self._session_state, self._exit_commands)
+            else:
+                print(f"Closing connection to {self.__device_type_name}...")
+                self._session.close()
+            print("Success")
+            return
+        
         print(f"Closing connection to {self.__device_type_name}...")
         
         # perform pre-exit actions
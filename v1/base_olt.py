@@ -8,7 +8,6 @@ import os
 from abc import ABC, abstractmethod
 from typing import Any, override
 from contextlib import contextmanager
-from icmplib import ping
 from datetime import datetime
 from ipaddress import IPv4Address, IPv4Network, AddressValueError
 # user's modules
@@ -51,7 +50,11 @@ class BaseOLT(BaseNetworkDevice):
     @override
     def _connection_attempt(self):
         # try to login with big timeout
-        self._session = pexpect.spawn(f"ssh {self.__USERNAME}@{self._ipaddress}", timeout=10, logfile=self._output)
+        self._session = self._spawn(f"ssh {self.__USERNAME}@{self._ipaddress}", timeout=10, prompt=self._base_prompt)
+        
+        # pooled session is already logged in
+        if self._session_reused:
+            return
         self._session.expect("Password:")
         self._session.sendline(self.__PASSWORD)
         self._session.expect(self._base_prompt)
@@ -1,12 +1,13 @@
 #!/usr/bin/python3
 from __future__ import annotations
-import pexpect
 import re
 import os
+import pexpect
 from typing import override
 # user's modules
-from const import CitySwitch
+from const import CitySwitch, SessionPool
 from base_network_device import BaseNetworkDevice
+from fingerprint_cache import FingerprintCache, Fingerprint
 from my_exception import ExceptionType, MyException
 import commands
 
@@ -17,6 +18,7 @@ class BaseSwitch(BaseNetworkDevice):
     __USERNAME: str
     __PASSWORD: str
     _model: str
+    __firmware: str | None
     __default_gateway: str
     __turn_clipaging: commands.CommandRegexData
 
@@ -28,6 +30,7 @@ class BaseSwitch(BaseNetworkDevice):
 
         # switch model name and default gateway
         self._model = ""
+        self.__firmware = None
         self.__default_gateway = ""   # for d-link, is used only in base class
 
         # dict to store commands for clipaging
@@ -39,20 +42,38 @@ class BaseSwitch(BaseNetworkDevice):
     # trying to connect by telnet
     @override
     def _connection_attempt(self) -> None:
-        self._session = pexpect.spawn(f"telnet {self._ipaddress}", timeout=5, logfile=self._output)
-        self._session.expect("(U|u)ser(N|n)ame:")
+        self._session = self._spawn(f"telnet {self._ipaddress}", timeout=5, prompt="#")
+        if not self._session_reused:
+            self._session.expect("(U|u)ser(N|n)ame:")
 
     # perform base actions after connecting
     @override
     def _enter_action(self) -> None:
+        # pooled session is logged in with clipaging off, model is known from its state
+        if self._session_reused:
+            self._session_state = self._session.state
+            self._model = self._session_state["model"]
+            self.__firmware = self._session_state["firmware"]
+            self.__default_gateway = self._session_state["default_gateway"]
+            self.__turn_clipaging = commands.clipaging(self._model)
+            # pool takes exit commands of every release, so they're needed each time
+            self.__restore_clipaging_on_exit()
+            return
+
         # login
         self._session.sendline(self.__USERNAME)
         self._session.expect("(P|p)ass(W|w)ord:")
         self._session.sendline(self.__PASSWORD)
         self._session.expect("#")
         
+        # cli type known from the previous connection is tried first, the model it shows confirms the fingerprint
+        fingerprint = FingerprintCache.get(self._ipaddress)
+        cli_types = CitySwitch.CLI_TYPES
+        if fingerprint:
+            cli_types = [fingerprint["cli_type"], *(cli_type for cli_type in cli_types if cli_type != fingerprint["cli_type"])]
+
         # get through two types of cli to get switch model
-        for cli_type in CitySwitch.CLI_TYPES:
+        for cli_type in cli_types:
             self.__get_model(cli_type)
             if self._model:
                break
@@ -60,10 +81,27 @@ class BaseSwitch(BaseNetworkDevice):
         # exception if model unknown
         else:
             raise MyException(ExceptionType.UNKNOWN_MODEL, self._ipaddress)
+        
+        # save fingerprint if switch is new or changed
+        new_fingerprint = Fingerprint(model=self._model,
+                                      cli_type=cli_type,
+                                      ports=commands.SWITCHES[self._model].get("ports"),
+                                      firmware=self.__firmware)
+        if fingerprint != new_fingerprint:
+            FingerprintCache.put(self._ipaddress, new_fingerprint)
 
         # turn off clipaging to see commands' whole results
         self.__turn_clipaging = commands.clipaging(self._model)
         self._turn_off_clipaging()
+
+        # for pooled session, save what the next device needs and restore clipaging when pool closes it
+        self._session_state = {"model": self._model, "firmware": self.__firmware, "default_gateway": self.__default_gateway}
+        self.__restore_clipaging_on_exit()
+    
+    # for d-link, pool turns clipaging on before closing session
+    def __restore_clipaging_on_exit(self) -> None:
+        if self._model != commands.CISCO_SWITCH:
+            self._exit_commands = [self.__turn_clipaging["enable"]]
     
     # method to generate exceptions for switches
     @override
@@ -78,7 +116,8 @@ class BaseSwitch(BaseNetworkDevice):
         
         # expect output's ending or continuation  and try to find device model
         index = self._session.expect(["CTRL", "#"])
-        match = re.search(command_regex["regex"], self._session.before.decode("utf-8"), re.DOTALL)
+        output = self._session.before.decode("utf-8")
+        match = commands.pattern(command_regex["regex"], re.DOTALL).search(output)
         
         # quit if needed
         if index == 0:
@@ -93,6 +132,10 @@ class BaseSwitch(BaseNetworkDevice):
             # define model otherwise
             self._model = match.group("model")
             
+            # firmware version is only saved in fingerprint
+            if firmware_match := commands.pattern(command_regex["firmware_regex"]).search(output):
+                self.__firmware = firmware_match.group("firmware")
+            
             # for d-link, define default_gateway, so as not to check it later
             if self._model != commands.CISCO_SWITCH:
                 self.__default_gateway = match.group("default_gateway")
@@ -119,6 +162,16 @@ class BaseSwitch(BaseNetworkDevice):
         self._session.send("q")
         self._session.expect("#")
     
+    # bring shared session back to prompt after diagnostics failed in the middle of command, exception if switch doesn't answer
+    def resync(self) -> None:
+        # interrupt command or its paged output and skip everything left from it
+        self._session.sendcontrol("c")
+        self._session.expect("#", timeout=SessionPool.HEALTH_CHECK_TIMEOUT)
+        self._session.expect([pexpect.TIMEOUT], timeout=SessionPool.DRAIN_TIMEOUT)
+        # empty command answered with prompt means the next command's output is read from the start
+        self._session.sendline("")
+        self._session.expect("#", timeout=SessionPool.HEALTH_CHECK_TIMEOUT)
+    
     # get default gateway variable
     def get_default_gateway(self) -> str:
         return self.__default_gateway
\ No newline at end of file
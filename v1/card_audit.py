@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Iterable, Iterator, TextIO, TYPE_CHECKING
+# user's modules
+from const import Database
+from database_manager import DatabaseManager
+from diag_handler import DiagHandler
+from city_diag_handler import CityDiagHandler
+from country_diag_handler import CountryDiagHandler
+
+# import as type only by Pylance (for VS Code)
+if TYPE_CHECKING:
+    from users_snapshot import UserRow
+
+
+##### DOUBLES OF ALL USERS FOUND BY GROUPING #####
+
+class DoublesIndex:
+    __by_ip: defaultdict[str, list[int]]
+    __by_switch_port: defaultdict[tuple[str, int], list[int]]
+    __by_public_ip: defaultdict[str, list[int]]
+
+    # usernums grouped by field values, rows go in order of usernums so every group is sorted
+    def __init__(self, rows: Iterable[tuple[int, *UserRow]]) -> None:
+        self.__by_ip = defaultdict(list)
+        self.__by_switch_port = defaultdict(list)
+        self.__by_public_ip = defaultdict(list)
+
+        # empty values are never compared with each other, as in database queries for null
+        for usernum, ip, switch, port, public_ip in rows:
+            if ip is not None:
+                self.__by_ip[ip].append(usernum)
+            if switch is not None and port is not None:
+                self.__by_switch_port[(switch, port)].append(usernum)
+            if public_ip is not None:
+                self.__by_public_ip[public_ip].append(usernum)
+
+    # the same interface as database manager has, so handlers check doubles without queries
+    def get_usernum_by_switch_port(self, switch: str, port: int) -> list[int]:
+        return self.__by_switch_port.get((switch, port), [])
+
+    def get_usernum_by_ip(self, ip: str) -> list[int]:
+        return self.__by_ip.get(ip, [])
+
+    def get_usernum_by_public_ip(self, ip: str) -> list[int]:
+        return self.__by_public_ip.get(ip, [])
+
+
+##### CHECK OF EVERY USER CARD #####
+
+# run user card checks of handler, everything printed by result is the list of problems
+def audit_record(dict_data: dict[str, Any], doubles: DoublesIndex) -> dict[str, Any] | None:
+    usernum = dict_data[Database.USERNUM]
+    record_data = {Database.KEY_FIELD[key]: value for key, value in dict_data.items() if key != Database.USERNUM}
+    inactive_payment = record_data["payment"] in Database.INACTIVE_PAYMENT
+    country = DiagHandler.is_country(record_data)
+
+    handler: DiagHandler
+    if country:
+        handler = CountryDiagHandler(usernum, doubles, record_data, inactive_payment)
+    else:
+        handler = CityDiagHandler(usernum, doubles, record_data, inactive_payment)
+
+    # only exceptions are interesting in output of checks
+    check_output = io.StringIO()
+    with contextlib.redirect_stdout(check_output), contextlib.redirect_stderr(check_output):
+        handler._check_user_card()
+    result_output = io.StringIO()
+    with contextlib.redirect_stdout(result_output):
+        handler._result_user_card()
+
+    problems = result_output.getvalue().splitlines()
+    errors = check_output.getvalue() if "Traceback" in check_output.getvalue() else ""
+    if problems == ["OK"] and not errors:
+        return None
+    return {"usernum": usernum, "country": country, "problems": problems, "error": errors}
+
+# two streaming passes: keys of all users to group doubles, then main records to check
+def audit_records(db_manager: DatabaseManager) -> Iterator[dict[str, Any]]:
+    doubles = DoublesIndex(db_manager.get_snapshot_rows())
+    for dict_data in db_manager.get_all_records():
+        if (report := audit_record(dict_data, doubles)) is not None:
+            yield report
+
+# write one json record per broken card
+def write_reports(reports: Iterable[dict[str, Any]], output: TextIO) -> int:
+    broken = 0
+    for report in reports:
+        output.write(json.dumps(report, ensure_ascii=False) + "\n")
+        broken += 1
+    return broken
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check user cards of all users, print broken ones")
+    parser.add_argument("--output", metavar="FILE", help="file for json records, stdout by default")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    # nobody answers questions about speed, such payment stays unknown
+    sys.stdin = io.StringIO()
+    with contextlib.redirect_stdout(sys.stderr):
+        db_manager = DatabaseManager()
+
+    with contextlib.ExitStack() as stack:
+        output = stack.enter_context(open(args.output, "w")) if args.output else sys.stdout
+        broken = write_reports(audit_records(db_manager), output)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        del db_manager
+    print(f"Broken cards: {broken}, time: {time.perf_counter() - start_time:.1f} s", file=sys.stderr)
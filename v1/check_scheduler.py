@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Callable
+
+
+##### CHECK DECLARED AS NODE OF DEPENDENCY GRAPH #####
+
+class CheckNode:
+    name: str
+    check: Callable[[], None]
+    requires: tuple[str, ...]
+    resource: str | None
+
+    # check runs after required checks, checks with the same resource (device session) never run at the same time
+    def __init__(self, name: str, check: Callable[[], None], requires: tuple[str, ...], resource: str | None) -> None:
+        self.name = name
+        self.check = check
+        self.requires = requires
+        self.resource = resource
+
+
+##### SCHEDULER TO RUN INDEPENDENT CHECKS CONCURRENTLY #####
+
+class CheckScheduler:
+    __max_workers: int
+    __nodes: list[CheckNode]
+
+    # with one worker checks run one by one in order they are added
+    def __init__(self, max_workers: int) -> None:
+        self.__max_workers = max_workers
+        self.__nodes = []
+
+    # add check, required checks must be added before, so order of adding is always correct serial order
+    def add(self, name: str, check: Callable[[], None], requires: tuple[str, ...] = (), resource: str | None = None) -> None:
+        # misspelled or not added requirement is an error, optional checks are left out of requires by caller
+        known = {node.name for node in self.__nodes}
+        if name in known:
+            raise ValueError(f"Check {name} is already added")
+        if unknown := [required for required in requires if required not in known]:
+            raise ValueError(f"Check {name} requires unknown checks: {', '.join(unknown)}")
+        self.__nodes.append(CheckNode(name, check, tuple(requires), resource))
+
+    # run all checks, total time is bounded by the longest chain of dependent checks
+    def run(self) -> None:
+        pending = list(self.__nodes)
+        running: dict[Future, CheckNode] = {}
+        busy_resources: set[str] = set()
+        done: set[str] = set()
+        failed: dict[str, BaseException] = {}
+
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            while pending or running:
+                # start ready checks in order they were added, nothing new is started after the first error
+                for node in [] if failed else list(pending):
+                    if len(running) == self.__max_workers:
+                        break
+                    if node.resource in busy_resources or not all(required in done for required in node.requires):
+                        continue
+                    pending.remove(node)
+                    running[executor.submit(node.check)] = node
+                    if node.resource:
+                        busy_resources.add(node.resource)
+
+                # nothing is running after error, the rest of checks is skipped
+                if not running:
+                    break
+
+                # wait for any check to free its resource and maybe make others ready
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    node = running.pop(future)
+                    busy_resources.discard(node.resource)
+                    if (err := future.exception()) is not None:
+                        failed[node.name] = err
+                    else:
+                        done.add(node.name)
+
+        # the same error as serial run raises: of the earliest added failed check
+        for node in self.__nodes:
+            if node.name in failed:
+                raise failed[node.name]
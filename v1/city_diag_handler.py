@@ -8,8 +8,10 @@ from ipaddress import IPv4Address, IPv4Network
 from diag_handler import DiagHandler
 from L2_switch import L2Switch
 from L3_switch import L3Switch
-from const import Database, Provider, CitySwitch
+from const import Database, Provider, CitySwitch, Diagnostics
 from my_exception import ExceptionType, MyException
+from check_scheduler import CheckScheduler
+from subnet_classifier import SubnetClassifier, AddressType
 
 # import as type only by Pylance (for VS Code)
 if TYPE_CHECKING:
@@ -69,8 +71,10 @@ class CityDiagHandler(DiagHandler):
     __tx_megabit: int
     __packets_ok: bool
     __ip_route_not_found: bool
+    __shared_L2_manager: L2Switch | None
 
-    def __init__(self, usernum: int, db_manager: DatabaseManager, record_data: dict[str, Any], inactive_payment: bool, print_output: bool = False) -> None:
+    def __init__(self, usernum: int, db_manager: DatabaseManager, record_data: dict[str, Any], inactive_payment: bool, print_output: bool = False,
+                 shared_L2_manager: L2Switch | None = None) -> None:
         # init with base constructor
         super().__init__(usernum, db_manager, record_data, inactive_payment, print_output)
 
@@ -78,6 +82,9 @@ class CityDiagHandler(DiagHandler):
         self._L2_manager: L2Switch | None = None
         self._L3_manager: L3Switch | None = None
 
+        # connected switch with preloaded tables, when all users of switch are diagnosed by one session
+        self.__shared_L2_manager = shared_L2_manager
+
 
         # attributes for diagnostics of the database record
 
@@ -249,7 +256,11 @@ class CityDiagHandler(DiagHandler):
             self.__gigabit = True
         # if it's new user or it has high payment for juridical, ask for speed
         elif self._record_data["payment"] == Database.NEW_PAYMENT or self._record_data["payment"] > Database.MAX_KNOWN_PAYMENT:
-            self.__gigabit = input(f"Vznos is {self._record_data["payment"]}. Gigabit? (y/n) ").lower() in {"y", "д"}
+            try:
+                self.__gigabit = input(f"Vznos is {self._record_data["payment"]}. Gigabit? (y/n) ").lower() in {"y", "д"}
+            # nobody to ask in batch diagnostics, speed stays unknown
+            except EOFError:
+                self.__unknown_payment = True
         # in other cases, if it's not old payment
         elif not self._inactive_payment:
             self.__unknown_payment = True
@@ -285,7 +296,7 @@ class CityDiagHandler(DiagHandler):
 
     # check switch ip, it can be in usual local range or in one special local subnet
     def __check_switch_ip(self) -> bool:
-        return self.__check_local_ip(self._record_data["switch"]) or IPv4Address(self._record_data["switch"]) in Provider.SWITCH_OTHER_LOCAL_SUBNET
+        return SubnetClassifier.default().is_in(self._record_data["switch"], AddressType.LOCAL, AddressType.SWITCH)
     
     # check if address/subnet is in local range, usually gateway, sometimes switch
     def __check_local_ip(self, address: str | None = None) -> bool:
@@ -295,7 +306,7 @@ class CityDiagHandler(DiagHandler):
             if self.__mask_length not in Provider.LOCAL_MASKS:
                 return False
             address = self._record_data["gateway"]
-        return int(Provider.FIRST_LOCAL_IP) <= int(IPv4Address(address)) <= int(Provider.LAST_LOCAL_IP)
+        return SubnetClassifier.default().is_in(address, AddressType.LOCAL)
     
     # check if address/subnet is in public range, usually gateway, sometimes indirect public ip
     def __check_public_ip(self, address: str | None = None) -> bool:
@@ -304,7 +315,7 @@ class CityDiagHandler(DiagHandler):
             address = self._record_data["gateway"]
             return address in Provider.PUBLIC_GATEWAY_MASK and self.__mask_length == Provider.PUBLIC_GATEWAY_MASK[address]
         # for indirect public ip, check if it lies in public subnet
-        return any(IPv4Address(address) in subnet for subnet in Provider.PUBLIC_SUBNETS)
+        return SubnetClassifier.default().is_in(address, AddressType.PUBLIC)
     
     # check users with the same public ip, return list of doubles if found
     def __check_double_indirect_public_ip(self) -> None:
@@ -377,57 +388,29 @@ class CityDiagHandler(DiagHandler):
             if not self.__switch_port:   # exception if there's no data
                 raise MyException(ExceptionType.NO_SWITCH_PORT)
             
-            # connect to switch only if switch and port are known
-            self._L2_manager = L2Switch(self._record_data["switch"], self._record_data["port"], self._print_output)
-            
-            # exception and flag if port is outside switch's portlist
-            if not self.__check_port_in_switch_portlist():
-                raise MyException(ExceptionType.PORT_OUTSIDE_OF_PORTLIST)
-            
-            # if subnet is correct, check vlan and acl
+            # L2 and L3 checks run on their own sessions at the same time, with session output printed they run one by one
+            scheduler = CheckScheduler(1 if self._print_output else Diagnostics.CHECK_WORKERS)
+
+            # connect to switch, then check vlan and acl if subnet is correct, then port
+            scheduler.add("L2_connect", self.__connect_L2, resource="L2")
             if self.__ip_mask_gateway:
-                # check vlan
-                self.__check_vlan()
-                
-                # check acl
-                self.__check_acl()
+                scheduler.add("L2_vlan", self.__check_vlan, requires=("L2_connect",), resource="L2")
+                scheduler.add("L2_acl", self.__check_acl, requires=("L2_connect",), resource="L2")
+            scheduler.add("L2_port", self.__diagnose_port, requires=("L2_connect",), resource="L2")
             
-            # check port
-            self.__check_port()
-                
-            # check crc errors in any case
-            self.__check_crc()
+            # L3 needs only user card, except direct public ip route that starts from switch's default gateway
+            # ip interface needs vlan from L2 and arp needs mac addresses from L2
+            if self.__ip_mask_gateway:
+                scheduler.add("L3_connect", self._find_actual_gateway, requires=("L2_connect",) if self.__gateway_from_switch() else (), resource="L3")
+                scheduler.add("L3_ipif", self._check_vlan_subnet, requires=("L3_connect", "L2_vlan"), resource="L3")
+                scheduler.add("L3_arp", self._check_arpentry_by_ip, requires=("L3_connect", "L2_port"), resource="L3")
             
-            # if link is down not because of disabled port, try cable diag
-            if self.__linkdown_status:
-                self.__try_cable_diag()
-            # in other case, if port is enabled, diagnose further options
-            elif not self.__port_disabled:
-                # check log for flapping
-                self.__check_log()
-                
-                # check mac
-                self._check_mac()
-                
-                # check packets
-                self.__check_packets()
-                
-                # if speed isn't relevant, port is flapping or there's no mac, try cable_diag afterall
-                if self.__need_to_cable_diag:
-                    self.__try_cable_diag()
+            # exception of the first failed check is raised like in serial diagnostics
+            scheduler.run()
             
             # if subnet isn't correct, quit and send a message
             if not self.__ip_mask_gateway:
                 raise MyException(ExceptionType.NO_SUBNET)
-            
-            # create L3 manager
-            self._find_actual_gateway()
-
-            # check ip interface
-            self._check_vlan_subnet()
-
-            # check arpentry
-            self._check_arpentry_by_ip()
         
         # user's exception include special text for output
         except MyException as err:
@@ -439,6 +422,9 @@ class CityDiagHandler(DiagHandler):
         except Exception:
             print("Exception while working with equipment:")
             traceback.print_exc()
+            # shared session could be left in the middle of command output, the next user must start at prompt
+            if self.__shared_L2_manager:
+                self.__shared_L2_manager.resync()
         
         # always close connection and delete L2 and L3 managers
         finally:
@@ -447,6 +433,45 @@ class CityDiagHandler(DiagHandler):
             if self._L3_manager:
                 del self._L3_manager
     
+    # connect to switch only if switch and port are known
+    def __connect_L2(self) -> None:
+        # shared switch is only moved to user's port, it's closed by its owner
+        if self.__shared_L2_manager:
+            self._L2_manager = self.__shared_L2_manager
+            self._L2_manager.set_user_port(self._record_data["port"])
+        else:
+            self._L2_manager = L2Switch(self._record_data["switch"], self._record_data["port"], self._print_output)
+        
+        # exception and flag if port is outside switch's portlist
+        if not self.__check_port_in_switch_portlist():
+            raise MyException(ExceptionType.PORT_OUTSIDE_OF_PORTLIST)
+    
+    # check port and everything on it
+    def __diagnose_port(self) -> None:
+        # check port
+        self.__check_port()
+            
+        # check crc errors in any case
+        self.__check_crc()
+        
+        # if link is down not because of disabled port, try cable diag
+        if self.__linkdown_status:
+            self.__try_cable_diag()
+        # in other case, if port is enabled, diagnose further options
+        elif not self.__port_disabled:
+            # check log for flapping
+            self.__check_log()
+            
+            # check mac
+            self._check_mac()
+            
+            # check packets
+            self.__check_packets()
+            
+            # if speed isn't relevant, port is flapping or there's no mac, try cable_diag afterall
+            if self.__need_to_cable_diag:
+                self.__try_cable_diag()
+    
     # check if port in user card belongs to switch's portlist
     def __check_port_in_switch_portlist(self) -> bool:
         return self._L2_manager.check_port_in_portlist()
@@ -608,6 +633,14 @@ class CityDiagHandler(DiagHandler):
         # set flag that packets successfully checked
         self.__packets_ok = True
     
+    # on Lensoveta 23, gateway address for direct public ip is known
+    def __on_lensoveta_23(self) -> bool:
+        return self._record_data["street"] == Provider.LENSOVETA_ADDRESS_GATEWAY["street"] and self._record_data["house"] == Provider.LENSOVETA_ADDRESS_GATEWAY["house"]
+    
+    # search for direct public ip route starts from switch's default gateway
+    def __gateway_from_switch(self) -> bool:
+        return self.__direct_public_ip and not self.__on_lensoveta_23()
+    
     # check for direct public ip and find its gateway where arp should be
     @override
     def _find_actual_gateway(self) -> None:
@@ -617,7 +650,7 @@ class CityDiagHandler(DiagHandler):
             return
         
         # on Lensoveta 23, define gateway address for direct public ip
-        if self._record_data["street"] == Provider.LENSOVETA_ADDRESS_GATEWAY["street"] and self._record_data["house"] == Provider.LENSOVETA_ADDRESS_GATEWAY["house"]:
+        if self.__on_lensoveta_23():
             self._L3_manager = L3Switch(Provider.LENSOVETA_ADDRESS_GATEWAY["gateway"], self._record_data["ip"], self._print_output)
             return
         
@@ -1,5 +1,9 @@
 #!/usr/bin/python3
+import re
+from functools import lru_cache
 from typing import TypeAlias, TypedDict
+# user's modules
+from const import CitySwitch
 
 # alias for most of returned dictionaries
 CommandRegexData: TypeAlias = dict[str, str]
@@ -10,6 +14,22 @@ class ShowPortsCommandRegex(TypedDict):
     regex: list[str]
 
 
+##### REGISTRY OF BUILT COMMANDS AND COMPILED PATTERNS #####
+
+# each command is built once per model and port or address, returned dictionary is shared and mustn't be changed
+registry = lru_cache(maxsize=CitySwitch.COMMANDS_CACHE_SIZE)
+
+# compiled pattern to parse decoded output, patterns for expect stay strings because session compiles them to bytes itself
+@lru_cache(maxsize=CitySwitch.PATTERNS_CACHE_SIZE)
+def pattern(regex: str, flags: int = 0) -> re.Pattern:
+    return re.compile(regex, flags)
+
+# cleaning of paged output: ansi sequences, their leftovers and hint lines
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
+ANSI_LEFTOVER = re.compile(r"\[[0-9;]*[mK]")
+PAGING_HINT = re.compile(r"Quit|Next Page|Next Entry|ALL")
+
+
 ##### SWITCH MODELS #####
 
 # base_switches = {"DES-3028", "DES-3200-28", "DES-3526", "DGS-3000-24TC", "DGS-3200-24", "DGS-1210-28/ME", "DGS-3120-24TC"}
@@ -38,15 +58,19 @@ CISCO_SWITCH = "DGS-3630-28SC"
 
 ##### BASE COMMANDS #####
 
+@registry
 def show_model(cli_type: str) -> CommandRegexData:
     match cli_type:
         case "d-link":
             return {"command": "show switch",
-                    "regex": r"Device Type\s+:\s+(?P<model>\S+)\s+.*Default Gateway\s+:\s+(?P<default_gateway>(\d{1,3}\.){3}\d{1,3})"}
+                    "regex": r"Device Type\s+:\s+(?P<model>\S+)\s+.*Default Gateway\s+:\s+(?P<default_gateway>(\d{1,3}\.){3}\d{1,3})",
+                    "firmware_regex": r"Firmware Version\s+:\s+(Build\s+)?(?P<firmware>\S+)"}
         case "cisco":
             return {"command": "show version",
-                    "regex": r"-+\s+1\s+(?P<model>\S+)\s+"}
+                    "regex": r"-+\s+1\s+(?P<model>\S+)\s+",
+                    "firmware_regex": r"Runtime:\s*(?P<firmware>\S+)"}
 
+@registry
 def clipaging(model: str) -> CommandRegexData:
     match model:
         case x if x == CISCO_SWITCH:
@@ -59,6 +83,7 @@ def clipaging(model: str) -> CommandRegexData:
 
 ##### COMMANDS FOR L2 SWITCH #####
 
+@registry
 def show_ports(model: str, user_port: int) -> ShowPortsCommandRegex:
     match model:
         case "DES-3028":
@@ -83,6 +108,7 @@ def show_ports(model: str, user_port: int) -> ShowPortsCommandRegex:
             return {"command": f"show ports {user_port}",
                     "regex": [rf"{user_port}\s+(Enabled|Disabled)\s+(Auto|10{{1,3}}M\/Half|10{{1,3}}M\/Full)\/Disabled\s+(([A-Za-z]+ ?[A-Za-z]+)|(10{{1,3}}M\/Half|10{{1,3}}M\/Full)\/None).*#", rf"{user_port}\(C\)\s+(Enabled|Disabled)\s+(Auto|10{{1,3}}M\/Half|10{{1,3}}M\/Full)\/Disabled\s+(([A-Za-z]+ ?[A-Za-z]+)|(10{{1,3}}M\/Half|10{{1,3}}M\/Full)\/None).*{user_port}\(F\)\s+(Enabled|Disabled)\s+(Auto|10{{1,3}}M\/Half|10{{1,3}}M\/Full)\/Disabled\s+(([A-Za-z]+ ?[A-Za-z]+)|(10{{1,3}}M\/Half|10{{1,3}}M\/Full)\/None).*#"]}
 
+@registry
 def cable_diag(model: str, user_port: int) -> CommandRegexData:
     match model:
         case "DES-3028" | "DES-3200-28" | "DES-3526":
@@ -106,15 +132,17 @@ def cable_diag(model: str, user_port: int) -> CommandRegexData:
                     "regex": rf"({user_port}\s+(\S+)\s+(Link Up|Link Down)\s+Pair(\d)\s+([A-Za-z]+)(?:\s+at\s+(\d+)\s+M)?\s+(-|\d+))|({user_port}\s+(\S+)\s+(Link Up|Link Down)\s+([A-Za-z ]+)\s+(-|\d+))",
                     "findall": r"Pair(\d)\s+([A-Za-z]+)(?:\s+at\s+(\d+)\s+M)?"}
 
+@registry
 def show_fdb(model: str, user_port: int) -> CommandRegexData:
     match model:
         case "DES-3028" | "DGS-1210-28/ME" | "DGS-3000-24TC" | "DGS-3200-24" | "DES-3200-28" | "DES-3526":
             return {"command": f"show fdb port {user_port}",
-                    "regex": rf"(\d+)\s+(\S+)\s+(([A-Z\d]{{2}}-){{5}}[A-Z\d]{{2}})\s+{user_port}\s+([A-Za-z]+)"}
+                    "regex": rf"(?m)^[ \t]*(\d+)\s+(\S+)\s+(([A-Z\d]{{2}}-){{5}}[A-Z\d]{{2}})\s+{user_port}\s+([A-Za-z]+)"}
         case "DGS-3120-24TC":
             return {"command": f"show fdb port {user_port}",
-                    "regex": rf"(\d+)\s+(\S+)\s+(([A-Z\d]{{2}}-){{5}}[A-Z\d]{{2}})\s+(?:1:)?{user_port}\s+([A-Za-z]+)"}
+                    "regex": rf"(?m)^[ \t]*(\d+)\s+(\S+)\s+(([A-Z\d]{{2}}-){{5}}[A-Z\d]{{2}})\s+(?:1:)?{user_port}\s+([A-Za-z]+)"}
 
+@registry
 def show_port_security(model: str, user_port: int) -> CommandRegexData:
     match model:
         case "DES-3028" | "DGS-1210-28/ME" | "DGS-3200-24" | "DES-3200-28" | "DES-3526":
@@ -127,6 +155,7 @@ def show_port_security(model: str, user_port: int) -> CommandRegexData:
             return {"command": f"show port_security ports {user_port}",
                     "regex": rf"{user_port}\s+(Enabled|Disabled)\s+([A-Za-z]+)\s+(\d+).*#"}
 
+@registry
 def show_crc_errors(model: str, user_port: int) -> CommandRegexData:
     match model:
         case "DES-3028" | "DGS-1210-28/ME" | "DGS-3000-24TC" | "DES-3526":
@@ -139,6 +168,7 @@ def show_crc_errors(model: str, user_port: int) -> CommandRegexData:
             return {"command": f"show error ports {user_port}",
                     "regex": r"RX Frames.*?CRC Error\s+(\d+).*CTRL"}
 
+@registry
 def show_packet(model: str, user_port: int) -> CommandRegexData:
     match model:
         case "DES-3028" | "DGS-1210-28/ME" | "DGS-3000-24TC" | "DES-3526" | "DGS-3120-24TC":
@@ -148,6 +178,7 @@ def show_packet(model: str, user_port: int) -> CommandRegexData:
             return {"command": f"show packet ports {user_port}",
                     "regex": r"Total/(\d)?sec.*RX Bytes\s+\d+\s+(\d+).*TX Bytes\s+\d+\s+(\d+).*CTRL"}
 
+@registry
 def show_vlan(model: str) -> CommandRegexData:
     match model:
         case "DES-3028" | "DGS-3120-24TC" | "DGS-3000-24TC" | "DGS-3200-24" | "DES-3200-28" | "DES-3526":
@@ -157,6 +188,7 @@ def show_vlan(model: str) -> CommandRegexData:
             return {"command": "show vlan",
                     "regex": r"VID\s+:\s+(\d+)\s+VLAN NAME\s+:\s+(\S+)"}
 
+@registry
 def show_vlan_ports(model: str, user_port: int) -> CommandRegexData:
     match model:
         case "DES-3028" | "DGS-1210-28/ME" | "DES-3200-28":
@@ -169,6 +201,7 @@ def show_vlan_ports(model: str, user_port: int) -> CommandRegexData:
             return {"command": f"show vlan ports {user_port}",
                     "regex": r"(\d+)\s+(?P<Untagged>[X-])\s+(?P<Tagged>[X-])\s+(?P<Dynamic>[X-])\s+(?P<Forbidden>[X-])"}
 
+@registry
 def show_dhcp_relay(model: str) -> CommandRegexData:
     match model:
         case "DGS-1210-28/ME":
@@ -183,6 +216,7 @@ def show_dhcp_relay(model: str) -> CommandRegexData:
             return {"command": "show dhcp_relay",
                     "servers": r"Interface\s+Server 1\s+Server 2\s+Server 3\s+Server 4\s+(?:-+\s+){5}System\s+(?P<dhcp_server1>(?:\d{1,3}\.){3}\d{1,3})\s+(?P<dhcp_server2>(?:\d{1,3}\.){3}\d{1,3})"}
 
+@registry
 def show_access_profile(model: str, user_port: int) -> CommandRegexData:
     match model:
         case "DES-3028":
@@ -204,6 +238,7 @@ def show_access_profile(model: str, user_port: int) -> CommandRegexData:
             return {"command": "show access_profile",
                     "regex": rf"Ports:\s+{user_port}\s+[\s\S]*?value : 0x0000([A-Z\d]{{4}})\s+[\s\S]*?value : 0x([A-Z\d]{{4}})0000\s+Mask : \S+\s+Action:\s+Permit[\s\S]*?Ports:\s+{user_port}\s+[\s\S]*?value : 0x([A-Z\d]{{8}})\s+Mask : \S+\s+Action:\s+Permit"}
 
+@registry
 def show_log(model: str, user_port: int) -> CommandRegexData:
     match model:
         case "DES-3028" | "DGS-3200-24" | "DES-3200-28":
@@ -245,6 +280,7 @@ def show_log(model: str, user_port: int) -> CommandRegexData:
 
 ##### COMMANDS FOR L3 GATEWAY #####
 
+@registry
 def show_ip_interface(model: str, vlan_id: int, vlan_name: str, ipif_name: str) -> CommandRegexData:
     match model:
         case x if x == CISCO_SWITCH:
@@ -259,6 +295,7 @@ def show_ip_interface(model: str, vlan_id: int, vlan_name: str, ipif_name: str)
                     "showall": "show ipif",
                     "regex": rf"VLAN Name\s+:\s+{vlan_name}\s+Interface Admin State\s+:\s+Enabled\s+IPv4 Address\s+:\s+((?:\d{{1,3}}\.){{3}}\d{{1,3}})/(\d+)"}
 
+@registry
 def show_ip_route(model: str, user_ip: str) -> CommandRegexData:
     match model:
         case x if x == CISCO_SWITCH:
@@ -269,6 +306,7 @@ def show_ip_route(model: str, user_ip: str) -> CommandRegexData:
                     "regex": rf"{user_ip}/32\s+(?P<next_hop>(\d{{1,3}}\.){{3}}\d{{1,3}})",
                     "subnet_regex": r"((\d{1,3}\.){3}\d{1,3})/(?P<mask>\d{2})\s+(?P<next_hop>(\d{1,3}\.){3}\d{1,3})"}
 
+@registry
 def show_arp_ip(model: str, user_ip: str) -> CommandRegexData:
     match model:
         case x if x == CISCO_SWITCH:
@@ -278,6 +316,7 @@ def show_arp_ip(model: str, user_ip: str) -> CommandRegexData:
             return {"command": f"show arpentry ipaddress {user_ip}",
                     "regex": rf"(\S+)\s+{user_ip}\s+(?P<mac>([A-Z\d]{{2}}-){{5}}[A-Z\d]{{2}})"}
 
+@registry
 def show_arp_mac(model: str, user_mac: str) -> CommandRegexData:
     match model:
         case x if x == CISCO_SWITCH:
@@ -287,6 +326,7 @@ def show_arp_mac(model: str, user_mac: str) -> CommandRegexData:
             return {"command": f"show arpentry mac_address {user_mac}",
                     "regex": rf"(\S+)\s+(?P<ip>(\d{{1,3}}\.){{3}}\d{{1,3}})\s+{user_mac}"}
 
+@registry
 def show_fdb_L3(model: str, user_mac: str) -> CommandRegexData:
     match model:
         case x if x == CISCO_SWITCH:
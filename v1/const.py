@@ -1,5 +1,5 @@
 #!/usr/bin/python3
-from typing import Final
+from typing import Any, Callable, Final
 from ipaddress import IPv4Address, IPv4Network
 from dotenv import load_dotenv, find_dotenv
 load_dotenv(find_dotenv())   # find .env file
@@ -7,6 +7,21 @@ import os
 import json
 
 
+# class constant computed on the first access, so env values are parsed only by code that uses them
+class LazyConstant:
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self._factory = factory
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+    
+    def __get__(self, instance: Any, owner: type) -> Any:
+        value = self._factory()
+        # replace descriptor with the value, so the next access is usual attribute reading
+        setattr(owner, self._name, value)
+        return value
+
+
 ##### DATABASE FIELDS AND CONSTANTS #####
 
 class Database:
@@ -37,6 +52,19 @@ class Database:
     
     # usernum field name
     USERNUM: Final[str] = "Number"
+
+    # fields of user card query with usernums of doubles
+    DOUBLE_FIELDS: Final[tuple[str, ...]] = ("double_ip", "double_switch_port", "double_public_ip")
+
+    # idle connections kept by one batch worker, connection idle longer than interval is pinged with reconnect
+    POOL_MAX_IDLE: Final[int] = 2
+    POOL_PING_INTERVAL: Final[int] = 60
+
+    # local snapshot of users for doubles lookups, disabled if path is empty
+    SNAPSHOT_PATH: Final[str] = LazyConstant(lambda: os.getenv("USERS_SNAPSHOT", ""))
+    # snapshot is refreshed every 5 minutes, lookups go to database if it's older than 15 minutes
+    SNAPSHOT_REFRESH_INTERVAL: Final[int] = 300
+    SNAPSHOT_MAX_AGE: Final[int] = 900
     
     # speed by payments (vznos), country payments, 555 is an exception
     NEW_PAYMENT: Final[int] = 555
@@ -51,35 +79,35 @@ class Database:
 
 class Provider:    
     # network has nnets and nservs from 1 to 1016 now
-    LAST_NSERV_NNET: Final[int] = int(os.getenv("LAST_NSERV_NNET"))
+    LAST_NSERV_NNET: Final[int] = LazyConstant(lambda: int(os.getenv("LAST_NSERV_NNET")))
     LAST_PORT: Final[int] = 52
     
     # fields with checking limits
-    NUMBER_FIELDS_LIMITS: Final[dict[str, int]] = {"port": LAST_PORT, "dhcp": 1, "nserv": LAST_NSERV_NNET, "nnet": LAST_NSERV_NNET}
+    NUMBER_FIELDS_LIMITS: Final[dict[str, int]] = LazyConstant(lambda: {"port": Provider.LAST_PORT, "dhcp": 1, "nserv": Provider.LAST_NSERV_NNET, "nnet": Provider.LAST_NSERV_NNET})
     IP_FIELDS: Final[set[str]] = {"ip", "mask", "gateway", "switch", "public_ip"}
 
     # network local addresses
-    FIRST_LOCAL_IP: Final[IPv4Address] = IPv4Address(os.getenv("FIRST_LOCAL_IP"))
-    LAST_LOCAL_IP: Final[IPv4Address] = IPv4Address(os.getenv("LAST_LOCAL_IP"))
-    SWITCH_OTHER_LOCAL_SUBNET: Final[IPv4Network] = IPv4Network(os.getenv("SWITCH_OTHER_LOCAL_SUBNET"))
+    FIRST_LOCAL_IP: Final[IPv4Address] = LazyConstant(lambda: IPv4Address(os.getenv("FIRST_LOCAL_IP")))
+    LAST_LOCAL_IP: Final[IPv4Address] = LazyConstant(lambda: IPv4Address(os.getenv("LAST_LOCAL_IP")))
+    SWITCH_OTHER_LOCAL_SUBNET: Final[IPv4Network] = LazyConstant(lambda: IPv4Network(os.getenv("SWITCH_OTHER_LOCAL_SUBNET")))
     
     # range of local masks
-    LOCAL_MASKS: Final[range] = range(*json.loads(os.getenv("LOCAL_MASKS_RANGE")))
+    LOCAL_MASKS: Final[range] = LazyConstant(lambda: range(*json.loads(os.getenv("LOCAL_MASKS_RANGE"))))
 
     # set of network public subnets
-    PUBLIC_GATEWAY_MASK: Final[dict[str, int]] = json.loads(os.getenv("PUBLIC_GATEWAY_MASK"))
-    PUBLIC_SUBNETS: Final[set[IPv4Network]] = {IPv4Network(f"{gateway}/{mask}", strict=False) for gateway, mask in PUBLIC_GATEWAY_MASK.items()}
+    PUBLIC_GATEWAY_MASK: Final[dict[str, int]] = LazyConstant(lambda: json.loads(os.getenv("PUBLIC_GATEWAY_MASK")))
+    PUBLIC_SUBNETS: Final[set[IPv4Network]] = LazyConstant(lambda: {IPv4Network(f"{gateway}/{mask}", strict=False) for gateway, mask in Provider.PUBLIC_GATEWAY_MASK.items()})
 
     # dhcp servers
-    PRIMARY_DHCP_SERVER: Final[str] = os.getenv("PRIMARY_DHCP_SERVER")
-    SECONDARY_DHCP_SERVERS: Final[set[str]] = set(json.loads(os.getenv("SECONDARY_DHCP_SERVERS")))
+    PRIMARY_DHCP_SERVER: Final[str] = LazyConstant(lambda: os.getenv("PRIMARY_DHCP_SERVER"))
+    SECONDARY_DHCP_SERVERS: Final[set[str]] = LazyConstant(lambda: set(json.loads(os.getenv("SECONDARY_DHCP_SERVERS"))))
     
     # vlan constants
-    DIRECT_PUBLIC_VLAN: Final[int] = int(os.getenv("DIRECT_PUBLIC_VLAN"))
-    VLAN_SKIPPING: Final[set[int]] = set(json.loads(os.getenv("VLAN_SKIPPING")))
+    DIRECT_PUBLIC_VLAN: Final[int] = LazyConstant(lambda: int(os.getenv("DIRECT_PUBLIC_VLAN")))
+    VLAN_SKIPPING: Final[set[int]] = LazyConstant(lambda: set(json.loads(os.getenv("VLAN_SKIPPING"))))
     
     # on Lensoveta 23 OSPF protocol is used, default gateway address doesn't have static ip route
-    LENSOVETA_ADDRESS_GATEWAY: Final[dict[str, int | str]] = {"street": 33, "house": "23", "gateway": os.getenv("LENSOVETA_23_GATEWAY")}
+    LENSOVETA_ADDRESS_GATEWAY: Final[dict[str, int | str]] = LazyConstant(lambda: {"street": 33, "house": "23", "gateway": os.getenv("LENSOVETA_23_GATEWAY")})
 
 
 ##### CONSTANTS FOR CITY SWITCH DIAGNOSTICS #####
@@ -88,6 +116,9 @@ class CitySwitch:
     # types of cli to identify model
     CLI_TYPES: Final[list[str]] = ["d-link", "cisco"]
 
+    # file with fingerprints of identified switches, empty value keeps them in memory only
+    FINGERPRINT_CACHE: Final[str] = LazyConstant(lambda: os.getenv("CITY_SWITCH_FINGERPRINT_CACHE", os.path.expanduser("~/.cache/network_scripts/city_switch_fingerprints.json")))
+
     # port speed
     NORMAL_SPEED: Final[dict[bool, str]] = {False: "100M/Full", True: "1000M/Full"}
 
@@ -102,6 +133,14 @@ class CitySwitch:
     # max hops number for direct public ip routes
     MAX_HOPS_DIRECT_PUBLIC_IP: Final[int] = 3
 
+    # switch-wide tables for all users of switch, fdb of the whole switch takes longer than usual command
+    SWITCH_TABLE_TIMEOUT: Final[int] = 30
+    MAC_FLOODING_COUNT: Final[int] = 64
+
+    # commands with patterns built for different models, ports and addresses, the least recently used ones are dropped
+    COMMANDS_CACHE_SIZE: Final[int] = 512
+    PATTERNS_CACHE_SIZE: Final[int] = 1024
+
 
 ##### COUNTRY SETTINGS #####
 
@@ -113,24 +152,31 @@ class Country:
     UNUSED_IP_FIELDS: Final[set[str]] = {"mask", "gateway", "switch"}
 
     # country's unified mask, main subnets and vlans
-    MASK: Final[str] = os.getenv("COUNTRY_MASK")
-    MASK_LENGTH: Final[str] = IPv4Network(f"0.0.0.0/{MASK}").prefixlen
-    VLAN_GATEWAY: Final[dict[str, int]] = {int(key): val for key, val in json.loads(os.getenv("COUNTRY_VLAN_GATEWAY")).items()}
-    SUBNETS: Final[set[IPv4Network]] = set(map(lambda gateway, mask=MASK: IPv4Network(f"{gateway}/{mask}", strict=False), VLAN_GATEWAY.values()))
+    MASK: Final[str] = LazyConstant(lambda: os.getenv("COUNTRY_MASK"))
+    MASK_LENGTH: Final[str] = LazyConstant(lambda: IPv4Network(f"0.0.0.0/{Country.MASK}").prefixlen)
+    VLAN_GATEWAY: Final[dict[str, int]] = LazyConstant(lambda: {int(key): val for key, val in json.loads(os.getenv("COUNTRY_VLAN_GATEWAY")).items()})
+    SUBNETS: Final[set[IPv4Network]] = LazyConstant(lambda: set(map(lambda gateway, mask=Country.MASK: IPv4Network(f"{gateway}/{mask}", strict=False), Country.VLAN_GATEWAY.values())))
 
     # nserv and nnet
-    NSERV_NNET: Final[int] = int(os.getenv("COUNTRY_NSERV_NNET"))
+    NSERV_NNET: Final[int] = LazyConstant(lambda: int(os.getenv("COUNTRY_NSERV_NNET")))
 
-    # url for all configured onts, no matter online or not
-    ALARM_URL: Final[str] = os.getenv("URL_CONFIGURED_ONTS")
+    # url for all configured onts, no matter online or not, local file can be used instead by path or file:// url
+    ALARM_URL: Final[str] = LazyConstant(lambda: os.getenv("URL_CONFIGURED_ONTS"))
+
+    # file with the last downloaded onts, empty value keeps them in memory only
+    ALARM_CACHE: Final[str] = LazyConstant(lambda: os.getenv("COUNTRY_ALARM_CACHE", os.path.expanduser("~/.cache/network_scripts/country_alarm.json")))
+    # onts older than 5 minutes are refreshed in background, older than hour are refreshed before use
+    ALARM_TTL: Final[int] = 300
+    ALARM_MAX_AGE: Final[int] = 3600
+    ALARM_TIMEOUT: Final[int] = 10
 
     # ip addresses of olt swtiches version 2 and 3
-    BASE_SUBNET: Final[str] = os.getenv("COUNTRY_SUBNET")
-    OLTS_VERSION2: Final[set[str]] = set(json.loads(os.getenv("OLTS_VERSION2")))
-    OLTS_VERSION3: Final[set[str]] = set(json.loads(os.getenv("OLTS_VERSION3")))
+    BASE_SUBNET: Final[str] = LazyConstant(lambda: os.getenv("COUNTRY_SUBNET"))
+    OLTS_VERSION2: Final[set[str]] = LazyConstant(lambda: set(json.loads(os.getenv("OLTS_VERSION2"))))
+    OLTS_VERSION3: Final[set[str]] = LazyConstant(lambda: set(json.loads(os.getenv("OLTS_VERSION3"))))
 
     # unified gateway
-    ACTUAL_GATEWAY: Final[str] = os.getenv("COUNTRY_ACTUAL_GATEWAY")
+    ACTUAL_GATEWAY: Final[str] = LazyConstant(lambda: os.getenv("COUNTRY_ACTUAL_GATEWAY"))
 
     # log flapping
     MAX_MINUTE_RANGE_ONT_FLAPPING: Final[int] = 10
@@ -139,8 +185,35 @@ class Country:
     # rssi
     HIGH_RSSI: Final[float] = -30.0
 
+##### DIAGNOSTICS SCHEDULING #####
+
+class Diagnostics:
+    # independent checks running at the same time, one per device session is enough
+    CHECK_WORKERS: Final[int] = 3
+
+    # users diagnosed at the same time in batch mode, each one has its own processes and sessions
+    BATCH_WORKERS: Final[int] = 8
+
+
+##### SESSION POOL DAEMON #####
+
+class SessionPool:
+    # unix socket of running daemon, devices connect by themselves if it's empty or daemon isn't available
+    SOCKET: Final[str] = LazyConstant(lambda: os.getenv("SESSION_POOL_SOCKET", ""))
+    DEFAULT_SOCKET: Final[str] = "/tmp/network_scripts_sessions.sock"
+
+    # sessions to one device, more devices at the same time connect by themselves
+    MAX_SESSIONS_PER_DEVICE: Final[int] = 2
+
+    # idle sessions are checked by empty command, closed if unused for 10 minutes
+    KEEPALIVE_INTERVAL: Final[int] = 60
+    IDLE_TIMEOUT: Final[int] = 600
+    HEALTH_CHECK_TIMEOUT: Final[int] = 5
+    DRAIN_TIMEOUT: Final[float] = 0.05
+
+
 ##### PACKET SCANNING CONSTANTS #####
 
 class PacketScan:
     # pipe for packet scanning path
-    PIPE: Final[str] = os.getenv("PIPE")
+    PIPE: Final[str] = LazyConstant(lambda: os.getenv("PIPE"))
@@ -1,21 +1,177 @@
 #!/usr/bin/python3
+from __future__ import annotations
+import json
 import os
-import requests
+import threading
+import time
+from typing import Any, Callable, ClassVar
 # user's modules
 from const import Country
 
+# olt number, channel and eltex serial of one configured ont
+type OntData = tuple[str, str, str]
+
+
+##### CONFIGURED ONTS INDEXED BY USERNUM, SERIAL AND OLT #####
+
+class AlarmIndex:
+    by_usernum: dict[str, list[OntData]]
+    by_serial: dict[str, OntData]
+    by_ltp: dict[str, list[OntData]]
+
+    def __init__(self, configured_onts: list[dict[str, Any]]) -> None:
+        self.by_usernum = {}
+        self.by_serial = {}
+        self.by_ltp = {}
+        for ont in configured_onts:
+            ont_data = (ont["LTP"][-1], ont["CHANNEL"], ont["ELTX"])
+            self.by_usernum.setdefault(str(ont["USERNUM"]), []).append(ont_data)
+            self.by_serial[ont["ELTX"]] = ont_data
+            self.by_ltp.setdefault(ont["LTP"], []).append(ont_data)
+
 
 ##### MANAGER TO GET DATA FROM COUNTRY ALARM #####
 
 class CountryAlarmManager:
+    # index is replaced as a whole, so readers never see half-built one
+    __index: ClassVar[AlarmIndex | None] = None
+    __fetched: ClassVar[float] = 0.0
+    # modification time of file when it was read, unchanged file isn't parsed again
+    __cache_mtime: ClassVar[int] = 0
+    # etag and last-modified of http feed or modification time of local file
+    __validators: ClassVar[dict[str, str]] = {}
+    __lock: ClassVar[threading.Lock] = threading.Lock()
+    __refreshing: ClassVar[threading.Thread | None] = None
+
     # get olt ips and eltex serials by usernum
     @staticmethod
-    def get_user_data_from_alarm(usernum: int) -> list[tuple[str]]:
-        # load json from url
-        response = requests.get(Country.ALARM_URL)
-        configured_onts = response.json()
-
-        # find and return all olt-channel-eltex combinations for usernum
-        olt_channel_eltex = [(ont["LTP"][-1], ont["CHANNEL"], ont["ELTX"]) for ont in configured_onts if ont["USERNUM"] == str(usernum)]
-        return olt_channel_eltex
-    
\ No newline at end of file
+    def get_user_data_from_alarm(usernum: int) -> list[OntData]:
+        return list(CountryAlarmManager.__find(lambda index: index.by_usernum.get(str(usernum))) or [])
+
+    # get olt and channel of ont by eltex serial
+    @staticmethod
+    def get_ont_by_serial(serial: str) -> OntData | None:
+        return CountryAlarmManager.__find(lambda index: index.by_serial.get(serial))
+
+    # get all onts configured on olt by its ltp name
+    @staticmethod
+    def get_onts_by_ltp(ltp: str) -> list[OntData]:
+        return list(CountryAlarmManager.__find(lambda index: index.by_ltp.get(ltp)) or [])
+
+    # ont may be configured after a bit old onts were downloaded, so it isn't reported missing before download
+    @classmethod
+    def __find[T](cls, lookup: Callable[[AlarmIndex], T | None]) -> T | None:
+        if (found := lookup(cls.__get_index())) is None and time.time() - cls.__fetched > Country.ALARM_TTL:
+            cls.refresh()
+            found = lookup(cls.__index)
+        return found
+
+    # onts from memory or file, too old ones are downloaded before use, a bit old ones are refreshed in background
+    @classmethod
+    def __get_index(cls) -> AlarmIndex:
+        if cls.__index is None or time.time() - cls.__fetched > Country.ALARM_TTL:
+            # another process could already refresh the file
+            cls.__read()
+        age = time.time() - cls.__fetched
+        if cls.__index is None or age > Country.ALARM_MAX_AGE:
+            cls.refresh()
+        elif age > Country.ALARM_TTL:
+            cls.__refresh_in_background()
+        return cls.__index
+
+    # download onts if they were changed, exception if alarm isn't available
+    @classmethod
+    def refresh(cls) -> None:
+        with cls.__lock:
+            configured_onts, validators = CountryAlarmManager.__download(cls.__validators if cls.__index is not None else {})
+            # not modified, only time is updated
+            if configured_onts is not None:
+                cls.__index = AlarmIndex(configured_onts)
+            cls.__validators = validators
+            cls.__fetched = time.time()
+        CountryAlarmManager.__write(configured_onts)
+
+    # only one refresh at the same time, errors are ignored while old onts can be used
+    @classmethod
+    def __refresh_in_background(cls) -> None:
+        def refresh() -> None:
+            try:
+                cls.refresh()
+            except Exception:
+                pass
+
+        if cls.__refreshing is None or not cls.__refreshing.is_alive():
+            cls.__refreshing = threading.Thread(target=refresh, daemon=True)
+            cls.__refreshing.start()
+
+    # conditional request to alarm or local file, None if onts weren't modified
+    @staticmethod
+    def __download(validators: dict[str, str]) -> tuple[list[dict[str, Any]] | None, dict[str, str]]:
+        # local file instead of alarm, e.g. for tests
+        if Country.ALARM_URL.startswith("file://") or "://" not in Country.ALARM_URL:
+            path = Country.ALARM_URL.removeprefix("file://")
+            mtime = str(os.stat(path).st_mtime_ns)
+            if validators.get("mtime") == mtime:
+                return None, validators
+            with open(path, "r") as F:
+                return json.load(F), {"mtime": mtime}
+
+        # requests is heavy, it's imported only by country diagnostics that use it
+        import requests
+
+        headers = {}
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+        response = requests.get(Country.ALARM_URL, headers=headers, timeout=Country.ALARM_TIMEOUT)
+        if response.status_code == 304:
+            return None, validators
+        response.raise_for_status()
+
+        new_validators = {}
+        if etag := response.headers.get("ETag"):
+            new_validators["etag"] = etag
+        if last_modified := response.headers.get("Last-Modified"):
+            new_validators["last_modified"] = last_modified
+        return response.json(), new_validators
+
+    # take onts from file if they are newer than in memory, missing or broken file is ignored
+    @classmethod
+    def __read(cls) -> None:
+        if not Country.ALARM_CACHE:
+            return
+        try:
+            mtime = os.stat(Country.ALARM_CACHE).st_mtime_ns
+            if mtime == cls.__cache_mtime:
+                return
+            cls.__cache_mtime = mtime
+            with open(Country.ALARM_CACHE, "r") as F:
+                cache = json.load(F)
+            if cache["url"] != Country.ALARM_URL or cache["fetched"] <= cls.__fetched:
+                return
+            index = AlarmIndex(cache["onts"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        with cls.__lock:
+            cls.__index = index
+            cls.__validators = cache["validators"]
+            cls.__fetched = cache["fetched"]
+
+    # write through temporary file, so readers never see half-written file, not modified onts only update time
+    @classmethod
+    def __write(cls, configured_onts: list[dict[str, Any]] | None) -> None:
+        if not Country.ALARM_CACHE:
+            return
+        temp_path = f"{Country.ALARM_CACHE}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if configured_onts is None:
+                with open(Country.ALARM_CACHE, "r") as F:
+                    configured_onts = json.load(F)["onts"]
+            os.makedirs(os.path.dirname(Country.ALARM_CACHE) or ".", exist_ok=True)
+            with open(temp_path, "w") as F:
+                json.dump({"url": Country.ALARM_URL, "fetched": cls.__fetched, "validators": cls.__validators, "onts": configured_onts}, F)
+            os.replace(temp_path, Country.ALARM_CACHE)
+        # cache is only an optimization, diagnostics work without it
+        except (OSError, ValueError, KeyError):
+            pass
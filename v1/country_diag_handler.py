@@ -1,7 +1,6 @@
 #!/usr/bin/python3
 import traceback
 from typing import Any, override
-from ipaddress import IPv4Address
 import gc
 # user's modules
 from diag_handler import DiagHandler
@@ -10,8 +9,10 @@ from base_olt import BaseOLT
 from olt_version2 import OLTVersion2
 from olt_version3 import OLTVersion3
 from L3_switch import L3Switch
-from const import Database, Country
+from const import Database, Country, Diagnostics
 from country_alarm import CountryAlarmManager
+from check_scheduler import CheckScheduler
+from subnet_classifier import SubnetClassifier, AddressType
 from base_olt import BaseOLT
 from my_exception import ExceptionType, MyException
 
@@ -161,7 +162,7 @@ class CountryDiagHandler(DiagHandler):
 
     # check if ip or public_ip are correct
     def __check_country_ip(self) -> bool:
-        return any(IPv4Address(self._record_data["ip"]) in subnet for subnet in Country.SUBNETS)
+        return SubnetClassifier.default().is_in(self._record_data["ip"], AddressType.COUNTRY)
     
     # result of database record diagnostics
     @override
@@ -205,67 +206,24 @@ class CountryDiagHandler(DiagHandler):
     @override
     def _check_L2_L3(self) -> None:
         try:
-            # get data for olt diagnostics
-            self.__get_olt_eltex()
+            # olt and L3 checks run on their own sessions at the same time, with session output printed they run one by one
+            scheduler = CheckScheduler(1 if self._print_output else Diagnostics.CHECK_WORKERS)
+
+            # olt is found in country alarm, then terminal and acs modes are checked by one session
+            scheduler.add("alarm", self.__get_olt_eltex)
+            scheduler.add("L2_connect", self.__connect_L2, requires=("alarm",), resource="L2")
+            scheduler.add("L2_terminal", self.__check_terminal, requires=("L2_connect",), resource="L2")
+            scheduler.add("L2_acs", self.__check_acs, requires=("L2_terminal",), resource="L2")
             
-            # create L2 manager with one of two versions, depending on olt ip
-            if self.__olt_ip in Country.OLTS_VERSION2:
-                self._L2_manager = OLTVersion2(self.__olt_ip, self.__eltex_serial, self._print_output)
-            elif self.__olt_ip in Country.OLTS_VERSION3:
-                self._L2_manager = OLTVersion3(self.__olt_ip, self.__eltex_serial, self._print_output)
-            else:
-                raise MyException(ExceptionType.UNKNOWN_OLT_IP)
-            
-            # context manager to switch modes
-            with self._L2_manager.terminal_context():
-                # state
-                self.__check_state()
-
-                # config if record's ip is correct
-                if self.__ip_correct:
-                    self.__check_config()
-
-                # log
-                self.__check_log()
-
-                # only if state ok
-                if self.__state_ok:
-                    # ports
-                    self.__check_ports()
-
-                    # base method is used to check mac addresses
-                    self._check_mac()
-            
-            # if ip is not correct, quit with special exceptions
-            if not self.__ip_correct:
-                raise MyException(ExceptionType.CANNOT_CHECK_ACS_MODE)
-            
-            # if it's ntu1, skip acs mode checking
-            if not self.__ntu1:
-                # in acs mode
-                with self._L2_manager.acs_context():
-                    # in acs-profile mode
-                    with self._L2_manager.acs_profile_context():
-                        # acs profile settings
-                        self.__check_acs_profile()
-                    
-                    # in acs-ont mode
-                    with self._L2_manager.acs_ont_context():
-                        # acs ont settings
-                        self.__check_acs_ont()
-                    
-                    # mark flag if the whole olt config is ok
-                    if self.__acs_profile_ok and self.__acs_ont_ok:
-                        self.__acs_ok = True
+            # L3 gateway is the same for all users, so it's connected at once
+            # it's checked only when acs mode is checked, ip interface needs vlan and arp needs mac addresses from olt
+            if self.__ip_correct:
+                scheduler.add("L3_connect", self._find_actual_gateway, resource="L3")
+                scheduler.add("L3_ipif", self._check_vlan_subnet, requires=("L3_connect", "L2_acs"), resource="L3")
+                scheduler.add("L3_arp", self._check_arpentry_by_ip, requires=("L3_connect", "L2_acs"), resource="L3")
             
-            # create L3 manager
-            self._find_actual_gateway()
-
-            # check ip interface
-            self._check_vlan_subnet()
-
-            # check arpentry
-            self._check_arpentry_by_ip()
+            # exception of the first failed check is raised like in serial diagnostics
+            scheduler.run()
         
         # user's exception include special text for output
         except MyException as err:
@@ -296,6 +254,63 @@ class CountryDiagHandler(DiagHandler):
             if self._L3_manager:
                 del self._L3_manager
 
+    # create L2 manager with one of two versions, depending on olt ip
+    def __connect_L2(self) -> None:
+        if self.__olt_ip in Country.OLTS_VERSION2:
+            self._L2_manager = OLTVersion2(self.__olt_ip, self.__eltex_serial, self._print_output)
+        elif self.__olt_ip in Country.OLTS_VERSION3:
+            self._L2_manager = OLTVersion3(self.__olt_ip, self.__eltex_serial, self._print_output)
+        else:
+            raise MyException(ExceptionType.UNKNOWN_OLT_IP)
+    
+    # ont checks in terminal mode
+    def __check_terminal(self) -> None:
+        # context manager to switch modes
+        with self._L2_manager.terminal_context():
+            # state
+            self.__check_state()
+
+            # config if record's ip is correct
+            if self.__ip_correct:
+                self.__check_config()
+
+            # log
+            self.__check_log()
+
+            # only if state ok
+            if self.__state_ok:
+                # ports
+                self.__check_ports()
+
+                # base method is used to check mac addresses
+                self._check_mac()
+    
+    # olt config checks in acs mode
+    def __check_acs(self) -> None:
+        # if ip is not correct, quit with special exceptions
+        if not self.__ip_correct:
+            raise MyException(ExceptionType.CANNOT_CHECK_ACS_MODE)
+        
+        # if it's ntu1, skip acs mode checking
+        if self.__ntu1:
+            return
+        
+        # in acs mode
+        with self._L2_manager.acs_context():
+            # in acs-profile mode
+            with self._L2_manager.acs_profile_context():
+                # acs profile settings
+                self.__check_acs_profile()
+            
+            # in acs-ont mode
+            with self._L2_manager.acs_ont_context():
+                # acs ont settings
+                self.__check_acs_ont()
+            
+            # mark flag if the whole olt config is ok
+            if self.__acs_profile_ok and self.__acs_ont_ok:
+                self.__acs_ok = True
+    
     # get olt and eltex from country alarm for further diagnostics
     def __get_olt_eltex(self) -> None:
         # catch list of matches
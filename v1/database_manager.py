@@ -1,10 +1,17 @@
 #!/usr/bin/python3
-from typing import TypedDict, Any
+from __future__ import annotations
+from typing import TypedDict, Any, Iterator, TYPE_CHECKING
 import pymysql.cursors
 import os
+import threading
+from time import monotonic
 # user's modules
 from const import Database
 
+# import as type only by Pylance (for VS Code)
+if TYPE_CHECKING:
+    from users_snapshot import UsersSnapshot
+
 # typed dict class for result of switch-port query
 class SwitchPortData(TypedDict):
     switchP: str
@@ -19,6 +26,68 @@ class Queries:
     GET_USERNUMS_BY_IP = "SELECT Number FROM users WHERE IP = %s"
     GET_USERNUMS_BY_PUBLIC_IP = "SELECT Number FROM users WHERE Add_IP = %s"
     GET_SWITCH_PORT = "SELECT switchP, PortP FROM users WHERE Number = %s"
+    GET_USERNUMS_BY_SWITCH = "SELECT Number FROM users WHERE switchP = %s ORDER BY PortP"
+    GET_USERNUMS_WHERE = "SELECT Number FROM users WHERE {condition} ORDER BY Number"
+    # main record with all doubles in one round trip, doubles are comma-separated usernums or null
+    GET_USER_CARD = ("SELECT u.Number, u.Vznos, u.IP, u.Masck, u.Gate, u.switchP, u.PortP, u.dhcp_type, u.Add_IP, u.Number_serv, u.Number_net, u.Street, u.House, "
+                     "(SELECT GROUP_CONCAT(d.Number ORDER BY d.Number) FROM users d WHERE u.IP <> '' AND d.IP = u.IP) AS double_ip, "
+                     "(SELECT GROUP_CONCAT(d.Number ORDER BY d.Number) FROM users d WHERE u.switchP <> '' AND u.PortP > 0 AND d.switchP = u.switchP AND d.PortP = u.PortP) AS double_switch_port, "
+                     "(SELECT GROUP_CONCAT(d.Number ORDER BY d.Number) FROM users d WHERE u.Add_IP <> '' AND d.Add_IP = u.Add_IP) AS double_public_ip, "
+                     "@@SESSION.group_concat_max_len AS group_concat_max_len "
+                     "FROM users u WHERE u.Number = %s")
+    GET_SNAPSHOT_ROWS = "SELECT Number, IP, switchP, PortP, Add_IP FROM users"
+    GET_ALL_RECORDS = "SELECT Number, Vznos, IP, Masck, Gate, switchP, PortP, dhcp_type, Add_IP, Number_serv, Number_net, Street, House FROM users ORDER BY Number"
+
+
+##### CONNECTION POOL FOR BATCH AND DAEMON MODES #####
+
+class ConnectionPool:
+    __lock: threading.Lock
+    __idle: list[tuple[pymysql.Connection, float]]
+    __max_idle: int
+
+    # connections are kept open between users of one process, the oldest idle ones are closed
+    def __init__(self, max_idle: int = Database.POOL_MAX_IDLE) -> None:
+        self.__lock = threading.Lock()
+        self.__idle = []
+        self.__max_idle = max_idle
+
+    # the most recently used connection is the most likely alive
+    def acquire(self) -> pymysql.Connection | None:
+        while True:
+            with self.__lock:
+                if not self.__idle:
+                    return None
+                connection, released = self.__idle.pop()
+            # recently used connection is given without extra round trip, connection idle for too long is reconnected by ping
+            if monotonic() - released < Database.POOL_PING_INTERVAL:
+                return connection
+            try:
+                connection.ping(reconnect=True)
+                return connection
+            except pymysql.Error:
+                connection.close()
+
+    def release(self, connection: pymysql.Connection) -> None:
+        # ending transaction drops its repeatable read view, so the next user sees current rows
+        try:
+            connection.rollback()
+        except pymysql.Error:
+            connection.close()
+            return
+        with self.__lock:
+            self.__idle.append((connection, monotonic()))
+            old = self.__idle[:-self.__max_idle]
+            del self.__idle[:-self.__max_idle]
+        for connection, _ in old:
+            connection.close()
+
+    def close_all(self) -> None:
+        with self.__lock:
+            idle, self.__idle = self.__idle, []
+        for connection, _ in idle:
+            connection.close()
+
 
 ##### CLASS TO GET DATA FROM THE DATABASE #####
 
@@ -29,6 +98,28 @@ class DatabaseManager:
     __PASSWORD: str
     __CHARSET: str
     __connection: pymysql.Connection
+    __prefetched: dict[tuple[str, tuple[Any, ...]], list[int]]
+    # pool is used only if enabled for the process, interactive diagnostics connect once and close
+    __pool: ConnectionPool | None = None
+    # local snapshot for doubles lookups, used while it's fresh
+    __snapshot: UsersSnapshot | None = None
+    
+    # reuse connections by all managers of this process, e.g. in batch worker
+    @classmethod
+    def enable_pool(cls) -> None:
+        if cls.__pool is None:
+            cls.__pool = ConnectionPool()
+    
+    @classmethod
+    def close_pool(cls) -> None:
+        if cls.__pool is not None:
+            cls.__pool.close_all()
+            cls.__pool = None
+    
+    # find doubles of all managers of this process in local snapshot
+    @classmethod
+    def enable_snapshot(cls, snapshot: UsersSnapshot) -> None:
+        cls.__snapshot = snapshot
     
     # init data and connect to database
     def __init__(self) -> None:
@@ -37,9 +128,13 @@ class DatabaseManager:
         self.__USER = os.getenv("DB_USER")
         self.__PASSWORD = os.getenv("DB_PASSWORD")
         self.__CHARSET = os.getenv("DB_CHARSET")
+        self.__prefetched = {}
         
-        # start session
-        self.__start_connection()
+        # take connection from pool or start session
+        if self.__pool is None or (connection := self.__pool.acquire()) is None:
+            self.__start_connection()
+        else:
+            self.__connection = connection
     
     # start
     def __start_connection(self) -> None:
@@ -52,12 +147,63 @@ class DatabaseManager:
                                             cursorclass=pymysql.cursors.DictCursor)
         print("Success")
     
-    # delete, close connection
+    # delete, close connection or return it to pool
     def __del__(self) -> None:
+        if self.__pool is not None and self.__connection.open:
+            self.__pool.release(self.__connection)
+            return
         print("Closing connection to database...")
         self.__connection.close()
         print("Success")
     
+    # main record and doubles by one query, doubles queries of this user are answered from memory later
+    def get_user_card(self, usernum: int) -> dict[str, Any] | None:
+        # with fresh snapshot only main record is read from database
+        if self.__snapshot is not None and self.__snapshot.is_fresh():
+            return self.__get_user_card_with_snapshot(usernum)
+        
+        with self.__connection.cursor() as cursor:
+            cursor.execute(Queries.GET_USER_CARD, (usernum,))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        
+        # doubles are null if field is empty, such doubles aren't checked
+        max_length = row.pop("group_concat_max_len")
+        doubles = {field: row.pop(field) for field in Database.DOUBLE_FIELDS}
+        prefetched = {
+            "double_ip": (Queries.GET_USERNUMS_BY_IP, (row["IP"],)),
+            "double_switch_port": (Queries.GET_USERNUMS_BY_SWITCH_PORT, (row["switchP"], row["PortP"])),
+            "double_public_ip": (Queries.GET_USERNUMS_BY_PUBLIC_IP, (row["Add_IP"],)),
+        }
+        for field, key in prefetched.items():
+            # list cut by group_concat_max_len is incomplete, such doubles are found by their own query if needed
+            if (value := doubles[field]) is not None and len(value) < max_length:
+                self.__prefetched[key] = [int(number) for number in value.split(",")]
+        return row
+    
+    # doubles from snapshot, user itself is always in the list even if snapshot is older than the record
+    def __get_user_card_with_snapshot(self, usernum: int) -> dict[str, Any] | None:
+        row = self.get_main_record(usernum)
+        if row is None:
+            return None
+        
+        def with_user(usernums: list[int]) -> list[int]:
+            return sorted({*usernums, usernum})
+        
+        self.__prefetched[(Queries.GET_USERNUMS_BY_IP, (row["IP"],))] = with_user(self.__snapshot.get_usernum_by_ip(row["IP"]))
+        self.__prefetched[(Queries.GET_USERNUMS_BY_SWITCH_PORT, (row["switchP"], row["PortP"]))] = with_user(self.__snapshot.get_usernum_by_switch_port(row["switchP"], row["PortP"]))
+        self.__prefetched[(Queries.GET_USERNUMS_BY_PUBLIC_IP, (row["Add_IP"],))] = with_user(self.__snapshot.get_usernum_by_public_ip(row["Add_IP"]))
+        return row
+    
+    # usernums from prefetched user card or by query
+    def __get_usernums(self, query: str, params: tuple[Any, ...]) -> list[int]:
+        if (usernums := self.__prefetched.get((query, params))) is not None:
+            return list(usernums)
+        with self.__connection.cursor() as cursor:
+            cursor.execute(query, params)
+            return [row[Database.USERNUM] for row in cursor.fetchall()]
+    
     # get main data about this user
     def get_main_record(self, usernum: int) -> dict[str, Any]:
         with self.__connection.cursor() as cursor:
@@ -66,24 +212,42 @@ class DatabaseManager:
     
     # find users on this switch and port
     def get_usernum_by_switch_port(self, switch: str, port: int) -> list[int]:
+        return self.__get_usernums(Queries.GET_USERNUMS_BY_SWITCH_PORT, (switch, port))
+    
+    # find all users on this switch, ordered by port
+    def get_usernum_by_switch(self, switch: str) -> list[int]:
         with self.__connection.cursor() as cursor:
-            cursor.execute(Queries.GET_USERNUMS_BY_SWITCH_PORT, (switch, port))
+            cursor.execute(Queries.GET_USERNUMS_BY_SWITCH, (switch,))
             return [row[Database.USERNUM] for row in cursor.fetchall()]
     
     # find users with this ip
     def get_usernum_by_ip(self, ip: str) -> list[int]:
-        with self.__connection.cursor() as cursor:
-            cursor.execute(Queries.GET_USERNUMS_BY_IP, (ip,))
-            return [row[Database.USERNUM] for row in cursor.fetchall()]
+        return self.__get_usernums(Queries.GET_USERNUMS_BY_IP, (ip,))
     
     # find users with this public ip
     def get_usernum_by_public_ip(self, ip: str) -> list[int]:
+        return self.__get_usernums(Queries.GET_USERNUMS_BY_PUBLIC_IP, (ip,))
+    
+    # find users by condition written by support staff for batch diagnostics
+    def get_usernums_where(self, condition: str) -> list[int]:
         with self.__connection.cursor() as cursor:
-            cursor.execute(Queries.GET_USERNUMS_BY_PUBLIC_IP, (ip,))
+            cursor.execute(Queries.GET_USERNUMS_WHERE.format(condition=condition))
             return [row[Database.USERNUM] for row in cursor.fetchall()]
     
     # get switch and port for user
     def get_switch_port(self, usernum: int) -> SwitchPortData:
         with self.__connection.cursor() as cursor:
             cursor.execute(Queries.GET_SWITCH_PORT, (usernum,))
-            return cursor.fetchone()
\ No newline at end of file
+            return cursor.fetchone()
+    
+    # fields of all users for local snapshot, rows are streamed without loading the whole table into client memory
+    def get_snapshot_rows(self) -> Iterator[tuple[int, str | None, str | None, int | None, str | None]]:
+        with self.__connection.cursor(pymysql.cursors.SSCursor) as cursor:
+            cursor.execute(Queries.GET_SNAPSHOT_ROWS)
+            yield from cursor
+    
+    # main records of all users for audit, streamed the same way
+    def get_all_records(self) -> Iterator[dict[str, Any]]:
+        with self.__connection.cursor(pymysql.cursors.SSDictCursor) as cursor:
+            cursor.execute(Queries.GET_ALL_RECORDS)
+            yield from cursor
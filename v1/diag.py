@@ -1,21 +1,30 @@
 #!/usr/bin/python3
+from __future__ import annotations
+import argparse
+import contextlib
+import io
+import json
 import traceback
 import time
 import sys
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Any, Iterable, Iterator, TextIO, TYPE_CHECKING
 # user's modules
+from const import Database, Diagnostics
 from diag_handler import DiagHandler
-from city_diag_handler import CityDiagHandler
-from country_diag_handler import CountryDiagHandler
-# from test_db import TestDatabaseManager
+
+# import as type only by Pylance (for VS Code)
+if TYPE_CHECKING:
+    from L2_switch import L2Switch
 
 
 ##### START DIAGNOSTICS #####
 
-def main(usernum: int = None, print_output : bool = False) -> None:
+def main(usernum: int = None, print_output : bool = False, shared_L2_manager: L2Switch | None = None) -> bool:
     # get usernum
     if usernum is None:
         usernum = int(input("Usernum: "))
-    
+
     # try to perform database connection and country check
     try:
         # with base handler class, check payment to decide country user or not
@@ -24,33 +33,203 @@ def main(usernum: int = None, print_output : bool = False) -> None:
         # base annotation for handler object
         handler: DiagHandler
 
-        # depending on country or not, create main handler object
+        # depending on country or not, create main handler object, only its modules are imported
         if country:
+            from country_diag_handler import CountryDiagHandler
             handler = CountryDiagHandler(usernum, db_manager, record_data, inactive_payment, print_output)
         else:
-            handler = CityDiagHandler(usernum, db_manager, record_data, inactive_payment, print_output)
-        
+            from city_diag_handler import CityDiagHandler
+            handler = CityDiagHandler(usernum, db_manager, record_data, inactive_payment, print_output, shared_L2_manager)
+
         # delete this function's database manager reference so class instance could control it
         del db_manager
 
         # run diagnostics
         handler.check_all()
+        return True
 
     # exception in this function, print traceback
     except Exception:
         print("Exception while working with the database record:")
         traceback.print_exc()
-    
-if __name__ == "__main__":
-    print_output = "-v" in sys.argv    # if True, write L2 and L3 managers output in stdout buffer
+        return False
+
+
+##### BATCH DIAGNOSTICS #####
+
+# diagnose one user, everything printed is saved in result record
+def diagnose(usernum: int, shared_L2_manager: L2Switch | None = None) -> dict[str, Any]:
+    start_time = time.perf_counter()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            ok = main(usernum, shared_L2_manager=shared_L2_manager)
+        # diagnostics must go on with other users whatever happens
+        except BaseException:
+            traceback.print_exc()
+            ok = False
+    return {"usernum": usernum, "ok": ok, "seconds": round(time.perf_counter() - start_time, 2), "output": output.getvalue()}
+
+# batch worker keeps database connection between users, so user card costs one query, doubles are found in snapshot if it's set
+def init_database() -> None:
+    from database_manager import DatabaseManager
+    DatabaseManager.enable_pool()
+    if Database.SNAPSHOT_PATH:
+        from users_snapshot import UsersSnapshot
+        DatabaseManager.enable_snapshot(UsersSnapshot())
+
+# snapshot is refreshed once before batch, workers use it while it's fresh
+def refresh_users_snapshot() -> None:
+    from database_manager import DatabaseManager
+    from users_snapshot import UsersSnapshot
+    with contextlib.redirect_stdout(sys.stderr):
+        db_manager = DatabaseManager()
+        try:
+            if (stats := UsersSnapshot().refresh_if_stale(db_manager)) is not None:
+                print("Users snapshot refreshed:", stats)
+        finally:
+            del db_manager
+
+# usernums from file or stdin, one per line, empty lines and comments are skipped
+def read_usernums(lines: Iterable[str]) -> Iterator[int]:
+    for line in lines:
+        line = line.split("#")[0].strip()
+        if not line:
+            continue
+        try:
+            yield int(line)
+        except ValueError:
+            print("Not a usernum:", line, file=sys.stderr)
+
+# usernums found in database by condition or by switch
+def query_usernums(condition: str | None = None, switch: str | None = None) -> list[int]:
+    from database_manager import DatabaseManager
+    with contextlib.redirect_stdout(sys.stderr):
+        db_manager = DatabaseManager()
+        usernums = db_manager.get_usernum_by_switch(switch) if switch else db_manager.get_usernums_where(condition)
+        del db_manager
+    return usernums
+
+# diagnose users by worker pool, record of user is returned as soon as user is done
+def batch_records(usernums: Iterable[int], workers: int) -> Iterator[dict[str, Any]]:
+    usernums = iter(usernums)
+    running: dict[Future, int] = {}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_database) as executor:
+        while True:
+            # keep only few users in queue, so usernums from stdin are read while diagnostics go
+            for usernum in usernums:
+                running[executor.submit(diagnose, usernum)] = usernum
+                if len(running) >= workers * 2:
+                    break
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                usernum = running.pop(future)
+                # worker process itself died
+                if (err := future.exception()) is not None:
+                    record = {"usernum": usernum, "ok": False, "seconds": None, "output": f"{type(err).__name__}: {err}"}
+                else:
+                    record = future.result()
+                yield record
+
+# shared switch session with switch-wide tables read, output goes to stderr not to mix with records
+def connect_switch(switch: str) -> L2Switch:
+    from L2_switch import L2Switch
+    with contextlib.redirect_stdout(sys.stderr):
+        L2_manager = L2Switch(switch, 0)
+        L2_manager.preload_switch_tables()
+    return L2_manager
+
+# diagnose all users of switch by one L2 session, switch-wide tables are read once and every port is parsed from them
+def switch_records(switch: str) -> Iterator[dict[str, Any]]:
+    init_database()
+    usernums = query_usernums(switch=switch)
+
+    # port doesn't matter yet, every user moves switch to own port
+    try:
+        L2_manager = connect_switch(switch)
+    # all users have the same error if switch can't be diagnosed
+    except Exception as err:
+        for usernum in usernums:
+            yield {"usernum": usernum, "ok": False, "seconds": None, "output": str(err)}
+        return
+
+    for index, usernum in enumerate(usernums):
+        record = diagnose(usernum, L2_manager)
+        yield record
+        if record["ok"] or index == len(usernums) - 1:
+            continue
+
+        # diagnostics failed outside of equipment checks, session state is unknown and the rest of users get new one
+        with contextlib.redirect_stdout(sys.stderr):
+            del L2_manager
+        try:
+            L2_manager = connect_switch(switch)
+        except Exception as err:
+            for usernum in usernums[index + 1:]:
+                yield {"usernum": usernum, "ok": False, "seconds": None, "output": str(err)}
+            return
+
+    # close the only session
+    with contextlib.redirect_stdout(sys.stderr):
+        del L2_manager
+
+# write one json record per user as soon as user is done
+def write_records(records: Iterable[dict[str, Any]], output: TextIO) -> None:
     start_time = time.perf_counter()
-    main(print_output=print_output)
-    print(time.perf_counter() - start_time)
+    done = failed = 0
+    for record in records:
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+        done += 1
+        failed += not record["ok"]
+
+    # throughput for the whole batch
+    minutes = (time.perf_counter() - start_time) / 60
+    print(f"Users: {done}, failed: {failed}, time: {minutes:.2f} min, {done / minutes if minutes else 0:.1f} users/min", file=sys.stderr)
 
-    # test_db_manager = TestDatabaseManager()
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="User diagnostics, one usernum asked by default")
+    parser.add_argument("-v", action="store_true", dest="print_output", help="print L2 and L3 sessions output")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--batch", metavar="FILE", help="file with usernums, - for stdin")
+    source.add_argument("--where", metavar="CONDITION", help="usernums from database by condition, e.g. \"Number_net = 5\"")
+    source.add_argument("--switch", metavar="IP", help="all users of switch by one session")
+    parser.add_argument("--workers", type=int, default=Diagnostics.BATCH_WORKERS)
+    parser.add_argument("--output", metavar="FILE", help="file for json records, stdout by default")
+    args = parser.parse_args()
 
-    # for usernum in test_db_manager.get_random_usernums():
-    #     print(usernum)
-    #     start_time = time.perf_counter()
-    #     main(usernum)
-    #     print(time.perf_counter() - start_time)
+    # session output of many users at the same time can't be read
+    if args.print_output and (args.batch or args.where or args.switch):
+        parser.error("-v can't be used in batch mode")
+    return args
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    # one user, interactive
+    if not args.batch and not args.where and not args.switch:
+        start_time = time.perf_counter()
+        main(print_output=args.print_output)
+        print(time.perf_counter() - start_time)
+        sys.exit()
+
+    # batch of users
+    if Database.SNAPSHOT_PATH:
+        refresh_users_snapshot()
+    with contextlib.ExitStack() as stack:
+        if args.switch:
+            # one process diagnoses every user, nobody answers questions about speed, such payment stays unknown
+            sys.stdin = io.StringIO()
+            records = switch_records(args.switch)
+        elif args.where:
+            records = batch_records(query_usernums(args.where), args.workers)
+        elif args.batch == "-":
+            records = batch_records(read_usernums(sys.stdin), args.workers)
+        else:
+            records = batch_records(read_usernums(stack.enter_context(open(args.batch))), args.workers)
+        output = stack.enter_context(open(args.output, "w")) if args.output else sys.stdout
+        write_records(records, output)
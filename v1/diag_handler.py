@@ -256,24 +256,23 @@ class DiagHandler(BaseHandler):
 
     ##### BASE FIRST CHECK PART #####
 
+    # it's country if user has active country nnet or payment
+    @staticmethod
+    def is_country(record_data: dict[str, Any]) -> bool:
+        return record_data["nnet"] == Country.NSERV_NNET or record_data["payment"] in Database.COUNTRY_PAYMENT
+
     # static method to get main data from database and decide country or not
     @staticmethod
     def decide_country_or_city(usernum: int) -> tuple[bool, DatabaseManager, dict[str, Any], bool]:
-        # it's country if user has active country nnet or payment
-        def check_country_or_city(payment, nnet):
-            if (nnet == Country.NSERV_NNET or payment in Database.COUNTRY_PAYMENT):
-                return True
-            return False
-
         try:
             # connect and get record from database
             db_manager = DatabaseManager()
-            dict_data = db_manager.get_main_record(usernum)
+            dict_data = db_manager.get_user_card(usernum)
             record_data = {Database.KEY_FIELD[key]: value for key, value in dict_data.items() if key != Database.USERNUM}
             
             # check inactive payment and country
             inactive_payment = record_data["payment"] in Database.INACTIVE_PAYMENT
-            country = check_country_or_city(record_data["payment"], record_data["nnet"])
+            country = DiagHandler.is_country(record_data)
             
             # return True if it's country payment, return database manager, main data object and flag for inactive payment so not to check it later
             return country, db_manager, record_data, inactive_payment
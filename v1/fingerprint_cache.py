@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+from __future__ import annotations
+import json
+import os
+from typing import ClassVar, TypedDict
+# user's modules
+from const import CitySwitch
+
+
+##### FINGERPRINT OF IDENTIFIED SWITCH #####
+
+class Fingerprint(TypedDict):
+    model: str
+    cli_type: str
+    ports: int | None
+    firmware: str | None
+
+
+##### CACHE OF FINGERPRINTS KEPT IN FILE BETWEEN RUNS #####
+
+class FingerprintCache:
+    __entries: ClassVar[dict[str, Fingerprint] | None] = None
+
+    # get fingerprint of switch by ip
+    @classmethod
+    def get(cls, ipaddress: str) -> Fingerprint | None:
+        if cls.__entries is None:
+            cls.__entries = FingerprintCache.__read()
+        return cls.__entries.get(ipaddress)
+
+    # save new or changed fingerprint
+    @classmethod
+    def put(cls, ipaddress: str, fingerprint: Fingerprint) -> None:
+        # file is re-read before writing, so entries saved by other runs aren't lost
+        cls.__entries = FingerprintCache.__read() if CitySwitch.FINGERPRINT_CACHE else (cls.__entries or {})
+        cls.__entries[ipaddress] = fingerprint
+        FingerprintCache.__write(cls.__entries)
+
+    # read all fingerprints, missing or broken file is the same as empty cache
+    @staticmethod
+    def __read() -> dict[str, Fingerprint]:
+        if not CitySwitch.FINGERPRINT_CACHE:
+            return {}
+        try:
+            with open(CitySwitch.FINGERPRINT_CACHE, "r") as F:
+                return json.load(F)
+        except (OSError, ValueError):
+            return {}
+
+    # write through temporary file, so readers never see half-written file
+    @staticmethod
+    def __write(entries: dict[str, Fingerprint]) -> None:
+        if not CitySwitch.FINGERPRINT_CACHE:
+            return
+        temp_path = f"{CitySwitch.FINGERPRINT_CACHE}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(CitySwitch.FINGERPRINT_CACHE) or ".", exist_ok=True)
+            with open(temp_path, "w") as F:
+                json.dump(entries, F, indent=1, sort_keys=True)
+            os.replace(temp_path, CitySwitch.FINGERPRINT_CACHE)
+        # cache is only an optimization, diagnostics work without it
+        except OSError:
+            pass
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+import re
+from datetime import datetime
+# user's modules
+from const import CitySwitch
+from commands import CommandRegexData, pattern
+
+
+##### INCREMENTAL PARSER OF PAGED SWITCH LOG #####
+
+class PortFlapLogParser:
+    __model: str
+    __format: str
+    __login_and_first: re.Pattern
+    __first: re.Pattern
+    __port_event: re.Pattern
+    __link_up: re.Pattern
+    __login_datetime: datetime | None
+    __first_datetime: datetime | None
+    __last_flap_datetime: datetime | None
+    count: int
+    empty_page: bool
+
+    # log goes from the newest records, each page is parsed once when it comes
+    def __init__(self, model: str, command_regex: CommandRegexData) -> None:
+        self.__model = model
+        self.__format = command_regex["format"]
+        self.__login_and_first = pattern(command_regex["login_and_first"])
+        # the last datetime on page is the earliest, greedy pattern finds it by one scan back from the end
+        self.__first = pattern(command_regex["first"])
+        self.__port_event = pattern(command_regex["regex"])
+        self.__link_up = pattern(command_regex["findall"])
+
+        self.__login_datetime = None
+        self.__first_datetime = None
+        self.__last_flap_datetime = None
+        self.count = 0
+        self.empty_page = False
+
+    # datetime from regex groups, for 1210, datetime consists of month, day and time, year is current year
+    def __parse_datetime(self, groups: tuple[str, ...]) -> datetime:
+        if self.__model == "DGS-1210-28/ME":
+            parsed = datetime.strptime(str(datetime.now().year) + " " + " ".join(groups), self.__format)
+            # when new year comes
+            if self.__login_datetime is not None and parsed.month > self.__login_datetime.month:
+                parsed = parsed.replace(year=parsed.year - 1)
+            return parsed
+        # for other, datetime consists of date and time
+        return datetime.strptime(" ".join(groups), self.__format)
+
+    # update earliest time, last flap and count by the next page, ValueError if datetime on switch is invalid
+    def feed(self, page: str) -> None:
+        # the first page starts with login of this session
+        if self.__login_datetime is None:
+            match = self.__login_and_first.search(page)
+            middle = len(match.groups()) // 2
+            self.__login_datetime = self.__parse_datetime(match.groups()[:middle])
+            self.__first_datetime = self.__parse_datetime(match.groups()[middle:])
+        # if no datetime found while new page scanning, it means new page is empty
+        else:
+            match = self.__first.search(page)
+            if not match:
+                self.empty_page = True
+                return
+            self.__first_datetime = self.__parse_datetime(match.groups())
+
+        # the first port record found is the last flap
+        if self.__last_flap_datetime is None and (match := self.__port_event.search(page)):
+            self.__last_flap_datetime = self.__parse_datetime(match.groups())
+        self.count += len(self.__link_up.findall(page))
+
+    # minutes between login and the earliest displayed time
+    @property
+    def range_minutes(self) -> int:
+        return int((self.__login_datetime - self.__first_datetime).total_seconds() // 60)
+
+    # minutes between login and last port flap, 0 if not found
+    @property
+    def last_flap_minutes(self) -> int:
+        if self.__last_flap_datetime is None:
+            return 0
+        return int((self.__login_datetime - self.__last_flap_datetime).total_seconds() // 60)
+
+    # scrolling is useless if next pages can't change the verdict of diagnostics
+    def is_decided(self) -> bool:
+        # log is old enough
+        if self.range_minutes >= CitySwitch.MAX_MINUTE_RANGE_PORT_FLAPPING:
+            return True
+        # all flaps on next pages are older than displayed time
+        if self.__last_flap_datetime is None:
+            return self.range_minutes >= CitySwitch.LAST_FLAP_MAX_MINUTE_REMOTENESS
+        # last flap is too old or there are already enough flaps
+        return self.last_flap_minutes >= CitySwitch.LAST_FLAP_MAX_MINUTE_REMOTENESS or self.count >= CitySwitch.MIN_COUNT_FLAPPING
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+import argparse
+import os
+import re
+from timeit import Timer
+from typing import Any, Callable
+
+# parsing doesn't need real environment, but const reads it
+os.environ.setdefault("LAST_NSERV_NNET", "1016")
+
+# user's modules
+import commands
+
+# model with all commands, user's port
+MODEL = "DES-3028"
+PORT = 2
+
+# table sizes of synthetic outputs
+SIZES = {
+    "small": {"fdb": 64, "vlans": 8, "acl": 8},
+    "medium": {"fdb": 2048, "vlans": 256, "acl": 28},
+    "huge": {"fdb": 16384, "vlans": 4094, "acl": 52},
+}
+
+
+##### SYNTHETIC OUTPUTS IN FORMAT OF DES-3028 #####
+
+def fdb_output(rows: int) -> str:
+    lines = [f"{i % 4094 + 1:<5}{'vlan' + str(i % 4094 + 1):<20}00-11-22-{i >> 16 & 255:02X}-{i >> 8 & 255:02X}-{i & 255:02X}  {i % 28 + 1:<6}Dynamic" for i in range(rows)]
+    return "show fdb\r\n\r\nVID  VLAN Name           MAC Address        Port  Type\r\n---- ------------------- ------------------ ----- ----\r\n" + "\r\n".join(lines) + f"\r\n\r\nTotal Entries: {rows}\r\n"
+
+def vlan_output(vlans: int) -> str:
+    return "show vlan\r\n" + "".join(f"\r\nVID             : {vid:<11}VLAN Name     : vlan{vid}\r\nVLAN Type       : Static     Advertisement : Disabled\r\nMember ports    : 1-28\r\n" for vid in range(1, vlans + 1))
+
+def acl_output(ports: int) -> str:
+    blocks = [f"Ports : {port}  Mode : Permit\r\nOffset 0 : 0x0a0000{port:02x}  0xffffffff\r\nOffset 0 : 0x0a0000{port:02x}  0xffffffff" for port in range(1, ports + 1)]
+    return "Access Profile Table\r\n\r\nAccess Profile ID: 1   Type : Packet Content Filter\r\n" + "\r\n".join(blocks) + "\r\nAccess Profile ID: 2\r\nMode : Deny\r\n"
+
+
+##### CASES: PARSING AS IT WAS AND BY REGISTRY #####
+
+# pattern as it was before anchoring
+def unanchored(regex: str) -> str:
+    return regex.removeprefix("(?m)^[ \\t]*")
+
+# each case gives the same result by old and new parsing, only time differs
+def build_cases(outputs: dict[str, str]) -> dict[str, tuple[Callable[[], Any], Callable[[], Any]]]:
+    show_fdb = commands.show_fdb.__wrapped__
+    show_vlan = commands.show_vlan.__wrapped__
+    show_access_profile = commands.show_access_profile.__wrapped__
+
+    def fdb_old() -> set[str]:
+        return {row[2] for row in re.findall(unanchored(show_fdb(MODEL, PORT)["regex"]), outputs["fdb"])}
+    def fdb_new() -> set[str]:
+        return {row[2] for row in commands.pattern(commands.show_fdb(MODEL, PORT)["regex"]).findall(outputs["fdb"])}
+
+    def vlan_old() -> dict[int, str]:
+        return {int(vid): name for vid, name in re.findall(unanchored(show_vlan(MODEL)["regex"]), outputs["vlan"])}
+    def vlan_new() -> dict[int, str]:
+        return {int(vid): name for vid, name in commands.pattern(commands.show_vlan(MODEL)["regex"]).findall(outputs["vlan"])}
+
+    def acl_old() -> list[str]:
+        return re.findall(show_access_profile(MODEL, PORT)["regex"], outputs["acl"])
+    def acl_new() -> list[str]:
+        return commands.pattern(commands.show_access_profile(MODEL, PORT)["regex"]).findall(outputs["acl"])
+
+    # building of command dictionary alone, the biggest one
+    def build_old() -> Any:
+        return commands.show_ports.__wrapped__(MODEL, PORT)
+    def build_new() -> Any:
+        return commands.show_ports(MODEL, PORT)
+
+    return {"show_fdb": (fdb_old, fdb_new),
+            "show_vlan": (vlan_old, vlan_new),
+            "show_access_profile": (acl_old, acl_new),
+            "build_show_ports": (build_old, build_new)}
+
+# microseconds per call, the best of several repeats
+def measure(function: Callable[[], Any]) -> float:
+    timer = Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+def run(size_name: str, outputs: dict[str, str]) -> None:
+    for name, (old, new) in build_cases(outputs).items():
+        if old() != new():
+            raise AssertionError(f"{name}: results differ")
+        old_time, new_time = measure(old), measure(new)
+        print(f"{size_name:<10}{name:<22}{old_time:>12.1f} us{new_time:>12.1f} us{old_time / new_time:>9.1f}x")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmarks of parsing switch outputs by commands registry")
+    parser.add_argument("--sizes", default="small,medium,huge", help="comma separated: " + ",".join(SIZES))
+    parser.add_argument("--outputs", default=None, help="directory with recorded outputs of DES-3028: fdb.txt, vlan.txt, acl.txt")
+    args = parser.parse_args()
+
+    print(f"{'size':<10}{'case':<22}{'before':>15}{'registry':>15}{'speedup':>10}")
+
+    # recorded outputs instead of synthetic ones
+    if args.outputs:
+        outputs = {}
+        for name in ("fdb", "vlan", "acl"):
+            with open(os.path.join(args.outputs, f"{name}.txt"), "r", errors="replace") as F:
+                outputs[name] = F.read()
+        run("recorded", outputs)
+        return
+
+    for size_name in args.sizes.split(","):
+        size = SIZES[size_name]
+        run(size_name, {"fdb": fdb_output(size["fdb"]), "vlan": vlan_output(size["vlans"]), "acl": acl_output(size["acl"])})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+#!/usr/bin/python3
+from __future__ import annotations
+import argparse
+import json
+import os
+import socket
+import socketserver
+import threading
+import pexpect
+from pprint import pprint
+from time import monotonic, sleep
+from typing import Any, BinaryIO, TYPE_CHECKING
+# user's modules
+from const import SessionPool
+
+# import as type only by Pylance (for VS Code)
+if TYPE_CHECKING:
+    from io import BufferedWriter
+
+
+##### PROTOCOL HELPERS #####
+
+# session output is bytes, latin-1 keeps every byte in json string
+def to_text(data: bytes) -> str:
+    return data.decode("latin-1")
+
+def to_bytes(text: str) -> bytes:
+    return text.encode("latin-1")
+
+# pexpect exceptions can be expected as patterns, they're sent by name
+SPECIAL_PATTERNS: dict[str, type[pexpect.ExceptionPexpect]] = {"TIMEOUT": pexpect.TIMEOUT, "EOF": pexpect.EOF}
+
+
+##### MATCH OBJECT OF EXPECT DONE IN DAEMON #####
+
+class RemoteMatch:
+    __groups: list[bytes | None]
+    __named: dict[str, bytes | None]
+
+    def __init__(self, groups: list[str | None], named: dict[str, str | None]) -> None:
+        self.__groups = [None if group is None else to_bytes(group) for group in groups]
+        self.__named = {name: None if group is None else to_bytes(group) for name, group in named.items()}
+
+    # the same as re.Match.group: one group or tuple of groups by numbers or names
+    def group(self, *indices: int | str) -> bytes | None | tuple[bytes | None, ...]:
+        if not indices:
+            return self.__groups[0]
+        groups = tuple(self.__named[index] if isinstance(index, str) else self.__groups[index] for index in indices)
+        return groups[0] if len(groups) == 1 else groups
+
+    def groups(self) -> tuple[bytes | None, ...]:
+        return tuple(self.__groups[1:])
+
+    def groupdict(self) -> dict[str, bytes | None]:
+        return dict(self.__named)
+
+
+##### SESSION LENT BY POOL DAEMON, USED LIKE PEXPECT SPAWN #####
+
+class PooledSession:
+    reused: bool
+    state: dict[str, Any]
+    timeout: float
+    before: bytes
+    after: bytes
+    match: RemoteMatch | type[pexpect.ExceptionPexpect] | None
+    __socket: socket.socket
+    __reader: BinaryIO
+    __logfile: BufferedWriter | None
+    __leased: bool
+    __prompt: str
+    __at_prompt: bool
+
+    # lease session to device by its spawn command, OSError if daemon isn't running or device has no free session
+    def __init__(self, ipaddress: str, command: str, timeout: float, prompt: str, logfile: BufferedWriter | None) -> None:
+        self.timeout = timeout
+        self.before = self.after = b""
+        self.match = None
+        self.__logfile = logfile
+        self.__leased = False
+        self.__prompt = prompt
+        self.__at_prompt = False
+
+        # connection to daemon lives as long as the lease, daemon closes session if connection is lost
+        self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.__socket.connect(SessionPool.SOCKET)
+            self.__reader = self.__socket.makefile("rb")
+            response = self.__request(op="lease", ip=ipaddress, command=command, timeout=timeout, prompt=prompt)
+        except (OSError, pexpect.EOF) as err:
+            self.__socket.close()
+            raise ConnectionError(f"Session pool isn't available: {err}")
+
+        if not response["ok"]:
+            self.__socket.close()
+            raise ConnectionError(response["error"])
+
+        # reused session is already logged in, state is saved by device that used it before
+        self.__leased = True
+        self.reused = response["reused"]
+        self.state = response["state"]
+        # reused session has just passed health check by prompt
+        self.__at_prompt = self.reused
+
+    # one json request and one json response per line
+    def __request(self, **request: Any) -> dict[str, Any]:
+        self.__socket.sendall(json.dumps(request).encode() + b"\n")
+        line = self.__reader.readline()
+
+        # daemon stopped, it's the same as lost session for device
+        if not line:
+            self.__leased = False
+            raise pexpect.EOF("Session pool daemon closed connection")
+        return json.loads(line)
+
+    # write data to session output like pexpect logfile does
+    def __log(self, data: bytes) -> None:
+        if self.__logfile and data:
+            self.__logfile.write(data)
+            self.__logfile.flush()
+
+    def send(self, s: str) -> int:
+        self.__log(s.encode())
+        self.__at_prompt = False
+        return self.__request(op="send", s=s)["result"]
+
+    def sendline(self, s: str = "") -> int:
+        self.__log(f"{s}\n".encode())
+        self.__at_prompt = False
+        return self.__request(op="sendline", s=s)["result"]
+
+    def sendcontrol(self, char: str) -> int:
+        self.__at_prompt = False
+        return self.__request(op="sendcontrol", char=char)["result"]
+
+    # expect in daemon, before, after and match groups are sent back
+    def expect(self, pattern: Any, timeout: float = -1) -> int:
+        patterns = pattern if isinstance(pattern, list) else [pattern]
+        prompt_indexes = {index for index, item in enumerate(patterns) if item == self.__prompt}
+        patterns = [{"special": item.__name__} if item in SPECIAL_PATTERNS.values() else item for item in patterns]
+        response = self.__request(op="expect", patterns=patterns, timeout=self.timeout if timeout == -1 else timeout)
+
+        self.before = to_bytes(response["before"])
+        self.after = to_bytes(response.get("after", ""))
+        self.__log(self.before + self.after)
+
+        # timeout or eof that wasn't expected
+        if not response["ok"]:
+            self.__at_prompt = False
+            raise SPECIAL_PATTERNS[response["exception"]](response["error"])
+
+        # command output is read up to prompt, by prompt itself or by regex ending with it
+        self.__at_prompt = "special" not in response and (response["index"] in prompt_indexes or self.after.endswith(self.__prompt.encode()))
+
+        # expected timeout or eof matches as exception type, the same as in pexpect
+        if "special" in response:
+            self.match = SPECIAL_PATTERNS[response["special"]]
+        else:
+            self.match = RemoteMatch(response["groups"], response["named"])
+        return response["index"]
+
+    # session can be given to the next device only when nothing is left unread after the last command
+    @property
+    def at_prompt(self) -> bool:
+        return self.__at_prompt
+
+    def isalive(self) -> bool:
+        return self.__leased and self.__request(op="isalive")["result"]
+
+    # close session in daemon, e.g. after failed login
+    def close(self) -> None:
+        self.__finish(op="close")
+
+    # give logged in session back to pool with state for the next device and commands to run before closing
+    def release(self, state: dict[str, Any], exit_commands: list[str]) -> None:
+        self.__finish(op="release", state=state, exit_commands=exit_commands)
+
+    # end lease, daemon closes session by itself if connection is already lost
+    def __finish(self, **request: Any) -> None:
+        try:
+            if self.__leased:
+                self.__request(**request)
+        except (OSError, pexpect.EOF):
+            pass
+        self.__leased = False
+        self.__socket.close()
+
+
+##### SESSION KEPT BY DAEMON #####
+
+class PoolEntry:
+    key: tuple[str, str]
+    session: pexpect.spawn | None
+    prompt: str
+    state: dict[str, Any]
+    exit_commands: list[str]
+    busy: bool
+    last_used: float
+    uses: int
+
+    def __init__(self, key: tuple[str, str], session: pexpect.spawn | None, prompt: str) -> None:
+        self.key = key
+        self.session = session
+        self.prompt = prompt
+        self.state = {}
+        self.exit_commands = []
+        self.busy = True
+        self.last_used = monotonic()
+        self.uses = 1
+
+    # session answers with prompt and has no output left from the previous device
+    def is_healthy(self) -> bool:
+        try:
+            self.session.sendline("")
+            self.session.expect(self.prompt, timeout=SessionPool.HEALTH_CHECK_TIMEOUT)
+            self.session.expect([pexpect.TIMEOUT], timeout=SessionPool.DRAIN_TIMEOUT)
+            return True
+        except (pexpect.EOF, pexpect.TIMEOUT, OSError):
+            return False
+
+    # run exit commands if session is alive and close it
+    def close(self) -> None:
+        try:
+            for command in self.exit_commands:
+                self.session.sendline(command)
+                self.session.expect(self.prompt, timeout=SessionPool.HEALTH_CHECK_TIMEOUT)
+        except (pexpect.EOF, pexpect.TIMEOUT, OSError):
+            pass
+        self.session.close()
+
+
+##### POOL OF LOGGED IN SESSIONS BY DEVICE #####
+
+class SessionPoolState:
+    __entries: dict[tuple[str, str], list[PoolEntry]]
+    __lock: threading.Lock
+    stats: dict[str, int]
+
+    def __init__(self) -> None:
+        self.__entries = {}
+        self.__lock = threading.Lock()
+        self.stats = {"leases": 0, "reused": 0, "spawned": 0, "refused": 0, "broken": 0, "expired": 0}
+
+    # idle healthy session of device or a new one, None if device has too many busy sessions
+    def lease(self, key: tuple[str, str], timeout: float, prompt: str) -> PoolEntry | None:
+        with self.__lock:
+            self.stats["leases"] += 1
+
+        while True:
+            with self.__lock:
+                entries = self.__entries.setdefault(key, [])
+                entry = next((entry for entry in entries if not entry.busy), None)
+
+                # no idle session, reserve place for a new one if limit allows
+                if entry is None:
+                    if len(entries) >= SessionPool.MAX_SESSIONS_PER_DEVICE:
+                        self.stats["refused"] += 1
+                        return None
+                    entry = PoolEntry(key, None, prompt)
+                    entries.append(entry)
+                    break
+                entry.busy = True
+
+            # device could close idle session by itself, check it before lending
+            if entry.is_healthy():
+                entry.uses += 1
+                entry.last_used = monotonic()
+                with self.__lock:
+                    self.stats["reused"] += 1
+                return entry
+            self.remove(entry, broken=True)
+
+        # spawn outside of lock, login is done by device through the lease
+        try:
+            entry.session = pexpect.spawn(key[1], timeout=timeout)
+        except pexpect.ExceptionPexpect:
+            with self.__lock:
+                self.__entries[key].remove(entry)
+            raise
+        with self.__lock:
+            self.stats["spawned"] += 1
+        return entry
+
+    # session is idle again and keeps state for the next device
+    def release(self, entry: PoolEntry, state: dict[str, Any], exit_commands: list[str]) -> None:
+        entry.state = state
+        entry.exit_commands = exit_commands
+        entry.last_used = monotonic()
+        with self.__lock:
+            entry.busy = False
+
+    def remove(self, entry: PoolEntry, broken: bool = False) -> None:
+        with self.__lock:
+            if entry in self.__entries.get(entry.key, []):
+                self.__entries[entry.key].remove(entry)
+            if not self.__entries.get(entry.key):
+                self.__entries.pop(entry.key, None)
+            if broken:
+                self.stats["broken"] += 1
+        if entry.session is not None:
+            entry.close()
+
+    # check idle sessions, so device doesn't close them, and close sessions idle for too long
+    def keepalive(self) -> None:
+        with self.__lock:
+            idle = [entry for entries in self.__entries.values() for entry in entries if not entry.busy]
+            for entry in idle:
+                entry.busy = True
+
+        for entry in idle:
+            if monotonic() - entry.last_used > SessionPool.IDLE_TIMEOUT:
+                self.remove(entry)
+                with self.__lock:
+                    self.stats["expired"] += 1
+            elif not entry.is_healthy():
+                self.remove(entry, broken=True)
+            else:
+                with self.__lock:
+                    entry.busy = False
+
+    def close_all(self) -> None:
+        with self.__lock:
+            entries = [entry for entries in self.__entries.values() for entry in entries]
+        for entry in entries:
+            self.remove(entry)
+
+    # sessions by device for status request
+    def status(self) -> dict[str, Any]:
+        now = monotonic()
+        with self.__lock:
+            return {**self.stats,
+                    "sessions": [{"ip": ip,
+                                  "command": command,
+                                  "busy": entry.busy,
+                                  "uses": entry.uses,
+                                  "idle_s": 0 if entry.busy else round(now - entry.last_used, 1),
+                                  "state": entry.state}
+                                 for (ip, command), entries in self.__entries.items() for entry in entries]}
+
+
+##### DAEMON SERVING LEASES OVER UNIX SOCKET #####
+
+class SessionPoolHandler(socketserver.StreamRequestHandler):
+    server: SessionPoolDaemon
+    __entry: PoolEntry | None
+
+    # one connection is one lease, requests are proxied to leased session
+    def handle(self) -> None:
+        self.__entry = None
+        try:
+            while line := self.rfile.readline():
+                response = self.__handle_request(json.loads(line))
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+
+        # connection lost, it doesn't matter here
+        except (OSError, ValueError):
+            pass
+
+        # session wasn't released, its state is unknown
+        finally:
+            if self.__entry is not None:
+                self.server.pool.remove(self.__entry, broken=True)
+
+    def __handle_request(self, request: dict[str, Any]) -> dict[str, Any]:
+        pool = self.server.pool
+        entry = self.__entry
+
+        match request["op"]:
+            case "status":
+                return {"ok": True, "result": pool.status()}
+
+            case "lease":
+                entry = pool.lease((request["ip"], request["command"]), request["timeout"], request["prompt"])
+                if entry is None:
+                    return {"ok": False, "error": f"All sessions to {request['ip']} are busy"}
+                self.__entry = entry
+                return {"ok": True, "reused": entry.uses > 1, "state": entry.state}
+
+            case "send":
+                return {"ok": True, "result": entry.session.send(request["s"])}
+
+            case "sendline":
+                return {"ok": True, "result": entry.session.sendline(request["s"])}
+
+            case "sendcontrol":
+                return {"ok": True, "result": entry.session.sendcontrol(request["char"])}
+
+            case "expect":
+                return self.__expect(entry.session, request["patterns"], request["timeout"])
+
+            case "isalive":
+                return {"ok": True, "result": entry.session.isalive()}
+
+            case "close":
+                self.__entry = None
+                pool.remove(entry)
+                return {"ok": True}
+
+            case "release":
+                self.__entry = None
+                pool.release(entry, request["state"], request["exit_commands"])
+                return {"ok": True}
+
+        return {"ok": False, "error": f"Unknown operation: {request['op']}"}
+
+    # expect and send back everything device needs from session
+    @staticmethod
+    def __expect(session: pexpect.spawn, patterns: list[str | dict[str, str]], timeout: float) -> dict[str, Any]:
+        patterns = [SPECIAL_PATTERNS[item["special"]] if isinstance(item, dict) else item for item in patterns]
+        try:
+            index = session.expect(patterns, timeout=timeout)
+        except (pexpect.EOF, pexpect.TIMEOUT) as err:
+            before = session.before if isinstance(session.before, bytes) else b""
+            return {"ok": False, "exception": type(err).__name__, "error": str(err).splitlines()[0], "before": to_text(before)}
+
+        response = {"ok": True, "index": index, "before": to_text(session.before)}
+
+        # expected timeout or eof
+        if session.match in SPECIAL_PATTERNS.values():
+            response["special"] = session.match.__name__
+            return response
+
+        response["after"] = to_text(session.after)
+        response["groups"] = [None if group is None else to_text(group) for group in (session.match.group(0), *session.match.groups())]
+        response["named"] = {name: None if group is None else to_text(group) for name, group in session.match.groupdict().items()}
+        return response
+
+
+class SessionPoolDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    pool: SessionPoolState
+
+    def __init__(self, socket_path: str) -> None:
+        self.pool = SessionPoolState()
+
+        # remove socket left by stopped daemon
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, SessionPoolHandler)
+        os.chmod(socket_path, 0o600)
+
+        # keepalive works in background while server serves leases
+        threading.Thread(target=self.__keepalive_loop, daemon=True).start()
+
+    def __keepalive_loop(self) -> None:
+        while True:
+            sleep(SessionPool.KEEPALIVE_INTERVAL)
+            self.pool.keepalive()
+
+
+##### ENTRY POINT #####
+
+# print pool state of running daemon
+def print_status(socket_path: str) -> None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps({"op": "status"}).encode() + b"\n")
+        with sock.makefile("rb") as F:
+            pprint(json.loads(F.readline())["result"], sort_dicts=False)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Daemon keeping logged in telnet/ssh sessions to switches and olts")
+    parser.add_argument("--socket", default=SessionPool.SOCKET or SessionPool.DEFAULT_SOCKET)
+    parser.add_argument("--status", action="store_true", help="print sessions of running daemon and exit")
+    args = parser.parse_args()
+
+    if args.status:
+        print_status(args.socket)
+        return
+
+    daemon = SessionPoolDaemon(args.socket)
+    print("Listening:", args.socket)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.pool.close_all()
+        daemon.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+from __future__ import annotations
+import socket
+from bisect import bisect_right
+from enum import StrEnum
+from ipaddress import IPv4Network
+# user's modules
+from const import Provider, Country
+
+
+##### TYPES OF ADDRESSES #####
+
+class AddressType(StrEnum):
+    LOCAL = "local"
+    # other local subnet, only switches can be there
+    SWITCH = "switch"
+    PUBLIC = "public"
+    COUNTRY = "country"
+    UNKNOWN = "unknown"
+
+# gateway and mask length of subnet, local range has none of them
+type SubnetInfo = tuple[AddressType, str | None, int | None]
+
+UNKNOWN_INFO: SubnetInfo = (AddressType.UNKNOWN, None, None)
+
+
+# address to integer by C parser of dotted-quad notation, None if it isn't ip address
+def address_to_int(address: str) -> int | None:
+    try:
+        return int.from_bytes(socket.inet_pton(socket.AF_INET, address))
+    except (OSError, TypeError):
+        return None
+
+
+##### SORTED NON-OVERLAPPING RANGES FOUND BY BISECT #####
+
+class RangeIndex:
+    __starts: list[int]
+    __ends: list[int]
+    __infos: list[SubnetInfo]
+
+    # ranges may overlap, the narrowest one wins, e.g. public subnet inside local range
+    def __init__(self, ranges: list[tuple[int, int, SubnetInfo]]) -> None:
+        self.__starts = []
+        self.__ends = []
+        self.__infos = []
+
+        # split by all borders into elementary ranges, each one is covered by the same ranges
+        borders = sorted({start for start, _, _ in ranges} | {end + 1 for _, end, _ in ranges})
+        for start, next_start in zip(borders, borders[1:]):
+            covering = [(end - first, info) for first, end, info in ranges if first <= start and next_start - 1 <= end]
+            if not covering:
+                continue
+            info = min(covering, key=lambda item: item[0])[1]
+            # merge with previous range if it's the same subnet
+            if self.__ends and self.__ends[-1] == start - 1 and self.__infos[-1] == info:
+                self.__ends[-1] = next_start - 1
+            else:
+                self.__starts.append(start)
+                self.__ends.append(next_start - 1)
+                self.__infos.append(info)
+
+    def find(self, value: int) -> SubnetInfo | None:
+        index = bisect_right(self.__starts, value) - 1
+        if index >= 0 and value <= self.__ends[index]:
+            return self.__infos[index]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.__starts)
+
+
+##### CLASSIFIER OF ALL PROVIDER'S SUBNETS #####
+
+class SubnetClassifier:
+    __all: RangeIndex
+    __by_type: dict[AddressType, RangeIndex]
+    # built from environment on the first use
+    __default: SubnetClassifier | None = None
+
+    def __init__(self, ranges: list[tuple[int, int, SubnetInfo]]) -> None:
+        self.__all = RangeIndex(ranges)
+        # each type separately, so overlapping subnets of other types don't hide it
+        self.__by_type = {address_type: RangeIndex([item for item in ranges if item[2][0] == address_type]) for address_type in AddressType}
+
+    # classifier of subnets from constants
+    @classmethod
+    def default(cls) -> SubnetClassifier:
+        if cls.__default is None:
+            cls.__default = cls(cls.__provider_ranges())
+        return cls.__default
+
+    @staticmethod
+    def __provider_ranges() -> list[tuple[int, int, SubnetInfo]]:
+        def network_range(network: IPv4Network, info: SubnetInfo) -> tuple[int, int, SubnetInfo]:
+            return int(network.network_address), int(network.broadcast_address), info
+
+        ranges = [(int(Provider.FIRST_LOCAL_IP), int(Provider.LAST_LOCAL_IP), (AddressType.LOCAL, None, None)),
+                  network_range(Provider.SWITCH_OTHER_LOCAL_SUBNET, (AddressType.SWITCH, None, Provider.SWITCH_OTHER_LOCAL_SUBNET.prefixlen))]
+        for gateway, mask in Provider.PUBLIC_GATEWAY_MASK.items():
+            ranges.append(network_range(IPv4Network(f"{gateway}/{mask}", strict=False), (AddressType.PUBLIC, gateway, mask)))
+        for gateway in Country.VLAN_GATEWAY.values():
+            ranges.append(network_range(IPv4Network(f"{gateway}/{Country.MASK}", strict=False), (AddressType.COUNTRY, gateway, Country.MASK_LENGTH)))
+        return ranges
+
+    # type of address with gateway and mask of the narrowest subnet containing it
+    def classify(self, address: str) -> SubnetInfo:
+        if (value := address_to_int(address)) is None:
+            return UNKNOWN_INFO
+        return self.__all.find(value) or UNKNOWN_INFO
+
+    # check address only against subnets of given types
+    def is_in(self, address: str, *address_types: AddressType) -> bool:
+        if (value := address_to_int(address)) is None:
+            return False
+        for address_type in address_types:
+            if self.__by_type[address_type].find(value) is not None:
+                return True
+        return False
@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+from __future__ import annotations
+import argparse
+import sqlite3
+import time
+from typing import Any, Iterable, TYPE_CHECKING
+# user's modules
+from const import Database
+
+# import as type only by Pylance (for VS Code)
+if TYPE_CHECKING:
+    from database_manager import DatabaseManager
+
+
+##### SNAPSHOT TABLES #####
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (Number INTEGER PRIMARY KEY, IP TEXT, switchP TEXT, PortP INTEGER, Add_IP TEXT);
+CREATE INDEX IF NOT EXISTS users_ip ON users (IP);
+CREATE INDEX IF NOT EXISTS users_switch_port ON users (switchP, PortP);
+CREATE INDEX IF NOT EXISTS users_public_ip ON users (Add_IP);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value REAL);
+"""
+
+# snapshot row without usernum, compared with database row to find changes
+type UserRow = tuple[str | None, str | None, int | None, str | None]
+
+
+##### LOCAL INDEXED COPY OF USERS FIELDS USED TO FIND DOUBLES #####
+
+class UsersSnapshot:
+    __path: str
+    __connection: sqlite3.Connection
+
+    # one file is shared by all processes, each process opens its own connection
+    def __init__(self, path: str = Database.SNAPSHOT_PATH) -> None:
+        self.__path = path
+        self.__connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        # readers don't wait for refresh in progress
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.executescript(SCHEMA)
+
+    def __del__(self) -> None:
+        self.__connection.close()
+
+    # seconds since the last refresh, None if snapshot was never filled
+    def age(self) -> float | None:
+        row = self.__connection.execute("SELECT value FROM meta WHERE key = 'refreshed'").fetchone()
+        return None if row is None else time.time() - row[0]
+
+    # stale snapshot isn't used, lookups go to database
+    def is_fresh(self, max_age: int = Database.SNAPSHOT_MAX_AGE) -> bool:
+        return (age := self.age()) is not None and age <= max_age
+
+    # read all rows from database by one streaming query, only changed rows are written to snapshot
+    def refresh(self, db_manager: DatabaseManager) -> dict[str, Any]:
+        start_time = time.perf_counter()
+        local: dict[int, UserRow] = {row[0]: tuple(row[1:]) for row in self.__connection.execute("SELECT Number, IP, switchP, PortP, Add_IP FROM users")}
+
+        # new and changed rows, the rest of local rows are users deleted from database
+        changed: list[tuple[Any, ...]] = []
+        added = 0
+        for usernum, *fields in db_manager.get_snapshot_rows():
+            fields = tuple(fields)
+            old = local.pop(usernum, None)
+            if old != fields:
+                changed.append((usernum, *fields))
+                added += old is None
+
+        # the whole diff is one transaction, readers see old or new snapshot
+        with self.__connection:
+            self.__connection.execute("BEGIN IMMEDIATE")
+            self.__connection.executemany("INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?, ?)", changed)
+            self.__connection.executemany("DELETE FROM users WHERE Number = ?", ((usernum,) for usernum in local))
+            self.__connection.execute("INSERT OR REPLACE INTO meta VALUES ('refreshed', ?)", (time.time(),))
+
+        return {"added": added, "changed": len(changed) - added, "removed": len(local), "seconds": round(time.perf_counter() - start_time, 2)}
+
+    # refresh only if interval has passed, returns None if snapshot is fresh enough
+    def refresh_if_stale(self, db_manager: DatabaseManager, interval: int = Database.SNAPSHOT_REFRESH_INTERVAL) -> dict[str, Any] | None:
+        if (age := self.age()) is not None and age < interval:
+            return None
+        return self.refresh(db_manager)
+
+    def __get_usernums(self, query: str, params: Iterable[Any]) -> list[int]:
+        return [row[0] for row in self.__connection.execute(query, tuple(params))]
+
+    # find users on this switch and port
+    def get_usernum_by_switch_port(self, switch: str, port: int) -> list[int]:
+        return self.__get_usernums("SELECT Number FROM users WHERE switchP = ? AND PortP = ? ORDER BY Number", (switch, port))
+
+    # find users with this ip
+    def get_usernum_by_ip(self, ip: str) -> list[int]:
+        return self.__get_usernums("SELECT Number FROM users WHERE IP = ? ORDER BY Number", (ip,))
+
+    # find users with this public ip
+    def get_usernum_by_public_ip(self, ip: str) -> list[int]:
+        return self.__get_usernums("SELECT Number FROM users WHERE Add_IP = ? ORDER BY Number", (ip,))
+
+
+##### REFRESH FROM COMMAND LINE OR CRON #####
+
+def main() -> None:
+    from database_manager import DatabaseManager
+    parser = argparse.ArgumentParser(description="Refresh local snapshot of users used to find doubles")
+    parser.add_argument("--path", default=Database.SNAPSHOT_PATH, required=not Database.SNAPSHOT_PATH)
+    parser.add_argument("--watch", action="store_true", help="keep refreshing every interval")
+    parser.add_argument("--interval", type=int, default=Database.SNAPSHOT_REFRESH_INTERVAL)
+    args = parser.parse_args()
+
+    snapshot = UsersSnapshot(args.path)
+    while True:
+        db_manager = DatabaseManager()
+        try:
+            print(snapshot.refresh(db_manager))
+        finally:
+            del db_manager
+        if not args.watch:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
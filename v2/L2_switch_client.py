@@ -1,7 +1,7 @@
 #!/usr/bin/python3
 import asyncio
 import struct
-from typing import override, Any, Callable
+from typing import override, Any, AsyncIterator, Callable
 from collections import defaultdict
 from pprint import pprint
 from copy import deepcopy
@@ -10,6 +10,8 @@ from time import perf_counter
 from pysnmp.hlapi.v3arch.asyncio import *
 # local modules
 from snmp_client import SNMPClient
+from switch_table_cache import SwitchTableCache
+from snmp_tracing import trace_methods
 from const import SNMPRequestType, SwitchConfigSection, SNMP
 from snmp_exceptions import *
 
@@ -18,6 +20,7 @@ type RequestData = dict[str, Any]
 # standard response data can have int key type
 type ResponseData = dict[str | int, Any]
 
+@trace_methods
 class L2SwitchClient(SNMPClient):
     _port: int
     _ports_count: int
@@ -30,14 +33,19 @@ class L2SwitchClient(SNMPClient):
     _is_fiber_port: bool
     _switch_oids_config: dict[str, Any]
     
-    def __init__(self, ipaddress: str, port: int = None) -> None:
-        super().__init__(ipaddress)
+    def __init__(self, ipaddress: str, port: int = None, agent_port: int = SNMP.AGENT_PORT) -> None:
+        super().__init__(ipaddress, agent_port)
         self._port = port
     
     @override
     def _post_init(self) -> None:
         switch_general_config = self._config["models"][self._model]
         self._ports_count = switch_general_config["ports_count"]
+        self._switch_oids_config = switch_general_config["oids"]
+
+        # client without port works only with switch-wide data
+        if self._port is None:
+            return
 
         self._is_gigabit_ethernet_port = self._port >= switch_general_config["first_gigabit_port"]
         self._number_of_cable_diagnostic_pairs = 4 if self._is_gigabit_ethernet_port else 2
@@ -46,8 +54,6 @@ class L2SwitchClient(SNMPClient):
         self._check_combo_fiber_port_lock = asyncio.Lock()
         self._is_combo_fiber_port = None
         self._is_fiber_port = self._port in switch_general_config["fiber_ports"]
-
-        self._switch_oids_config = switch_general_config["oids"]
     
     ### MIB MODULES ###
 
@@ -311,49 +317,32 @@ class L2SwitchClient(SNMPClient):
     
     # get all acl rule masks and rules in one general table
     async def get_acl_all(self) -> ResponseData:
-        ethernet = await self.get_acl_ethernet()
-        packet_content = await self.get_acl_packet_content()
+        # both acl types are read at the same time
+        task_ethernet = asyncio.create_task(self.get_acl_ethernet())
+        task_packet_content = asyncio.create_task(self.get_acl_packet_content())
+        ethernet, packet_content = await asyncio.gather(task_ethernet, task_packet_content)
 
         # sort by profile id
         return dict(sorted({**ethernet, **packet_content}.items()))
     
     # get only those acl data that affects the port
     async def get_acl_for_port(self) -> ResponseData:
-        # need to get the general table
-        acl_table = await self.get_acl_all()
-        result = {}
-
-        # go through all profile id configs
-        for profile_id, profile_id_config in acl_table.items():
-            rule_management: dict[int, dict[str, Any]] = profile_id_config["rule_management"]
-
-            # check all access ids' entries in the config
-            for access_id, access_id_config in rule_management.items():
-                # check if rule works for this port
-                if self._port in rule_management[access_id]["ports"]:
-                    # for new profile id, add new structure with type and mask
-                    if profile_id not in result:
-                        result[profile_id] = {
-                            "type": profile_id_config["type"],
-                            "mask_management": profile_id_config["mask_management"],
-                            "rule_management": {}
-                        }
-                    # add access id rule
-                    result[profile_id]["rule_management"][access_id] = access_id_config
-        
-        return result
+        # the general table is read once per switch and indexed by port
+        return await SwitchTableCache.for_switch(self._ipaddress, self._agent_port).get_acl_for_port(self._port, self.get_acl_all)
     
     # get acl ethernet mask&rule config
     async def get_acl_ethernet(self) -> ResponseData:
-        mask = await self._get_acl_ethernet_mask()
-        rule = await self._get_acl_ethernet_rule()
+        task_mask = asyncio.create_task(self._get_acl_ethernet_mask())
+        task_rule = asyncio.create_task(self._get_acl_ethernet_rule())
+        mask, rule = await asyncio.gather(task_mask, task_rule)
         
         return await self._merge_acl_mask_and_rule(mask, rule)
     
     # get acl packet content mask&rule config
     async def get_acl_packet_content(self) -> ResponseData:
-        mask = await self._get_acl_packet_content_mask()
-        rule = await self._get_acl_packet_content_rule()
+        task_mask = asyncio.create_task(self._get_acl_packet_content_mask())
+        task_rule = asyncio.create_task(self._get_acl_packet_content_rule())
+        mask, rule = await asyncio.gather(task_mask, task_rule)
         
         return await self._merge_acl_mask_and_rule(mask, rule)
 
@@ -380,9 +369,15 @@ class L2SwitchClient(SNMPClient):
         params_to_check = [f"{base_prefix}{param}" for param in params_to_check]
         pre_results = defaultdict(dict)
         
+        # all parameters' columns are walked at the same time
+        walks = await asyncio.gather(*[
+            self._bulk_walk(self._switch_oids_config[SwitchConfigSection.ACL][param])
+            for param in params_to_check
+        ])
+
         # get the parameters as they are, form defaultdict as {profile_id: {param: value}}
-        for param in params_to_check:
-            for oid, value in await self._bulk_walk(self._switch_oids_config[SwitchConfigSection.ACL][param]):
+        for param, walk in zip(params_to_check, walks):
+            for oid, value in walk:
                 # oid's end is the profile id index
                 profile_id = L2SwitchClient._parse_last_index(oid)[1]
                 pre_results[profile_id][param] = value
@@ -490,9 +485,15 @@ class L2SwitchClient(SNMPClient):
         # form defaultdict as {profile_id: {access_id: {param: value}}}
         pre_results = defaultdict(lambda: defaultdict(dict))
         
+        # all parameters' columns are walked at the same time
+        walks = await asyncio.gather(*[
+            self._bulk_walk(self._switch_oids_config[SwitchConfigSection.ACL][param])
+            for param in params_to_check
+        ])
+
         # get the parameters as they are
-        for param in params_to_check:
-            for oid, value in await self._bulk_walk(self._switch_oids_config[SwitchConfigSection.ACL][param]):
+        for param, walk in zip(params_to_check, walks):
+            for oid, value in walk:
                 # oid is {base}.{profile_id}.{access_id}, cut ids
                 cut_oid, access_id = L2SwitchClient._parse_last_index(oid)
                 profile_id = L2SwitchClient._parse_last_index(cut_oid)[1]
@@ -718,6 +719,9 @@ class L2SwitchClient(SNMPClient):
             if err.status == "notWritable":
                 return SNMPResponseCode.INVALID_DATA
             return SNMPResponseCode.UNKNOWN_ERROR
+        finally:
+            # acl table on switch could be changed, cached port index is outdated
+            SwitchTableCache.for_switch(self._ipaddress, self._agent_port).invalidate_acl()
         return SNMPResponseCode.SUCCESS
     
     # helper method to check if acl mask or rule exists
@@ -776,6 +780,9 @@ class L2SwitchClient(SNMPClient):
             if err.status == "notWritable":
                 return SNMPResponseCode.INVALID_DATA
             return SNMPResponseCode.UNKNOWN_ERROR
+        finally:
+            # acl table on switch could be changed, cached port index is outdated
+            SwitchTableCache.for_switch(self._ipaddress, self._agent_port).invalidate_acl()
         return SNMPResponseCode.SUCCESS
 
     # build payload parameters for ethernet mask setting
@@ -901,6 +908,9 @@ class L2SwitchClient(SNMPClient):
             if err.status == "inconsistentValue":
                 return SNMPResponseCode.INVALID_DATA
             return SNMPResponseCode.UNKNOWN_ERROR
+        finally:
+            # acl table on switch could be changed, cached port index is outdated
+            SwitchTableCache.for_switch(self._ipaddress, self._agent_port).invalidate_acl()
         return SNMPResponseCode.SUCCESS
 
     # build payload parameters for ethernet rule setting
@@ -971,9 +981,15 @@ class L2SwitchClient(SNMPClient):
     # get the whole vlan table in tagged/untagged ports
     async def get_vlan_static_table(self) -> dict[int, dict[str, Any]]:
         results = defaultdict(dict)
+
+        # all three columns are walked at the same time
+        names, egress_ports, untagged_ports = await asyncio.gather(*[
+            self._bulk_walk(self._switch_oids_config[SwitchConfigSection.VLAN][param])
+            for param in ("name", "egress_ports", "untagged_ports")
+        ])
         
         # vlan names
-        for oid, vlan_name in await self._bulk_walk(self._switch_oids_config[SwitchConfigSection.VLAN]["name"]):
+        for oid, vlan_name in names:
             # vlan id is the last oid index
             vlan_id = L2SwitchClient._parse_last_index(oid)[1]
             
@@ -981,7 +997,7 @@ class L2SwitchClient(SNMPClient):
             results[vlan_id] = {"vlan_name": vlan_name, "tagged_ports": set(), "untagged_ports": set()}
         
         # get egress ports, including all tagged and untagged ports
-        for oid, octet_string in await self._bulk_walk(self._switch_oids_config[SwitchConfigSection.VLAN]["egress_ports"]):
+        for oid, octet_string in egress_ports:
             vlan_id = L2SwitchClient._parse_last_index(oid)[1]
             
             # if vlan is known, write ports converted from hex
@@ -989,7 +1005,7 @@ class L2SwitchClient(SNMPClient):
                 results[vlan_id]["tagged_ports"] = L2SwitchClient._parse_assigned_ports_from_hex(octet_string, self._ports_count)
         
         # get untagged ports
-        for oid, octet_string in await self._bulk_walk(self._switch_oids_config[SwitchConfigSection.VLAN]["untagged_ports"]):
+        for oid, octet_string in untagged_ports:
             vlan_id = L2SwitchClient._parse_last_index(oid)[1]
             # convert ports from hex
             portlist = L2SwitchClient._parse_assigned_ports_from_hex(octet_string, self._ports_count)
@@ -1005,20 +1021,13 @@ class L2SwitchClient(SNMPClient):
     
     # get vlan configuration for port
     async def get_vlan_on_port(self) -> ResponseData:
-        result = defaultdict(dict)
-
-        # for each vlan in the general table
-        for vlan_id, vlan_data in (await self.get_vlan_static_table()).items():
-            vlan_name =  vlan_data["vlan_name"]
-            # remember if tagged
-            if self._port in vlan_data["tagged_ports"]:
-                result["tagged"][vlan_id] = vlan_name
-            # remember if untagged
-            elif self._port in vlan_data["untagged_ports"]:
-                result["untagged"][vlan_id] = vlan_name
-
+        # the general table is read once per switch and indexed by port
         # {tagged: {vlan_id: vlan_name}, untagged: {vlan_id: vlan_name}}
-        return result
+        return await SwitchTableCache.for_switch(self._ipaddress, self._agent_port).get_vlan_on_port(self._port, self.get_vlan_static_table)
+    
+    # get vlan names by vlan id, the general table is read once per switch
+    async def get_vlan_names(self) -> dict[int, str]:
+        return await SwitchTableCache.for_switch(self._ipaddress, self._agent_port).get_vlan_names(self.get_vlan_static_table)
     
     # create new vlan
     async def create_vlan(self, request: RequestData) -> SNMPResponseCode:
@@ -1046,6 +1055,9 @@ class L2SwitchClient(SNMPClient):
             if err.status == "commitFailed":
                 return SNMPResponseCode.INVALID_DATA
             return SNMPResponseCode.UNKNOWN_ERROR
+        finally:
+            # vlan table on switch could be changed, cached index is outdated
+            SwitchTableCache.for_switch(self._ipaddress, self._agent_port).invalidate_vlan()
         return SNMPResponseCode.SUCCESS
     
     # delete vlan entry by vlan id
@@ -1071,6 +1083,9 @@ class L2SwitchClient(SNMPClient):
             if err.status == "inconsistentValue":
                 return SNMPResponseCode.INVALID_DATA
             return SNMPResponseCode.UNKNOWN_ERROR
+        finally:
+            # vlan table on switch could be changed, cached index is outdated
+            SwitchTableCache.for_switch(self._ipaddress, self._agent_port).invalidate_vlan()
         return SNMPResponseCode.SUCCESS
     
     # configure vlan as tagged/untagged for ports
@@ -1106,6 +1121,9 @@ class L2SwitchClient(SNMPClient):
             if err.status == "commitFailed":
                 return SNMPResponseCode.INVALID_DATA
             return SNMPResponseCode.UNKNOWN_ERROR
+        finally:
+            # vlan table on switch could be changed, cached index is outdated
+            SwitchTableCache.for_switch(self._ipaddress, self._agent_port).invalidate_vlan()
         return SNMPResponseCode.SUCCESS
     
     # delete vlan status from ports
@@ -1135,6 +1153,9 @@ class L2SwitchClient(SNMPClient):
             if err.status == "inconsistentValue":
                 return SNMPResponseCode.INVALID_DATA
             return SNMPResponseCode.UNKNOWN_ERROR
+        finally:
+            # vlan table on switch could be changed, cached index is outdated
+            SwitchTableCache.for_switch(self._ipaddress, self._agent_port).invalidate_vlan()
         return SNMPResponseCode.SUCCESS
 
     # change vlan name referring to vlan id
@@ -1229,6 +1250,13 @@ class L2SwitchClient(SNMPClient):
         # {vlan_id: {mac: {port, status}}}
         return results
     
+    # stream fdb entries as (vlan_id, mac, port) while the port column is being walked
+    async def iter_fdb_ports(self) -> AsyncIterator[tuple[int, str, int]]:
+        async for oid, port in self._bulk_walk_stream(self._switch_oids_config[SwitchConfigSection.FDB]["port"]):
+            # cut vlan id and mac from oid
+            _, vlan_id, mac = L2SwitchClient._parse_vlan_id_mac_from_oid_suffix(oid)
+            yield vlan_id, mac, port
+    
     # get fdb data for port
     async def get_fdb_on_port(self) -> ResponseData:
         result = defaultdict(dict)
@@ -1528,6 +1556,21 @@ class L2SwitchClient(SNMPClient):
         # return modified dict
         return result
 
+    # port status, crc errors, port security and traffic counters in one request, for port diagnostics
+    async def get_port_summary(self) -> ResponseData:
+        include_params = ["admin_state", "speed_duplex_settings", "link_status", "speed_duplex_status",
+                          "fcs_errors", "port_security_admin_state", "rx_bytes", "tx_bytes"]
+        result = await self._get_port_data(include_params)
+
+        # link is merged the same way as in port status
+        result["link_speed_duplex_status"] = "link_down" if result["link_status"] != "link_pass" else result["speed_duplex_status"]
+        del result["link_status"]
+        del result["speed_duplex_status"]
+
+        # combo port type is known after port data request
+        result["fiber_port"] = bool(self._is_fiber_port or self._is_combo_fiber_port)
+        return result
+
     # get advanced port management settings
     async def get_port_management(self) -> ResponseData:
         # check state, link/mac/flow control settings
@@ -1676,14 +1719,15 @@ class L2SwitchClient(SNMPClient):
         return await self.set_port_security_on_port({"lock_address_mode": current_mode})
     
     async def clear_port_security_exact_mac_addresses(self, request: RequestData) -> SNMPResponseCode:
-        vlan_table = await self.get_vlan_static_table()
+        # vlan names are taken from switch vlan index instead of walking the whole table
+        vlan_names = await SwitchTableCache.for_switch(self._ipaddress, self._agent_port).get_vlan_names(self.get_vlan_static_table)
 
         clear_port_security_config = SNMPClient._compose_request_payload(self._switch_oids_config[SwitchConfigSection.PORT],
                                                     ["clear_port_security_vlan_name", "clear_port_security_port",
                                                      "clear_port_security_mac_address", "clear_port_security_action"])
         all_payload_data = {
-            f"clear_port_security.{vlan_table[mac_data["vlan_id"]]["vlan_name"]}.{mac_data["mac_address"]}": {
-                "clear_port_security_vlan_name": {**clear_port_security_config["clear_port_security_vlan_name"], "set_value": vlan_table[mac_data["vlan_id"]]["vlan_name"]},
+            f"clear_port_security.{vlan_names[mac_data["vlan_id"]]}.{mac_data["mac_address"]}": {
+                "clear_port_security_vlan_name": {**clear_port_security_config["clear_port_security_vlan_name"], "set_value": vlan_names[mac_data["vlan_id"]]},
                 "clear_port_security_port": {**clear_port_security_config["clear_port_security_port"], "set_value": mac_data["port"]},
                 "clear_port_security_mac_address": {**clear_port_security_config["clear_port_security_mac_address"], "set_value": mac_data["mac_address"]},
                 "clear_port_security_action": {**clear_port_security_config["clear_port_security_action"], "set_value": "start"}
@@ -1862,8 +1906,8 @@ class L2SwitchClient(SNMPClient):
     ### HELPER FUNCTIONS ###
 
     @override
-    def _render_get_set_oid(self, oid: str, **params) -> str:
-        return oid.format(port=self._port, **params)
+    def _render_get_set_oid(self, oid: str, **params) -> tuple[int, ...]:
+        return SNMPClient._oid_factories[oid](port=self._port, **params)
 
     # parsing last index is necessary for gathering data by inner indices while bulk walking
     @staticmethod
@@ -4,12 +4,13 @@ from typing import Any, Self
 from collections import defaultdict
 from datetime import datetime
 from pydantic import ValidationError
-from pysnmp.hlapi.v3arch.asyncio import *
 from L2_switch_client import L2SwitchClient, RequestData, ResponseData
 from const import SNMP
+from snmp_tracing import trace_methods
 from snmp_exceptions import *
 from schemas import *
 
+@trace_methods
 class L2SwitchHandler:
     _port: int
     _client: L2SwitchClient
@@ -18,9 +19,9 @@ class L2SwitchHandler:
         self._port = port
     
     @classmethod
-    async def create(cls, ipaddress: str, port: int) -> Self:
+    async def create(cls, ipaddress: str, port: int, agent_port: int = SNMP.AGENT_PORT) -> Self:
         self = cls(port)
-        self._client = await L2SwitchClient.create(ipaddress, port)
+        self._client = await L2SwitchClient.create(ipaddress, port, agent_port)
         return self
 
     ### MIB MODULES ###
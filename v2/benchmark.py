@@ -0,0 +1,418 @@
+#!/usr/bin/python3
+import asyncio
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import re
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime
+from statistics import quantiles
+from time import perf_counter
+from typing import Any, Callable
+
+# stand-in agents accept any community, but const needs env values to be set
+os.environ.setdefault("SNMP_READ_ONLY", "public")
+os.environ.setdefault("SNMP_READ_WRITE", "private")
+os.environ.setdefault("COUNTRY_NSERV_NNET", "0")
+
+from snmp_agent import SNMPFixture, start_agents, read_methods
+from snmp_client import SNMPClient
+from switch_table_cache import SwitchTableCache
+from snmp_metrics import METRICS
+from L2_switch_client import L2SwitchClient
+from L2_switch_handler import L2SwitchHandler
+from pysnmp.proto.api import v2c
+
+# model with full oid config
+MODEL = "DES-3028"
+PRIVATE_OID = "1.3.6.1.4.1.171.10.63.6"
+# port used for port methods
+PORT = 2
+AGENT_PORT = 20161
+
+# entry modules for import time report: (directory, module), v1 diag is measured up to its first database query
+IMPORT_TARGETS = [("v2", "const"), ("v2", "snmp_client"), ("v2", "L2_switch_handler"), ("v2", "fleet_runner"), ("v1", "diag")]
+
+# table sizes of synthetic switches
+SIZES = {
+    "small": {"vlans": 8, "fdb": 64, "acl_profiles": 4, "acl_rules": 4, "arp": 16},
+    "medium": {"vlans": 256, "fdb": 2048, "acl_profiles": 16, "acl_rules": 16, "arp": 256},
+    "huge": {"vlans": 4094, "fdb": 16384, "acl_profiles": 50, "acl_rules": 32, "arp": 2048},
+}
+
+### SYNTHETIC FIXTURES ###
+
+# build fixture with every oid from model's config filled in for the table sizes
+def build_synthetic_fixture(size: dict[str, int]) -> SNMPFixture:
+    config = SNMPClient._load_config()
+    model_config = config["models"][MODEL]
+    ports_count = model_config["ports_count"]
+    fixture = SNMPFixture()
+
+    fixture.set(oid_tuple(config["system"]["description"]["oid"]), v2c.OctetString(f"{MODEL} Fast Ethernet Switch".encode()))
+    fixture.set(oid_tuple(config["system"]["private_oid"]["oid"]), v2c.ObjectIdentifier(PRIVATE_OID))
+
+    vlans = range(1, size["vlans"] + 1)
+    # ethernet and packet content profiles mustn't share profile ids
+    profiles = {
+        "ethernet": range(1, size["acl_profiles"] // 2 + 1),
+        "packet_content": range(size["acl_profiles"] // 2 + 1, size["acl_profiles"] + 1)
+    }
+    fdb = [(vlans[i % len(vlans)], mac_suffix(i)) for i in range(size["fdb"])]
+    arp = [(1, f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}") for i in range(1, size["arp"] + 1)]
+
+    for section, section_config in model_config["oids"].items():
+        for param, data in section_config.items():
+            if not isinstance(data, dict):
+                continue
+            template = data["oid"]
+            fields = tuple(re.findall(r"{(\w+)}", template))
+
+            match fields:
+                case ():
+                    indices = [{}]
+                case ("port",):
+                    indices = [{"port": port} for port in range(1, ports_count + 1)]
+                case ("vlan_id",):
+                    indices = [{"vlan_id": vlan_id} for vlan_id in vlans]
+                case ("vlan_id", "mac_address"):
+                    indices = [{"vlan_id": vlan_id, "mac_address": mac} for vlan_id, mac in fdb]
+                case ("index", "vlan_id", "mac_address"):
+                    indices = [{"index": 1, "vlan_id": vlan_id, "mac_address": mac} for vlan_id, mac in fdb[:4]]
+                case ("profile_id",):
+                    indices = [{"profile_id": profile_id} for profile_id in profiles[acl_type(param)]]
+                case ("profile_id", "access_id"):
+                    indices = [{"profile_id": profile_id, "access_id": access_id}
+                               for profile_id in profiles[acl_type(param)] for access_id in range(1, size["acl_rules"] + 1)]
+                case ("if_index", "ip_address"):
+                    indices = [{"if_index": if_index, "ip_address": ip} for if_index, ip in arp]
+                case ("ipif_name", "dhcp_server"):
+                    indices = [{"ipif_name": L2SwitchClient._convert_name_into_oid("System"), "dhcp_server": server}
+                               for server in ("10.0.0.1", "10.0.0.2")]
+                case _:
+                    indices = [{field: i for field in fields} for i in range(1, 5)]
+
+            for i, index in enumerate(indices):
+                fixture.set(oid_tuple(template.format(**index)), synthetic_value(section, param, data, i, ports_count))
+
+    return fixture
+
+def synthetic_value(section: str, param: str, data: dict[str, Any], i: int, ports_count: int) -> Any:
+    match data["value_type"]:
+        case "integer":
+            if section == "fdb" and param == "port":
+                return v2c.Integer(i % (ports_count - 4) + 1)
+            if "values" in data:
+                return v2c.Integer(next(iter(data["values"])))
+            return v2c.Integer(i + 1)
+        case "octetstring" if "bytes_pattern" in data:
+            # the only pattern is date and time, 2 bytes for year and 1 byte for the rest
+            fields = [2024 if count == "2" else 1 for count in data["bytes_pattern"]]
+            return v2c.OctetString(SNMPClient._build_octet_by_pattern(fields, data["bytes_pattern"]))
+        case "octetstring" if param.endswith("ports"):
+            return v2c.OctetString(port_bitmap({i % ports_count + 1}))
+        case "octetstring":
+            return v2c.OctetString(f"{param}{i}".encode())
+        case "hexstring" if param.endswith("ports"):
+            return v2c.OctetString(port_bitmap({i % ports_count + 1, ports_count}))
+        case "hexstring":
+            return v2c.OctetString(bytes(16 if section == "acl" and "mask_offset" in param else 4))
+        case "macaddress":
+            return v2c.OctetString(bytes([0, 0x11, 0x22, i >> 16 & 255, i >> 8 & 255, i & 255]))
+        case "ipaddress":
+            return v2c.IpAddress(f"10.0.{i >> 8 & 255}.{i & 255}")
+        case _:
+            return v2c.ObjectIdentifier(PRIVATE_OID)
+
+def acl_type(param: str) -> str:
+    return "ethernet" if param.startswith("ethernet") else "packet_content"
+
+# 8 bytes of port bitmap as switch returns it
+def port_bitmap(ports: set[int]) -> bytes:
+    return sum(1 << (63 - (port - 1)) for port in ports).to_bytes(8, "big")
+
+def mac_suffix(i: int) -> str:
+    return ".".join(str(octet) for octet in (0, 0x11, 0x33, i >> 16 & 255, i >> 8 & 255, i & 255))
+
+def oid_tuple(oid: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in oid.split("."))
+
+### AGENTS PROCESS ###
+
+# agents work in separate process so they don't share event loop and memory with measured client
+def agents_process(connection, hosts: dict[str, str], fleet_size: int) -> None:
+    async def run() -> None:
+        loop = asyncio.get_running_loop()
+        agents = {}
+
+        for size_name, host in hosts.items():
+            agents[size_name] = (await start_agents([build_synthetic_fixture(SIZES[size_name])], 1, AGENT_PORT, host))[0]
+        if fleet_size:
+            fleet_fixture = build_synthetic_fixture(SIZES["small"])
+            for i in range(fleet_size):
+                agents[f"fleet{i}"] = (await start_agents([fleet_fixture], 1, AGENT_PORT, fleet_host(i)))[0]
+
+        stop = asyncio.Event()
+
+        # commands from benchmark process: stats or stop
+        def handle_command() -> None:
+            if connection.recv() == "stop":
+                stop.set()
+                return
+            connection.send({name: agent.stats.as_dict() for name, agent in agents.items()})
+
+        loop.add_reader(connection.fileno(), handle_command)
+        connection.send("ready")
+        await stop.wait()
+
+    asyncio.run(run())
+
+# every fleet agent has its own loopback address
+def fleet_host(i: int) -> str:
+    return f"127.1.{i // 250}.{i % 250 + 1}"
+
+### MEASUREMENT ###
+
+class Benchmark:
+    _connection: Any
+    _iterations: int
+    _timeout: float
+    results: list[dict[str, Any]]
+
+    def __init__(self, connection, iterations: int, timeout: float) -> None:
+        self._connection = connection
+        self._iterations = iterations
+        self._timeout = timeout
+        self.results = []
+
+    def _agent_stats(self, agent: str) -> dict[str, int]:
+        self._connection.send("stats")
+        stats = self._connection.recv()
+        if agent == "fleet":
+            return {key: sum(value[key] for name, value in stats.items() if name.startswith("fleet"))
+                    for key in ("requests", "bytes_received", "bytes_sent")}
+        return stats[agent]
+
+    # measure one method: cold call, warm percentiles, pdus, bytes and peak memory
+    async def measure(self, target: str, size_name: str, agent: str, name: str,
+                      method: Callable[[], Any], reset: Callable[[], None]) -> None:
+        result = {"target": target, "size": size_name, "method": name}
+        # hung call mustn't stop the whole suite
+        call = lambda: asyncio.wait_for(method(), self._timeout)
+
+        try:
+            reset()
+            start = perf_counter()
+            await call()
+            result["cold_ms"] = (perf_counter() - start) * 1000
+
+            before = self._agent_stats(agent)
+            timings = []
+            for _ in range(self._iterations):
+                # every timed call reads switch tables, not only the cold one
+                reset()
+                start = perf_counter()
+                await call()
+                timings.append((perf_counter() - start) * 1000)
+            after = self._agent_stats(agent)
+
+            percentiles = quantiles(timings, n=100, method="inclusive") if len(timings) > 1 else timings * 99
+            result |= {
+                "iterations": self._iterations,
+                "p50_ms": percentiles[49],
+                "p90_ms": percentiles[89],
+                "p99_ms": percentiles[98],
+                "max_ms": max(timings),
+                "pdus_per_call": (after["requests"] - before["requests"]) / self._iterations,
+                "bytes_per_call": (after["bytes_received"] + after["bytes_sent"]
+                                   - before["bytes_received"] - before["bytes_sent"]) / self._iterations,
+            }
+
+            # memory is measured separately, tracing makes calls much slower
+            reset()
+            tracemalloc.start()
+            await call()
+            result["peak_memory_kb"] = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+        except Exception as err:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            result["error"] = f"{type(err).__name__}: {err}"
+
+        self.results.append(result)
+        print(format_result(result), flush=True)
+
+def format_result(result: dict[str, Any]) -> str:
+    prefix = f"{result['target']:8} {result['size']:7} {result['method']:45}"
+    if "error" in result:
+        return f"{prefix} ERROR {result['error']}"
+    return (f"{prefix} cold {result['cold_ms']:9.2f}  p50 {result['p50_ms']:9.2f}  p99 {result['p99_ms']:9.2f} ms"
+            f"  pdus {result['pdus_per_call']:7.1f}  bytes {result['bytes_per_call']:10.0f}  mem {result['peak_memory_kb']:9.1f} KiB")
+
+async def run_benchmarks(args: argparse.Namespace, connection, hosts: dict[str, str]) -> list[dict[str, Any]]:
+    benchmark = Benchmark(connection, args.iterations, args.timeout)
+
+    for size_name, host in hosts.items():
+        client = await L2SwitchClient.create(host, PORT, AGENT_PORT)
+        handler = await L2SwitchHandler.create(host, PORT, AGENT_PORT)
+        # every call starts without switch tables cached
+        reset = lambda host=host: SwitchTableCache.drop(host, AGENT_PORT)
+
+        for target, obj in (("client", client), ("handler", handler)):
+            for name in read_methods(obj, args.methods):
+                await benchmark.measure(target, size_name, size_name, name, getattr(obj, name), reset)
+
+    # fleet scheduler: one fdb sweep of all agents
+    if args.fleet:
+        from mac_locator import MacLocator
+
+        locator = MacLocator([fleet_host(i) for i in range(args.fleet)])
+        for client_host in locator._switches:
+            locator._clients[client_host] = await L2SwitchClient.create(client_host, agent_port=AGENT_PORT)
+        await benchmark.measure("fleet", f"x{args.fleet}", "fleet", "MacLocator.sweep", locator.sweep, lambda: None)
+
+        # the same fdb round sharded across worker processes, for scaling with cores
+        if args.fleet_workers:
+            from fleet_runner import FleetRunner, read_fdb
+
+            switches = [fleet_host(i) for i in range(args.fleet)]
+            for workers in map(int, args.fleet_workers.split(",")):
+                with FleetRunner(read_fdb, workers, agent_port=AGENT_PORT) as runner:
+                    await benchmark.measure("fleet", f"x{args.fleet}", "fleet", f"FleetRunner.run[{workers}]",
+                                            lambda: asyncio.to_thread(runner.collect, switches), lambda: None)
+                if "error" not in (result := benchmark.results[-1]):
+                    result["switches_per_s"] = args.fleet / result["p50_ms"] * 1000
+                    print(f"{'':62}{result['switches_per_s']:.1f} switches/s with {workers} workers, {os.cpu_count()} cpus")
+
+    return benchmark.results
+
+### IMPORT TIME ###
+
+# cumulative import time of every entry module by -X importtime in fresh interpreters, with the slowest own imports
+def import_times(runs: int = 5) -> list[dict[str, Any]]:
+    results = []
+
+    for directory, module in IMPORT_TARGETS:
+        result = {"directory": directory, "module": module}
+        totals = []
+
+        for _ in range(runs):
+            completed = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                env={**os.environ, "PYTHONPATH": directory}, capture_output=True, text=True
+            )
+            if completed.returncode:
+                result["error"] = completed.stderr.strip().splitlines()[-1]
+                break
+
+            # import time: self [us] | cumulative | imported package
+            modules = {}
+            for line in completed.stderr.splitlines():
+                if line.startswith("import time:") and "|" in line and "self [us]" not in line:
+                    self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+                    modules[name.strip()] = (int(self_us), int(cumulative_us))
+            totals.append(modules[module][1] / 1000)
+
+        if "error" not in result:
+            result["p50_ms"] = sorted(totals)[len(totals) // 2]
+            result["slowest"] = sorted(((name, self_us / 1000) for name, (self_us, _) in modules.items()),
+                                       key=lambda item: item[1], reverse=True)[:5]
+        results.append(result)
+        print(format_import_time(result), flush=True)
+
+    return results
+
+def format_import_time(result: dict[str, Any]) -> str:
+    prefix = f"import   {result['directory']:7} {result['module']:45}"
+    if "error" in result:
+        return f"{prefix} ERROR {result['error']}"
+    slowest = ", ".join(f"{name} {ms:.1f}" for name, ms in result["slowest"])
+    return f"{prefix} p50 {result['p50_ms']:9.2f} ms  slowest: {slowest}"
+
+def git_commit() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+# print p50 and pdus changes of current results against saved ones
+def compare(base_path: str, results: list[dict[str, Any]]) -> None:
+    with open(base_path, "r") as F:
+        base = {(r["target"], r["size"], r["method"]): r for r in json.load(F)["results"] if "error" not in r}
+
+    print(f"\nCompared to {base_path}:")
+    for result in results:
+        old = base.get((result["target"], result["size"], result["method"]))
+        if old is None or "error" in result:
+            continue
+        ratio = result["p50_ms"] / old["p50_ms"] if old["p50_ms"] else float("inf")
+        mark = "  REGRESSION" if ratio > 1.2 else ""
+        print(f"{result['target']:8} {result['size']:7} {result['method']:45} p50 x{ratio:5.2f}  "
+              f"pdus {old['pdus_per_call']:.1f} -> {result['pdus_per_call']:.1f}{mark}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="End-to-end benchmarks of L2SwitchClient/L2SwitchHandler against local agents")
+    parser.add_argument("--sizes", default="small,medium,huge", help="comma separated: " + ",".join(SIZES))
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--methods", default=None, help="regex to select methods")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds for one call")
+    parser.add_argument("--fleet", type=int, default=0, help="number of agents for fleet sweep benchmark")
+    parser.add_argument("--fleet-workers", default=None, help="comma separated worker counts for sharded fleet benchmark, e.g. 1,2,4")
+    parser.add_argument("--output", default=None, help="json results path, by default v2/benchmark_results/<commit>.json")
+    parser.add_argument("--compare", default=None, help="json results to compare with")
+    parser.add_argument("--prometheus", default=None, help="path to save snmp metrics in prometheus text format")
+    parser.add_argument("--importtime", action="store_true", help="report import time of entry modules")
+    args = parser.parse_args()
+
+    # import time is measured before anything else loads the machine
+    import_results = import_times() if args.importtime else []
+
+    sizes = [size_name for size_name in args.sizes.split(",") if size_name]
+    # each switch has its own loopback address, so per-switch caches don't mix
+    hosts = {size_name: f"127.0.0.{10 + i}" for i, size_name in enumerate(sizes)}
+
+    context = multiprocessing.get_context("spawn")
+    connection, child_connection = context.Pipe()
+    process = context.Process(target=agents_process, args=(child_connection, hosts, args.fleet), daemon=True)
+    process.start()
+    connection.recv()
+
+    try:
+        results = asyncio.run(run_benchmarks(args, connection, hosts))
+    finally:
+        connection.send("stop")
+        process.join(5)
+
+    report = {
+        **git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": {"sizes": {size_name: SIZES[size_name] for size_name in sizes}, "iterations": args.iterations, "fleet": args.fleet},
+        "results": results,
+        "import_times": import_results,
+        # metrics are collected in the main process, where all clients work
+        "snmp_metrics": METRICS.snapshot(),
+    }
+
+    output = args.output or os.path.join("v2", "benchmark_results", f"{(report['commit'] or 'unknown')[:12]}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as F:
+        json.dump(report, F, indent=2)
+    print("Results saved:", output)
+
+    if args.prometheus:
+        with open(args.prometheus, "w") as F:
+            F.write(METRICS.to_prometheus())
+
+    if args.compare:
+        compare(args.compare, results)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,5 @@
 #!/usr/bin/python3
-from typing import Final
-from pysnmp.proto.rfc1902 import Integer, OctetString, IpAddress
+from typing import Any, Callable, Final
 from dotenv import load_dotenv, find_dotenv
 from enum import StrEnum, auto
 load_dotenv(find_dotenv())   # find .env file
@@ -8,11 +7,37 @@ import os
 import json
 
 
+# class constant computed on the first access, so modules that don't use it don't pay for it on import
+class LazyConstant:
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        self._factory = factory
+    
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+    
+    def __get__(self, instance: Any, owner: type) -> Any:
+        value = self._factory()
+        # replace descriptor with the value, so the next access is usual attribute reading
+        setattr(owner, self._name, value)
+        return value
+
+
 class Database:
     USERNUM: Final[str] = "Number"
 
+class Provider:
+    DIRECT_PUBLIC_VLAN: Final[int] = LazyConstant(lambda: int(os.getenv("DIRECT_PUBLIC_VLAN")))
+    PRIMARY_DHCP_SERVER: Final[str] = LazyConstant(lambda: os.getenv("PRIMARY_DHCP_SERVER"))
+    SECONDARY_DHCP_SERVERS: Final[set[str]] = LazyConstant(lambda: set(json.loads(os.getenv("SECONDARY_DHCP_SERVERS"))))
+
+class CitySwitch:
+    # port speed
+    NORMAL_SPEED: Final[dict[bool, str]] = {False: "100M/Full", True: "1000M/Full"}
+    # so many macs on port is considered mac flooding
+    MAC_FLOODING_COUNT: Final[int] = 64
+
 class Country:
-    NSERV_NNET: Final[int] = int(os.getenv("COUNTRY_NSERV_NNET"))
+    NSERV_NNET: Final[int] = LazyConstant(lambda: int(os.getenv("COUNTRY_NSERV_NNET")))
 
 # enum for request types
 class SNMPRequestType(StrEnum):
@@ -39,6 +64,34 @@ class SNMP:
     TEST_1210 = os.getenv("SNMP_TEST_1210")
 
     DEFAULT_IP = "10.90.90.90"
+    AGENT_PORT = 161
+
+    # adaptive request timeouts, seconds
+    INITIAL_TIMEOUT = 1
+    MIN_TIMEOUT = 0.2
+    MAX_TIMEOUT = 5
+    # retries of one request, every retry is also spent from device budget refilled by responses
+    MAX_RETRIES = 2
+    RETRY_BUDGET = 10
+    RETRY_BUDGET_RATIO = 0.2
+    # device failed so many requests in a row is considered down for hold time
+    DOWN_AFTER_FAILURES = 3
+    DOWN_HOLD = 30
+    # requests sent to one device at the same time, others wait for free slot
+    MAX_PDUS_IN_FLIGHT = 4
+
+    # local daemon keeping warm clients, see snmp_daemon.py
+    DAEMON_SOCKET = os.getenv("SNMP_DAEMON_SOCKET", "/tmp/network_scripts_snmp.sock")
+    DAEMON_MAX_CLIENTS = 256
+    DAEMON_REQUESTS_PER_DEVICE = 2
+
+    # switch-wide tables shared by port clients are read again after this, seconds
+    TABLE_CACHE_TTL = 60
+
+    # file with fingerprints of identified devices, empty value keeps them in memory only
+    FINGERPRINT_CACHE = os.getenv("SNMP_FINGERPRINT_CACHE", os.path.expanduser("~/.cache/network_scripts/snmp_fingerprints.json"))
+    # device is considered rebooted if its boot time by sysUpTime moved more than this, seconds
+    FINGERPRINT_BOOT_TOLERANCE = 60
 
     # mapping for formatting patterns with struct module, bytes_count: format_symbol
     PATTERN_MAPPING = {"1": "B", "2": "H", "4": "I", "8": "Q"}
@@ -57,13 +110,20 @@ class SNMP:
     SOURCE_IP_OFFSET_IN_ARP = 28
 
     @staticmethod
-    def typify_mac_address(mac_address: str) -> OctetString:
+    def typify_mac_address(mac_address: str) -> Any:
+        from pysnmp.proto.rfc1902 import OctetString
         return OctetString(bytes.fromhex(mac_address.replace("-", "")))
 
-    TYPE = {
-        "integer": Integer,
-        "octetstring": OctetString,
-        "hexstring": lambda val: OctetString(hexValue=val.removeprefix("0x")),
-        "ipaddress": IpAddress,
-        "macaddress": typify_mac_address
-    }
\ No newline at end of file
+    # pysnmp types are imported only by code that composes set requests
+    @staticmethod
+    def _load_types() -> dict[str, Callable]:
+        from pysnmp.proto.rfc1902 import Integer, OctetString, IpAddress
+        return {
+            "integer": Integer,
+            "octetstring": OctetString,
+            "hexstring": lambda val: OctetString(hexValue=val.removeprefix("0x")),
+            "ipaddress": IpAddress,
+            "macaddress": SNMP.typify_mac_address
+        }
+
+    TYPE = LazyConstant(_load_types)
\ No newline at end of file
@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+import asyncio
+import math
+from typing import ClassVar, Self
+from time import monotonic
+# local modules
+from const import SNMP
+
+# per-device retransmission timeout by smoothed rtt and its variance (RFC 6298) with retry budget
+class DeviceTimeout:
+    # agents on other ports of the same host are different devices, e.g. stand-in agents
+    _instances: ClassVar[dict[tuple[str, int], Self]] = {}
+
+    _srtt: float | None
+    _rttvar: float
+    _rto: float
+    _budget: float
+    _failures: int
+    _down_until: float
+    _slots: asyncio.Semaphore | None
+    _slots_loop: asyncio.AbstractEventLoop | None
+
+    def __init__(self) -> None:
+        self._srtt = None
+        self._rttvar = 0
+        self._rto = SNMP.INITIAL_TIMEOUT
+        self._budget = SNMP.RETRY_BUDGET
+        self._failures = 0
+        self._down_until = 0
+        self._slots = None
+        self._slots_loop = None
+
+    # get the only timeout object for device ip and agent port
+    @classmethod
+    def for_device(cls, ipaddress: str, agent_port: int = SNMP.AGENT_PORT) -> Self:
+        if (device := cls._instances.get((ipaddress, agent_port))) is None:
+            device = cls._instances[(ipaddress, agent_port)] = cls()
+        return device
+
+    # forget rtt history, e.g. after reboot
+    @classmethod
+    def drop(cls, ipaddress: str, agent_port: int = SNMP.AGENT_PORT) -> None:
+        cls._instances.pop((ipaddress, agent_port), None)
+
+    # timeout of request attempt with exponential backoff, rounded up to 0.1 s, resolution of snmp engine timer
+    def timeout(self, attempt: int = 0) -> float:
+        return math.ceil(min(self._rto * 2 ** attempt, SNMP.MAX_TIMEOUT) * 10) / 10
+
+    # pdus in flight to the device are limited, so concurrent requests don't overload agent
+    # and their queueing in busy event loop isn't taken for round trip time
+    def slot(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        # semaphore works only in the event loop it was created for
+        if self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(SNMP.MAX_PDUS_IN_FLIGHT)
+            self._slots_loop = loop
+        return self._slots
+
+    @property
+    def srtt(self) -> float | None:
+        return self._srtt
+
+    # device failed several requests in a row, so requests fail at once until hold time ends
+    def is_down(self) -> bool:
+        now = monotonic()
+        if now < self._down_until:
+            return True
+
+        # one probe request is let through, the others wait for its result
+        if self._down_until:
+            self._down_until = now + SNMP.DOWN_HOLD
+        return False
+
+    def on_response(self, rtt: float, attempt: int) -> None:
+        self._failures = 0
+        self._down_until = 0
+        self._budget = min(SNMP.RETRY_BUDGET, self._budget + SNMP.RETRY_BUDGET_RATIO)
+
+        # Karn's algorithm: rtt of retransmitted request isn't sampled, backed off timeout is kept until the next sample
+        if attempt:
+            self._rto = min(self._rto * 2 ** attempt, SNMP.MAX_TIMEOUT)
+            return
+
+        if self._srtt is None:
+            self._srtt = rtt
+            self._rttvar = rtt / 2
+        else:
+            self._rttvar = 0.75 * self._rttvar + 0.25 * abs(self._srtt - rtt)
+            self._srtt = 0.875 * self._srtt + 0.125 * rtt
+
+        self._rto = min(max(self._srtt + 4 * self._rttvar, SNMP.MIN_TIMEOUT), SNMP.MAX_TIMEOUT)
+
+    # retry is spent from the device budget, which is refilled by successful responses
+    def take_retry(self, attempt: int) -> bool:
+        if attempt >= SNMP.MAX_RETRIES or self._budget < 1:
+            return False
+        self._budget -= 1
+        return True
+
+    # request failed after all its retries, the next one starts with doubled timeout
+    def on_failure(self) -> None:
+        self._rto = min(self._rto * 2, SNMP.MAX_TIMEOUT)
+        self._failures += 1
+        if self._failures >= SNMP.DOWN_AFTER_FAILURES:
+            self._down_until = monotonic() + SNMP.DOWN_HOLD
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+import json
+import os
+from typing import ClassVar, TypedDict
+from time import time
+# local modules
+from const import SNMP
+
+class Fingerprint(TypedDict):
+    model: str
+    ports_count: int
+    description: str
+    # unix time of the last boot computed from sysUpTime
+    boot_time: float
+
+# fingerprints of identified devices by ip, kept in json file between runs
+class FingerprintCache:
+    _entries: ClassVar[dict[str, Fingerprint] | None] = None
+
+    @classmethod
+    def get(cls, ipaddress: str) -> Fingerprint | None:
+        if cls._entries is None:
+            cls._entries = FingerprintCache._read()
+        return cls._entries.get(ipaddress)
+
+    @classmethod
+    def put(cls, ipaddress: str, fingerprint: Fingerprint) -> None:
+        cls._update(ipaddress, fingerprint)
+
+    # forget the device, e.g. after reboot or ip change
+    @classmethod
+    def drop(cls, ipaddress: str) -> None:
+        cls._update(ipaddress, None)
+
+    # unix time of device boot by its uptime in hundredths of second
+    @staticmethod
+    def boot_time(uptime: int) -> float:
+        return time() - uptime / 100
+
+    # fingerprint is valid while the device runs since the same boot
+    @staticmethod
+    def is_same_boot(fingerprint: Fingerprint, uptime: int | None) -> bool:
+        if uptime is None:
+            return False
+        return abs(FingerprintCache.boot_time(uptime) - fingerprint["boot_time"]) <= SNMP.FINGERPRINT_BOOT_TOLERANCE
+
+    # file is re-read before every write, so entries saved by other processes aren't lost
+    @classmethod
+    def _update(cls, ipaddress: str, fingerprint: Fingerprint | None) -> None:
+        cls._entries = FingerprintCache._read() if SNMP.FINGERPRINT_CACHE else (cls._entries or {})
+        if fingerprint is None:
+            if cls._entries.pop(ipaddress, None) is None:
+                return
+        else:
+            cls._entries[ipaddress] = fingerprint
+        FingerprintCache._write(cls._entries)
+
+    @staticmethod
+    def _read() -> dict[str, Fingerprint]:
+        if not SNMP.FINGERPRINT_CACHE:
+            return {}
+        try:
+            with open(SNMP.FINGERPRINT_CACHE, "r") as F:
+                return json.load(F)
+        # missing or broken file is the same as empty cache
+        except (OSError, ValueError):
+            return {}
+
+    # temporary file is renamed, so readers never see half-written file
+    @staticmethod
+    def _write(entries: dict[str, Fingerprint]) -> None:
+        if not SNMP.FINGERPRINT_CACHE:
+            return
+        temp_path = f"{SNMP.FINGERPRINT_CACHE}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(SNMP.FINGERPRINT_CACHE) or ".", exist_ok=True)
+            with open(temp_path, "w") as F:
+                json.dump(entries, F, indent=1, sort_keys=True)
+            os.replace(temp_path, SNMP.FINGERPRINT_CACHE)
+        # cache is only an optimization, read-only installation works without it
+        except OSError:
+            pass
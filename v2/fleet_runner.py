@@ -0,0 +1,215 @@
+#!/usr/bin/python3
+import asyncio
+import multiprocessing
+import os
+import queue
+import sys
+from typing import Any, Awaitable, Callable, Iterator, TypedDict
+from time import monotonic
+from statistics import median
+from pprint import pprint
+# local modules
+from const import SNMP
+
+# job is called in worker process for every switch, so it must be a module-level function
+type FleetJob = Callable[[Any], Awaitable[Any]]
+
+class FleetResult(TypedDict):
+    switch: str
+    worker: int
+    result: Any
+    error: str | None
+
+# seconds of waiting for a batch before worker reports it's idle
+IDLE_TIMEOUT = 0.1
+
+### WORKER PROCESS ###
+
+def _worker(worker_id: int, tasks, results, active_round, job: FleetJob, agent_port: int, concurrency: int) -> None:
+    asyncio.run(_worker_loop(worker_id, tasks, results, active_round, job, agent_port, concurrency))
+
+# one event loop and one snmp engine per process, switch clients are kept warm between rounds
+async def _worker_loop(worker_id: int, tasks, results, active_round, job: FleetJob, agent_port: int, concurrency: int) -> None:
+    # snmp modules are imported by worker only
+    from snmp_client import SNMPClient
+    from L2_switch_client import L2SwitchClient
+
+    SNMPClient.use_shared_engine()
+    clients = {}
+    pending = set()
+
+    async def poll(round_id: int, ipaddress: str) -> None:
+        try:
+            if (client := clients.get(ipaddress)) is None:
+                client = clients[ipaddress] = await L2SwitchClient.create(ipaddress, agent_port=agent_port)
+            results.put(("result", round_id, worker_id, ipaddress, await job(client)))
+        except Exception as err:
+            clients.pop(ipaddress, None)
+            results.put(("error", round_id, worker_id, ipaddress, f"{type(err).__name__}: {err}"))
+
+    while True:
+        # the next batch is taken only when there is free capacity, so slow switches don't hold other batches
+        while len(pending) >= concurrency:
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+        try:
+            task = await asyncio.to_thread(tasks.get, True, IDLE_TIMEOUT)
+        except queue.Empty:
+            pending = {poll_task for poll_task in pending if not poll_task.done()}
+            # idle is reported only while runner waits for round, so results queue doesn't grow between rounds
+            if not pending and active_round.value:
+                results.put(("idle", None, worker_id, None, monotonic()))
+            continue
+
+        # None is stop signal
+        if task is None:
+            break
+
+        round_id, batch = task
+        pending |= {asyncio.create_task(poll(round_id, ipaddress)) for ipaddress in batch}
+
+    if pending:
+        await asyncio.wait(pending)
+
+### FLEET RUNNER ###
+
+# switch inventory is sharded across worker processes by small batches from shared queue
+class FleetRunner:
+    _job: FleetJob
+    _workers_count: int
+    _batch_size: int
+    _concurrency: int
+    _agent_port: int
+    _round: int
+    _active_round: Any
+    _processes: list[multiprocessing.Process]
+
+    def __init__(
+                self,
+                job: FleetJob,
+                workers: int | None = None,   # cpu count by default
+                batch_size: int = 8,
+                concurrency: int = 64,   # switches polled at the same time by one worker
+                agent_port: int = SNMP.AGENT_PORT
+            ) -> None:
+        self._job = job
+        self._workers_count = workers or os.cpu_count() or 1
+        self._batch_size = batch_size
+        self._concurrency = concurrency
+        self._agent_port = agent_port
+        self._round = 0
+        self._processes = []
+
+        context = multiprocessing.get_context("spawn")
+        self._tasks = context.Queue()
+        self._results = context.Queue()
+        # id of round being run, 0 between rounds
+        self._active_round = context.Value("i", 0, lock=False)
+        self._context = context
+
+    def __enter__(self) -> "FleetRunner":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self) -> None:
+        for worker_id in range(self._workers_count):
+            process = self._context.Process(
+                target=_worker,
+                args=(worker_id, self._tasks, self._results, self._active_round, self._job, self._agent_port, self._concurrency),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+    def close(self) -> None:
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+        self._processes.clear()
+
+    # one round over the switches, results are yielded as soon as workers send them
+    def run(self, switches: list[str]) -> Iterator[FleetResult]:
+        # nobody would take batches from queue
+        if not self._processes:
+            raise RuntimeError("Fleet workers aren't started, call start() or use runner in with statement")
+
+        self._round += 1
+        round_id = self._round
+        started = monotonic()
+
+        pending = list(dict.fromkeys(switches))
+        for i in range(0, len(pending), self._batch_size):
+            self._tasks.put((round_id, pending[i:i + self._batch_size]))
+
+        total = len(pending)
+        pending = set(pending)
+        reissued = set()
+        # seconds from round start to every result, for finding stragglers
+        finish_times = []
+
+        self._active_round.value = round_id
+        try:
+            while pending:
+                try:
+                    kind, result_round, worker_id, ipaddress, data = self._results.get(timeout=1)
+                except queue.Empty:
+                    if not all(process.is_alive() for process in self._processes):
+                        raise RuntimeError("Fleet worker process died")
+                    continue
+
+                # idle worker takes stragglers of busy workers, the first result of a switch wins
+                if kind == "idle":
+                    if data > started and FleetRunner._are_stragglers(finish_times, total, monotonic() - started):
+                        self._reissue(round_id, pending - reissued, reissued)
+                    continue
+
+                # duplicate results of reissued switches and results of previous rounds are dropped
+                if result_round != round_id or ipaddress not in pending:
+                    continue
+
+                pending.discard(ipaddress)
+                finish_times.append(monotonic() - started)
+                yield FleetResult(
+                    switch=ipaddress,
+                    worker=worker_id,
+                    result=data if kind == "result" else None,
+                    error=data if kind == "error" else None
+                )
+        finally:
+            self._active_round.value = 0
+
+    # all results of the round in one dict
+    def collect(self, switches: list[str]) -> dict[str, FleetResult]:
+        return {result["switch"]: result for result in self.run(switches)}
+
+    # pending switches are stragglers when most of the round is done and they take twice longer than median
+    @staticmethod
+    def _are_stragglers(finish_times: list[float], total: int, elapsed: float) -> bool:
+        return len(finish_times) * 2 >= total and elapsed > 2 * median(finish_times)
+
+    def _reissue(self, round_id: int, stragglers: set[str], reissued: set[str]) -> None:
+        batch = sorted(stragglers)[:self._batch_size]
+        if batch:
+            reissued.update(batch)
+            self._tasks.put((round_id, batch))
+
+### JOBS ###
+
+# fdb table of switch as (vlan_id, mac, port) entries
+async def read_fdb(client) -> list[tuple[int, str, int]]:
+    return [entry async for entry in client.iter_fdb_ports()]
+
+def main() -> None:
+    # switch ips as arguments, one round of fdb reading
+    with FleetRunner(read_fdb) as runner:
+        for result in runner.run(sys.argv[1:]):
+            pprint(result, sort_dicts=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+import asyncio
+import sys
+from typing import Any, Callable, TypedDict
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from pprint import pprint
+# local modules
+from L2_switch_client import L2SwitchClient
+from snmp_exceptions import SNMPTransportError, SNMPProtocolError
+
+class MacLocation(TypedDict):
+    switch: str
+    port: int
+    vlan_id: int
+    last_seen: datetime
+
+class MacEvent(TypedDict):
+    event: str   # moved or flapping
+    mac: str
+    old: MacLocation
+    new: MacLocation
+    time: datetime
+
+# fleet-wide mac -> (switch, port, vlan) index updated by periodic fdb sweeps
+class MacLocator:
+    _switches: list[str]
+    _interval: float
+    _max_age: timedelta
+    _uplink_mac_threshold: int
+    _flap_count: int
+    _flap_window: timedelta
+    _concurrency: asyncio.Semaphore
+    _clients: dict[str, L2SwitchClient]
+    _index: dict[str, MacLocation]
+    _moves: dict[str, deque[datetime]]
+    _events: deque[MacEvent]
+    _on_event: Callable[[MacEvent], Any] | None
+
+    def __init__(
+                self,
+                switches: list[str],
+                interval: float = 300,   # seconds between sweeps
+                uplink_mac_threshold: int = 16,   # port with more macs is an uplink, its entries are skipped
+                flap_count: int = 3,   # moves during flap window to call mac flapping
+                flap_window: float = 900,
+                concurrency: int = 32,   # switches swept at the same time
+                on_event: Callable[[MacEvent], Any] | None = None
+            ) -> None:
+        self._switches = list(switches)
+        self._interval = interval
+        # mac not seen for three sweeps is considered gone
+        self._max_age = timedelta(seconds=interval * 3)
+        self._uplink_mac_threshold = uplink_mac_threshold
+        self._flap_count = flap_count
+        self._flap_window = timedelta(seconds=flap_window)
+        self._concurrency = asyncio.Semaphore(concurrency)
+        self._clients = {}
+        self._index = {}
+        self._moves = {}
+        self._events = deque(maxlen=10000)
+        self._on_event = on_event
+
+    # where is this mac, O(1) lookup in memory
+    def locate(self, mac: str) -> MacLocation | None:
+        return self._index.get(MacLocator._normalize_mac(mac))
+
+    # copy of the whole index: mac -> location
+    def get_locations(self) -> dict[str, MacLocation]:
+        return dict(self._index)
+
+    # latest move/flap events, oldest first
+    def get_events(self) -> list[MacEvent]:
+        return list(self._events)
+
+    # background job: sweep the whole fleet every interval until cancelled
+    async def run(self) -> None:
+        while True:
+            await self.sweep()
+            await asyncio.sleep(self._interval)
+
+    # one pass over the fleet, switches are swept concurrently
+    async def sweep(self) -> None:
+        sweeps = await asyncio.gather(*(self._sweep_switch(ipaddress) for ipaddress in self._switches))
+
+        # mac is seen on every cascaded switch on its way, its location is the port with the fewest macs
+        found: dict[str, tuple[int, MacLocation]] = {}
+        for candidates in sweeps:
+            for mac, macs_count, location in candidates:
+                best = found.get(mac)
+                if best is None or macs_count < best[0] or (macs_count == best[0] and self._is_located_at(mac, location)):
+                    found[mac] = (macs_count, location)
+
+        for mac, (_, location) in found.items():
+            self._update(mac, location)
+        self._expire()
+
+    # fdb entries of switch by access ports as (mac, macs on its port, location)
+    async def _sweep_switch(self, ipaddress: str) -> list[tuple[str, int, MacLocation]]:
+        async with self._concurrency:
+            try:
+                # switch-level client is created once and kept warm between sweeps
+                if (client := self._clients.get(ipaddress)) is None:
+                    client = self._clients[ipaddress] = await L2SwitchClient.create(ipaddress)
+
+                entries = [(vlan_id, mac, port) async for vlan_id, mac, port in client.iter_fdb_ports() if port]
+            # unreachable switch keeps its macs until they expire
+            except (SNMPTransportError, SNMPProtocolError, AssertionError) as err:
+                print(f"FDB sweep of {ipaddress} failed: {err}", file=sys.stderr)
+                return []
+            # any other error of one switch, e.g. unexpected model config, mustn't stop the fleet sweep
+            except Exception as err:
+                print(f"FDB sweep of {ipaddress} failed: {type(err).__name__}: {err}", file=sys.stderr)
+                # client is identified again on the next sweep
+                self._clients.pop(ipaddress, None)
+                return []
+
+        # ports with many macs are uplinks, macs are located by access ports only
+        macs_on_port = Counter(port for _, _, port in entries)
+        now = datetime.now()
+
+        return [
+            (mac, macs_on_port[port], MacLocation(switch=ipaddress, port=port, vlan_id=vlan_id, last_seen=now))
+            for vlan_id, mac, port in entries
+            if macs_on_port[port] <= self._uplink_mac_threshold
+        ]
+
+    # mac is already indexed at this switch port, equal candidates don't move it
+    def _is_located_at(self, mac: str, location: MacLocation) -> bool:
+        old = self._index.get(mac)
+        return old is not None and (old["switch"], old["port"]) == (location["switch"], location["port"])
+
+    # incremental index update with move/flap detection
+    def _update(self, mac: str, location: MacLocation) -> None:
+        old = self._index.get(mac)
+        self._index[mac] = location
+
+        # new mac or the same place
+        if old is None or (old["switch"], old["port"]) == (location["switch"], location["port"]):
+            return
+
+        # remember moves inside flap window only
+        moves = self._moves.setdefault(mac, deque())
+        moves.append(location["last_seen"])
+        while moves[0] < location["last_seen"] - self._flap_window:
+            moves.popleft()
+
+        event = "flapping" if len(moves) >= self._flap_count else "moved"
+        self._emit(MacEvent(event=event, mac=mac, old=old, new=location, time=location["last_seen"]))
+
+    def _emit(self, event: MacEvent) -> None:
+        self._events.append(event)
+        if self._on_event is not None:
+            self._on_event(event)
+
+    # forget macs that weren't seen for too long
+    def _expire(self) -> None:
+        oldest = datetime.now() - self._max_age
+        for mac in [mac for mac, location in self._index.items() if location["last_seen"] < oldest]:
+            del self._index[mac]
+            self._moves.pop(mac, None)
+
+    # fdb macs are in XX-XX-XX-XX-XX-XX form, any other notation is converted to it
+    @staticmethod
+    def _normalize_mac(mac: str) -> str:
+        digits = mac.upper().replace(":", "").replace("-", "").replace(".", "")
+        return "-".join(digits[i:i+2] for i in range(0, 12, 2))
+
+
+async def main() -> None:
+    # switch ips as arguments, one sweep and the result
+    locator = MacLocator(sys.argv[1:], on_event=pprint)
+    await locator.sweep()
+    pprint(locator.get_locations(), sort_dicts=False)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+import hashlib
+import importlib
+import os
+import re
+import sys
+import types
+import yaml
+from typing import Any, Iterator
+
+# generated module is kept next to this one
+TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "oid_tables.py")
+
+HEADER = '''#!/usr/bin/python3
+# generated from oid.yaml by oid_codegen.py, don't edit: it's re-created when oid.yaml changes
+
+YAML_SHA256 = "{digest}"
+
+# param value as oid sub-identifiers, value is int index or dotted string like ip address
+def _sub(value: int | str) -> tuple[int, ...]:
+    if isinstance(value, int):
+        return (value,)
+    return tuple(int(part) for part in str(value).split("."))
+'''
+
+def yaml_digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+# all oid templates of the config, each only once, in config order
+def collect_oids(config: Any) -> Iterator[str]:
+    if isinstance(config, dict):
+        for key, value in config.items():
+            if key == "oid" and isinstance(value, str):
+                yield value
+            else:
+                yield from collect_oids(value)
+    elif isinstance(config, list):
+        for value in config:
+            yield from collect_oids(value)
+
+# template like 1.3.6.{port}.5 -> python expression of oid tuple by params
+def _factory_source(template: str) -> str:
+    params = []
+    chunks = []
+    numbers = []
+
+    for part in template.split("."):
+        if match := re.fullmatch(r"{(\w+)}", part):
+            if numbers:
+                chunks.append(repr(tuple(numbers)))
+                numbers = []
+            params.append(match[1])
+            chunks.append(f"_sub({match[1]})")
+        else:
+            numbers.append(int(part))
+    if numbers:
+        chunks.append(repr(tuple(numbers)))
+
+    arguments = ", ".join([*params, "**params"])
+    return f"lambda {arguments}: {' + '.join(chunks)}"
+
+# walk starts from the part of template before the first param
+def _walk_root(template: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in re.sub(r"\.{.*", "", template).split("."))
+
+def render(text: str) -> str:
+    templates = list(dict.fromkeys(collect_oids(yaml.safe_load(text))))
+    lines = [HEADER.format(digest=yaml_digest(text))]
+
+    lines.append("# oid template: function building oid tuple by request params")
+    lines.append("OID_FACTORIES = {")
+    lines.extend(f'    "{template}": {_factory_source(template)},' for template in templates)
+    lines.append("}\n")
+
+    lines.append("# oid template: oid tuple the table walk starts from")
+    lines.append("WALK_ROOTS = {")
+    lines.extend(f'    "{template}": {_walk_root(template)!r},' for template in templates)
+    lines.append("}")
+
+    return "\n".join(lines) + "\n"
+
+# module with tables matching yaml text, the file is regenerated if it's missing or outdated
+def load_oid_tables(text: str) -> types.ModuleType:
+    digest = yaml_digest(text)
+
+    try:
+        import oid_tables
+        if oid_tables.YAML_SHA256 == digest:
+            return oid_tables
+    except ImportError:
+        pass
+
+    source = render(text)
+    try:
+        with open(TABLES_PATH, "w") as F:
+            F.write(source)
+    # read-only installation works with tables built in memory
+    except OSError:
+        module = types.ModuleType("oid_tables")
+        exec(compile(source, TABLES_PATH, "exec"), module.__dict__)
+        sys.modules["oid_tables"] = module
+        return module
+
+    importlib.invalidate_caches()
+    if "oid_tables" in sys.modules:
+        return importlib.reload(sys.modules["oid_tables"])
+    return importlib.import_module("oid_tables")
+
+def main() -> None:
+    # path to yaml as argument, v2/oid.yaml by default
+    with open(sys.argv[1] if len(sys.argv) > 1 else "v2/oid.yaml", "r") as F:
+        text = F.read()
+    with open(TABLES_PATH, "w") as F:
+        F.write(render(text))
+    print("Generated:", TABLES_PATH)
+
+if __name__ == "__main__":
+    main()
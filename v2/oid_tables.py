@@ -0,0 +1,328 @@
+#!/usr/bin/python3
+# generated from oid.yaml by oid_codegen.py, don't edit: it's re-created when oid.yaml changes
+
+YAML_SHA256 = "08c5047d83fd47a1acc65fd675299d3f6524fbbe52b85a0aea73c0fe2f828b3d"
+
+# param value as oid sub-identifiers, value is int index or dotted string like ip address
+def _sub(value: int | str) -> tuple[int, ...]:
+    if isinstance(value, int):
+        return (value,)
+    return tuple(int(part) for part in str(value).split("."))
+
+# oid template: function building oid tuple by request params
+OID_FACTORIES = {
+    "1.3.6.1.2.1.1.1.0": lambda **params: (1, 3, 6, 1, 2, 1, 1, 1, 0),
+    "1.3.6.1.2.1.1.2.0": lambda **params: (1, 3, 6, 1, 2, 1, 1, 2, 0),
+    "1.3.6.1.2.1.1.3.0": lambda **params: (1, 3, 6, 1, 2, 1, 1, 3, 0),
+    "1.3.6.1.2.1.1.9.1.3.{index}": lambda index, **params: (1, 3, 6, 1, 2, 1, 1, 9, 1, 3) + _sub(index),
+    "1.3.6.1.4.1.171.12.1.1.2.1.2.{index}": lambda index, **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 2, 1, 2) + _sub(index),
+    "1.3.6.1.4.1.171.12.1.1.2.1.3.{index}": lambda index, **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 2, 1, 3) + _sub(index),
+    "1.3.6.1.4.1.171.12.1.1.2.1.4.{index}": lambda index, **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 2, 1, 4) + _sub(index),
+    "1.3.6.1.4.1.171.11.63.6.2.1.2.1.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 1, 2, 1, 0),
+    "1.3.6.1.4.1.171.12.1.2.6.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 2, 6, 0),
+    "1.3.6.1.4.1.171.12.1.1.4.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 4, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.1.2.2.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 1, 2, 2, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.1.2.3.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 1, 2, 3, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.1.2.4.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 1, 2, 4, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.1.2.5.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 1, 2, 5, 0),
+    "1.3.6.1.2.1.17.1.1.0": lambda **params: (1, 3, 6, 1, 2, 1, 17, 1, 1, 0),
+    "1.3.6.1.2.1.17.1.2.0": lambda **params: (1, 3, 6, 1, 2, 1, 17, 1, 2, 0),
+    "1.3.6.1.4.1.171.12.10.2.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 10, 2, 0),
+    "1.3.6.1.4.1.171.12.1.1.6.1.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 6, 1, 0),
+    "1.3.6.1.4.1.171.12.1.1.6.2.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 6, 2, 0),
+    "1.3.6.1.4.1.171.12.1.1.6.3.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 6, 3, 0),
+    "1.3.6.1.4.1.171.12.1.1.9.1.2.1": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 9, 1, 2, 1),
+    "1.3.6.1.4.1.171.12.1.1.9.1.3.1": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 9, 1, 3, 1),
+    "1.3.6.1.4.1.171.12.1.1.9.1.4.1": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 9, 1, 4, 1),
+    "1.3.6.1.4.1.171.11.63.6.2.1.2.12.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 1, 2, 12, 0),
+    "1.3.6.1.4.1.171.12.1.2.10.1.1.2.{host_index}": lambda host_index, **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 2, 10, 1, 1, 2) + _sub(host_index),
+    "1.3.6.1.4.1.171.12.1.2.10.1.1.4.{host_index}": lambda host_index, **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 2, 10, 1, 1, 4) + _sub(host_index),
+    "1.3.6.1.4.1.171.12.1.2.10.1.1.3.{host_index}": lambda host_index, **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 2, 10, 1, 1, 3) + _sub(host_index),
+    "1.3.6.1.4.1.171.12.1.2.10.2.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 2, 10, 2, 0),
+    "1.3.6.1.4.1.171.12.9.2.1.1.2.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 2) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.2.1.1.3.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 3) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.2.1.1.4.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 4) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.2.1.1.5.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 5) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.2.1.1.6.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 6) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.2.1.1.7.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 7) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.2.1.1.8.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 8) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.2.1.1.9.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 9) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.3.1.1.3.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 3) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.1.1.4.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 4) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.1.1.5.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 5) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.1.1.6.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 6) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.1.1.7.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 7) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.1.1.8.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 8) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.1.1.9.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 9) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.1.1.13.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 13) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.1.1.14.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 14) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.1.1.17.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 17) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.1.1.15.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 15) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.1.1.16.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 16) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.2.3.1.2.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 2) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.2.3.1.3.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 3) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.2.3.1.4.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 4) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.2.3.1.5.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 5) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.2.3.1.6.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 6) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.2.3.1.7.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 7) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.2.3.1.8.{profile_id}": lambda profile_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 8) + _sub(profile_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.8.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 8) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.9.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 9) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.10.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 10) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.11.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 11) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.12.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 12) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.13.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 13) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.14.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 14) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.15.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 15) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.16.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 16) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.17.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 17) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.18.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 18) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.19.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 19) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.20.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 20) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.21.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 21) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.22.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 22) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.23.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 23) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.24.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 24) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.29.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 29) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.30.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 30) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.28.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 28) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.4.1.171.12.9.3.9.1.33.{profile_id}.{access_id}": lambda profile_id, access_id, **params: (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 33) + _sub(profile_id) + _sub(access_id),
+    "1.3.6.1.2.1.17.7.1.4.3.1.1.{vlan_id}": lambda vlan_id, **params: (1, 3, 6, 1, 2, 1, 17, 7, 1, 4, 3, 1, 1) + _sub(vlan_id),
+    "1.3.6.1.2.1.17.7.1.4.3.1.2.{vlan_id}": lambda vlan_id, **params: (1, 3, 6, 1, 2, 1, 17, 7, 1, 4, 3, 1, 2) + _sub(vlan_id),
+    "1.3.6.1.2.1.17.7.1.4.3.1.4.{vlan_id}": lambda vlan_id, **params: (1, 3, 6, 1, 2, 1, 17, 7, 1, 4, 3, 1, 4) + _sub(vlan_id),
+    "1.3.6.1.2.1.17.7.1.4.3.1.5.{vlan_id}": lambda vlan_id, **params: (1, 3, 6, 1, 2, 1, 17, 7, 1, 4, 3, 1, 5) + _sub(vlan_id),
+    "1.3.6.1.2.1.17.7.1.2.2.1.2.{vlan_id}.{mac_address}": lambda vlan_id, mac_address, **params: (1, 3, 6, 1, 2, 1, 17, 7, 1, 2, 2, 1, 2) + _sub(vlan_id) + _sub(mac_address),
+    "1.3.6.1.2.1.17.7.1.2.2.1.3.{vlan_id}.{mac_address}": lambda vlan_id, mac_address, **params: (1, 3, 6, 1, 2, 1, 17, 7, 1, 2, 2, 1, 3) + _sub(vlan_id) + _sub(mac_address),
+    "1.3.6.1.4.1.171.12.1.2.11.1.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 2, 11, 1, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.25.1.1.1.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 25, 1, 1, 1, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.25.1.1.4.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 25, 1, 1, 4, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.25.2.1.1.4.{index}.{vlan_id}.{mac_address}": lambda index, vlan_id, mac_address, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 25, 2, 1, 1, 4) + _sub(index) + _sub(vlan_id) + _sub(mac_address),
+    "1.3.6.1.4.1.171.11.63.6.2.25.2.1.1.5.{index}.{vlan_id}.{mac_address}": lambda index, vlan_id, mac_address, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 25, 2, 1, 1, 5) + _sub(index) + _sub(vlan_id) + _sub(mac_address),
+    "1.3.6.1.2.1.31.1.1.1.1.{if_index}": lambda if_index, **params: (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 1) + _sub(if_index),
+    "1.3.6.1.4.1.171.12.42.1.1.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 42, 1, 1, 0),
+    "1.3.6.1.4.1.171.12.42.1.2.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 42, 1, 2, 0),
+    "1.3.6.1.4.1.171.12.42.1.3.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 42, 1, 3, 0),
+    "1.3.6.1.4.1.171.12.42.3.2.1.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 2, 1, 0),
+    "1.3.6.1.4.1.171.12.42.3.2.2.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 2, 2, 0),
+    "1.3.6.1.4.1.171.12.42.3.2.3.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 2, 3, 0),
+    "1.3.6.1.4.1.171.12.42.3.2.4.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 2, 4, 0),
+    "1.3.6.1.4.1.171.12.42.3.2.5.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 2, 5, 0),
+    "1.3.6.1.4.1.171.12.42.3.1.1.1.{ipif_name}.{dhcp_server}": lambda ipif_name, dhcp_server, **params: (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 1, 1, 1) + _sub(ipif_name) + _sub(dhcp_server),
+    "1.3.6.1.4.1.171.12.42.3.1.1.3.{ipif_name}.{dhcp_server}": lambda ipif_name, dhcp_server, **params: (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 1, 1, 3) + _sub(ipif_name) + _sub(dhcp_server),
+    "1.3.6.1.2.1.4.22.1.2.{if_index}.{ip_address}": lambda if_index, ip_address, **params: (1, 3, 6, 1, 2, 1, 4, 22, 1, 2) + _sub(if_index) + _sub(ip_address),
+    "1.3.6.1.2.1.4.22.1.4.{if_index}.{ip_address}": lambda if_index, ip_address, **params: (1, 3, 6, 1, 2, 1, 4, 22, 1, 4) + _sub(if_index) + _sub(ip_address),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.3.{port}.100": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 3) + _sub(port) + (100,),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.3.{port}.101": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 3) + _sub(port) + (101,),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.4.{port}.100": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 4) + _sub(port) + (100,),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.4.{port}.101": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 4) + _sub(port) + (101,),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.5.{port}.100": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 5) + _sub(port) + (100,),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.5.{port}.101": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 5) + _sub(port) + (101,),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.7.{port}.100": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 7) + _sub(port) + (100,),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.7.{port}.101": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 7) + _sub(port) + (101,),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.10.{port}.100": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 10) + _sub(port) + (100,),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.10.{port}.101": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 10) + _sub(port) + (101,),
+    "1.3.6.1.4.1.171.11.63.6.2.2.1.1.4.{port}.100": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 1, 1, 4) + _sub(port) + (100,),
+    "1.3.6.1.4.1.171.11.63.6.2.2.1.1.4.{port}.101": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 1, 1, 4) + _sub(port) + (101,),
+    "1.3.6.1.4.1.171.11.63.6.2.2.1.1.5.{port}.100": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 1, 1, 5) + _sub(port) + (100,),
+    "1.3.6.1.4.1.171.11.63.6.2.2.1.1.5.{port}.101": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 1, 1, 5) + _sub(port) + (101,),
+    "1.3.6.1.4.1.171.12.58.1.1.1.12.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 12) + _sub(port),
+    "1.3.6.1.4.1.171.12.58.1.1.1.4.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 4) + _sub(port),
+    "1.3.6.1.4.1.171.12.58.1.1.1.5.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 5) + _sub(port),
+    "1.3.6.1.4.1.171.12.58.1.1.1.6.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 6) + _sub(port),
+    "1.3.6.1.4.1.171.12.58.1.1.1.7.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 7) + _sub(port),
+    "1.3.6.1.4.1.171.12.58.1.1.1.8.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 8) + _sub(port),
+    "1.3.6.1.4.1.171.12.58.1.1.1.9.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 9) + _sub(port),
+    "1.3.6.1.4.1.171.12.58.1.1.1.10.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 10) + _sub(port),
+    "1.3.6.1.4.1.171.12.58.1.1.1.11.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 11) + _sub(port),
+    "1.3.6.1.4.1.171.11.63.6.2.15.1.1.2.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 1, 1, 2) + _sub(port),
+    "1.3.6.1.4.1.171.11.63.6.2.15.1.1.3.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 1, 1, 3) + _sub(port),
+    "1.3.6.1.4.1.171.11.63.6.2.15.1.1.4.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 1, 1, 4) + _sub(port),
+    "1.3.6.1.4.1.171.11.63.6.2.15.3.1.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 3, 1, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.15.3.2.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 3, 2, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.15.3.3.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 3, 3, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.15.3.4.0": lambda **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 3, 4, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.21.2.1.1.2.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 21, 2, 1, 1, 2) + _sub(port),
+    "1.3.6.1.4.1.171.11.63.6.2.21.2.1.1.4.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 21, 2, 1, 1, 4) + _sub(port),
+    "1.3.6.1.4.1.171.12.1.1.8.1.2.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 8, 1, 2) + _sub(port),
+    "1.3.6.1.4.1.171.12.1.1.8.1.3.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 8, 1, 3) + _sub(port),
+    "1.3.6.1.4.1.171.12.1.1.8.1.4.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 8, 1, 4) + _sub(port),
+    "1.3.6.1.4.1.171.11.63.6.2.3.1.1.2.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 3, 1, 1, 2) + _sub(port),
+    "1.3.6.1.4.1.171.11.63.6.2.3.1.1.3.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 3, 1, 1, 3) + _sub(port),
+    "1.3.6.1.4.1.171.12.25.3.1.1.2.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 2) + _sub(port),
+    "1.3.6.1.4.1.171.12.25.3.1.1.3.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 3) + _sub(port),
+    "1.3.6.1.4.1.171.12.25.3.1.1.4.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 4) + _sub(port),
+    "1.3.6.1.4.1.171.12.25.3.1.1.5.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 5) + _sub(port),
+    "1.3.6.1.4.1.171.12.25.3.1.1.6.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 6) + _sub(port),
+    "1.3.6.1.4.1.171.12.25.3.1.1.7.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 7) + _sub(port),
+    "1.3.6.1.4.1.171.12.25.3.1.1.8.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 8) + _sub(port),
+    "1.3.6.1.4.1.171.11.63.6.2.12.1.1.2.{port}": lambda port, **params: (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 12, 1, 1, 2) + _sub(port),
+    "1.3.6.1.2.1.31.1.1.1.6.{port}": lambda port, **params: (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 6) + _sub(port),
+    "1.3.6.1.2.1.31.1.1.1.7.{port}": lambda port, **params: (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 7) + _sub(port),
+    "1.3.6.1.2.1.31.1.1.1.8.{port}": lambda port, **params: (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 8) + _sub(port),
+    "1.3.6.1.2.1.31.1.1.1.9.{port}": lambda port, **params: (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 9) + _sub(port),
+    "1.3.6.1.2.1.31.1.1.1.10.{port}": lambda port, **params: (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 10) + _sub(port),
+    "1.3.6.1.2.1.31.1.1.1.11.{port}": lambda port, **params: (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 11) + _sub(port),
+    "1.3.6.1.2.1.31.1.1.1.12.{port}": lambda port, **params: (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 12) + _sub(port),
+    "1.3.6.1.2.1.31.1.1.1.13.{port}": lambda port, **params: (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 13) + _sub(port),
+    "1.3.6.1.2.1.10.7.2.1.2.{port}": lambda port, **params: (1, 3, 6, 1, 2, 1, 10, 7, 2, 1, 2) + _sub(port),
+    "1.3.6.1.2.1.10.7.2.1.3.{port}": lambda port, **params: (1, 3, 6, 1, 2, 1, 10, 7, 2, 1, 3) + _sub(port),
+}
+
+# oid template: oid tuple the table walk starts from
+WALK_ROOTS = {
+    "1.3.6.1.2.1.1.1.0": (1, 3, 6, 1, 2, 1, 1, 1, 0),
+    "1.3.6.1.2.1.1.2.0": (1, 3, 6, 1, 2, 1, 1, 2, 0),
+    "1.3.6.1.2.1.1.3.0": (1, 3, 6, 1, 2, 1, 1, 3, 0),
+    "1.3.6.1.2.1.1.9.1.3.{index}": (1, 3, 6, 1, 2, 1, 1, 9, 1, 3),
+    "1.3.6.1.4.1.171.12.1.1.2.1.2.{index}": (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 2, 1, 2),
+    "1.3.6.1.4.1.171.12.1.1.2.1.3.{index}": (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 2, 1, 3),
+    "1.3.6.1.4.1.171.12.1.1.2.1.4.{index}": (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 2, 1, 4),
+    "1.3.6.1.4.1.171.11.63.6.2.1.2.1.0": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 1, 2, 1, 0),
+    "1.3.6.1.4.1.171.12.1.2.6.0": (1, 3, 6, 1, 4, 1, 171, 12, 1, 2, 6, 0),
+    "1.3.6.1.4.1.171.12.1.1.4.0": (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 4, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.1.2.2.0": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 1, 2, 2, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.1.2.3.0": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 1, 2, 3, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.1.2.4.0": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 1, 2, 4, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.1.2.5.0": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 1, 2, 5, 0),
+    "1.3.6.1.2.1.17.1.1.0": (1, 3, 6, 1, 2, 1, 17, 1, 1, 0),
+    "1.3.6.1.2.1.17.1.2.0": (1, 3, 6, 1, 2, 1, 17, 1, 2, 0),
+    "1.3.6.1.4.1.171.12.10.2.0": (1, 3, 6, 1, 4, 1, 171, 12, 10, 2, 0),
+    "1.3.6.1.4.1.171.12.1.1.6.1.0": (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 6, 1, 0),
+    "1.3.6.1.4.1.171.12.1.1.6.2.0": (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 6, 2, 0),
+    "1.3.6.1.4.1.171.12.1.1.6.3.0": (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 6, 3, 0),
+    "1.3.6.1.4.1.171.12.1.1.9.1.2.1": (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 9, 1, 2, 1),
+    "1.3.6.1.4.1.171.12.1.1.9.1.3.1": (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 9, 1, 3, 1),
+    "1.3.6.1.4.1.171.12.1.1.9.1.4.1": (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 9, 1, 4, 1),
+    "1.3.6.1.4.1.171.11.63.6.2.1.2.12.0": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 1, 2, 12, 0),
+    "1.3.6.1.4.1.171.12.1.2.10.1.1.2.{host_index}": (1, 3, 6, 1, 4, 1, 171, 12, 1, 2, 10, 1, 1, 2),
+    "1.3.6.1.4.1.171.12.1.2.10.1.1.4.{host_index}": (1, 3, 6, 1, 4, 1, 171, 12, 1, 2, 10, 1, 1, 4),
+    "1.3.6.1.4.1.171.12.1.2.10.1.1.3.{host_index}": (1, 3, 6, 1, 4, 1, 171, 12, 1, 2, 10, 1, 1, 3),
+    "1.3.6.1.4.1.171.12.1.2.10.2.0": (1, 3, 6, 1, 4, 1, 171, 12, 1, 2, 10, 2, 0),
+    "1.3.6.1.4.1.171.12.9.2.1.1.2.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 2),
+    "1.3.6.1.4.1.171.12.9.2.1.1.3.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 3),
+    "1.3.6.1.4.1.171.12.9.2.1.1.4.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 4),
+    "1.3.6.1.4.1.171.12.9.2.1.1.5.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 5),
+    "1.3.6.1.4.1.171.12.9.2.1.1.6.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 6),
+    "1.3.6.1.4.1.171.12.9.2.1.1.7.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 7),
+    "1.3.6.1.4.1.171.12.9.2.1.1.8.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 8),
+    "1.3.6.1.4.1.171.12.9.2.1.1.9.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 1, 1, 9),
+    "1.3.6.1.4.1.171.12.9.3.1.1.3.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 3),
+    "1.3.6.1.4.1.171.12.9.3.1.1.4.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 4),
+    "1.3.6.1.4.1.171.12.9.3.1.1.5.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 5),
+    "1.3.6.1.4.1.171.12.9.3.1.1.6.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 6),
+    "1.3.6.1.4.1.171.12.9.3.1.1.7.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 7),
+    "1.3.6.1.4.1.171.12.9.3.1.1.8.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 8),
+    "1.3.6.1.4.1.171.12.9.3.1.1.9.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 9),
+    "1.3.6.1.4.1.171.12.9.3.1.1.13.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 13),
+    "1.3.6.1.4.1.171.12.9.3.1.1.14.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 14),
+    "1.3.6.1.4.1.171.12.9.3.1.1.17.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 17),
+    "1.3.6.1.4.1.171.12.9.3.1.1.15.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 15),
+    "1.3.6.1.4.1.171.12.9.3.1.1.16.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 1, 1, 16),
+    "1.3.6.1.4.1.171.12.9.2.3.1.2.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 2),
+    "1.3.6.1.4.1.171.12.9.2.3.1.3.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 3),
+    "1.3.6.1.4.1.171.12.9.2.3.1.4.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 4),
+    "1.3.6.1.4.1.171.12.9.2.3.1.5.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 5),
+    "1.3.6.1.4.1.171.12.9.2.3.1.6.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 6),
+    "1.3.6.1.4.1.171.12.9.2.3.1.7.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 7),
+    "1.3.6.1.4.1.171.12.9.2.3.1.8.{profile_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 2, 3, 1, 8),
+    "1.3.6.1.4.1.171.12.9.3.9.1.8.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 8),
+    "1.3.6.1.4.1.171.12.9.3.9.1.9.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 9),
+    "1.3.6.1.4.1.171.12.9.3.9.1.10.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 10),
+    "1.3.6.1.4.1.171.12.9.3.9.1.11.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 11),
+    "1.3.6.1.4.1.171.12.9.3.9.1.12.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 12),
+    "1.3.6.1.4.1.171.12.9.3.9.1.13.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 13),
+    "1.3.6.1.4.1.171.12.9.3.9.1.14.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 14),
+    "1.3.6.1.4.1.171.12.9.3.9.1.15.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 15),
+    "1.3.6.1.4.1.171.12.9.3.9.1.16.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 16),
+    "1.3.6.1.4.1.171.12.9.3.9.1.17.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 17),
+    "1.3.6.1.4.1.171.12.9.3.9.1.18.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 18),
+    "1.3.6.1.4.1.171.12.9.3.9.1.19.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 19),
+    "1.3.6.1.4.1.171.12.9.3.9.1.20.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 20),
+    "1.3.6.1.4.1.171.12.9.3.9.1.21.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 21),
+    "1.3.6.1.4.1.171.12.9.3.9.1.22.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 22),
+    "1.3.6.1.4.1.171.12.9.3.9.1.23.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 23),
+    "1.3.6.1.4.1.171.12.9.3.9.1.24.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 24),
+    "1.3.6.1.4.1.171.12.9.3.9.1.29.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 29),
+    "1.3.6.1.4.1.171.12.9.3.9.1.30.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 30),
+    "1.3.6.1.4.1.171.12.9.3.9.1.28.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 28),
+    "1.3.6.1.4.1.171.12.9.3.9.1.33.{profile_id}.{access_id}": (1, 3, 6, 1, 4, 1, 171, 12, 9, 3, 9, 1, 33),
+    "1.3.6.1.2.1.17.7.1.4.3.1.1.{vlan_id}": (1, 3, 6, 1, 2, 1, 17, 7, 1, 4, 3, 1, 1),
+    "1.3.6.1.2.1.17.7.1.4.3.1.2.{vlan_id}": (1, 3, 6, 1, 2, 1, 17, 7, 1, 4, 3, 1, 2),
+    "1.3.6.1.2.1.17.7.1.4.3.1.4.{vlan_id}": (1, 3, 6, 1, 2, 1, 17, 7, 1, 4, 3, 1, 4),
+    "1.3.6.1.2.1.17.7.1.4.3.1.5.{vlan_id}": (1, 3, 6, 1, 2, 1, 17, 7, 1, 4, 3, 1, 5),
+    "1.3.6.1.2.1.17.7.1.2.2.1.2.{vlan_id}.{mac_address}": (1, 3, 6, 1, 2, 1, 17, 7, 1, 2, 2, 1, 2),
+    "1.3.6.1.2.1.17.7.1.2.2.1.3.{vlan_id}.{mac_address}": (1, 3, 6, 1, 2, 1, 17, 7, 1, 2, 2, 1, 3),
+    "1.3.6.1.4.1.171.12.1.2.11.1.0": (1, 3, 6, 1, 4, 1, 171, 12, 1, 2, 11, 1, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.25.1.1.1.0": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 25, 1, 1, 1, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.25.1.1.4.0": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 25, 1, 1, 4, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.25.2.1.1.4.{index}.{vlan_id}.{mac_address}": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 25, 2, 1, 1, 4),
+    "1.3.6.1.4.1.171.11.63.6.2.25.2.1.1.5.{index}.{vlan_id}.{mac_address}": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 25, 2, 1, 1, 5),
+    "1.3.6.1.2.1.31.1.1.1.1.{if_index}": (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 1),
+    "1.3.6.1.4.1.171.12.42.1.1.0": (1, 3, 6, 1, 4, 1, 171, 12, 42, 1, 1, 0),
+    "1.3.6.1.4.1.171.12.42.1.2.0": (1, 3, 6, 1, 4, 1, 171, 12, 42, 1, 2, 0),
+    "1.3.6.1.4.1.171.12.42.1.3.0": (1, 3, 6, 1, 4, 1, 171, 12, 42, 1, 3, 0),
+    "1.3.6.1.4.1.171.12.42.3.2.1.0": (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 2, 1, 0),
+    "1.3.6.1.4.1.171.12.42.3.2.2.0": (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 2, 2, 0),
+    "1.3.6.1.4.1.171.12.42.3.2.3.0": (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 2, 3, 0),
+    "1.3.6.1.4.1.171.12.42.3.2.4.0": (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 2, 4, 0),
+    "1.3.6.1.4.1.171.12.42.3.2.5.0": (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 2, 5, 0),
+    "1.3.6.1.4.1.171.12.42.3.1.1.1.{ipif_name}.{dhcp_server}": (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 1, 1, 1),
+    "1.3.6.1.4.1.171.12.42.3.1.1.3.{ipif_name}.{dhcp_server}": (1, 3, 6, 1, 4, 1, 171, 12, 42, 3, 1, 1, 3),
+    "1.3.6.1.2.1.4.22.1.2.{if_index}.{ip_address}": (1, 3, 6, 1, 2, 1, 4, 22, 1, 2),
+    "1.3.6.1.2.1.4.22.1.4.{if_index}.{ip_address}": (1, 3, 6, 1, 2, 1, 4, 22, 1, 4),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.3.{port}.100": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 3),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.3.{port}.101": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 3),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.4.{port}.100": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 4),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.4.{port}.101": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 4),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.5.{port}.100": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 5),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.5.{port}.101": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 5),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.7.{port}.100": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 7),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.7.{port}.101": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 7),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.10.{port}.100": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 10),
+    "1.3.6.1.4.1.171.11.63.6.2.2.2.1.10.{port}.101": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 2, 1, 10),
+    "1.3.6.1.4.1.171.11.63.6.2.2.1.1.4.{port}.100": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 1, 1, 4),
+    "1.3.6.1.4.1.171.11.63.6.2.2.1.1.4.{port}.101": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 1, 1, 4),
+    "1.3.6.1.4.1.171.11.63.6.2.2.1.1.5.{port}.100": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 1, 1, 5),
+    "1.3.6.1.4.1.171.11.63.6.2.2.1.1.5.{port}.101": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 2, 1, 1, 5),
+    "1.3.6.1.4.1.171.12.58.1.1.1.12.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 12),
+    "1.3.6.1.4.1.171.12.58.1.1.1.4.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 4),
+    "1.3.6.1.4.1.171.12.58.1.1.1.5.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 5),
+    "1.3.6.1.4.1.171.12.58.1.1.1.6.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 6),
+    "1.3.6.1.4.1.171.12.58.1.1.1.7.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 7),
+    "1.3.6.1.4.1.171.12.58.1.1.1.8.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 8),
+    "1.3.6.1.4.1.171.12.58.1.1.1.9.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 9),
+    "1.3.6.1.4.1.171.12.58.1.1.1.10.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 10),
+    "1.3.6.1.4.1.171.12.58.1.1.1.11.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 58, 1, 1, 1, 11),
+    "1.3.6.1.4.1.171.11.63.6.2.15.1.1.2.{port}": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 1, 1, 2),
+    "1.3.6.1.4.1.171.11.63.6.2.15.1.1.3.{port}": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 1, 1, 3),
+    "1.3.6.1.4.1.171.11.63.6.2.15.1.1.4.{port}": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 1, 1, 4),
+    "1.3.6.1.4.1.171.11.63.6.2.15.3.1.0": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 3, 1, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.15.3.2.0": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 3, 2, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.15.3.3.0": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 3, 3, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.15.3.4.0": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 15, 3, 4, 0),
+    "1.3.6.1.4.1.171.11.63.6.2.21.2.1.1.2.{port}": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 21, 2, 1, 1, 2),
+    "1.3.6.1.4.1.171.11.63.6.2.21.2.1.1.4.{port}": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 21, 2, 1, 1, 4),
+    "1.3.6.1.4.1.171.12.1.1.8.1.2.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 8, 1, 2),
+    "1.3.6.1.4.1.171.12.1.1.8.1.3.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 8, 1, 3),
+    "1.3.6.1.4.1.171.12.1.1.8.1.4.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 1, 1, 8, 1, 4),
+    "1.3.6.1.4.1.171.11.63.6.2.3.1.1.2.{port}": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 3, 1, 1, 2),
+    "1.3.6.1.4.1.171.11.63.6.2.3.1.1.3.{port}": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 3, 1, 1, 3),
+    "1.3.6.1.4.1.171.12.25.3.1.1.2.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 2),
+    "1.3.6.1.4.1.171.12.25.3.1.1.3.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 3),
+    "1.3.6.1.4.1.171.12.25.3.1.1.4.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 4),
+    "1.3.6.1.4.1.171.12.25.3.1.1.5.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 5),
+    "1.3.6.1.4.1.171.12.25.3.1.1.6.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 6),
+    "1.3.6.1.4.1.171.12.25.3.1.1.7.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 7),
+    "1.3.6.1.4.1.171.12.25.3.1.1.8.{port}": (1, 3, 6, 1, 4, 1, 171, 12, 25, 3, 1, 1, 8),
+    "1.3.6.1.4.1.171.11.63.6.2.12.1.1.2.{port}": (1, 3, 6, 1, 4, 1, 171, 11, 63, 6, 2, 12, 1, 1, 2),
+    "1.3.6.1.2.1.31.1.1.1.6.{port}": (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 6),
+    "1.3.6.1.2.1.31.1.1.1.7.{port}": (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 7),
+    "1.3.6.1.2.1.31.1.1.1.8.{port}": (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 8),
+    "1.3.6.1.2.1.31.1.1.1.9.{port}": (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 9),
+    "1.3.6.1.2.1.31.1.1.1.10.{port}": (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 10),
+    "1.3.6.1.2.1.31.1.1.1.11.{port}": (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 11),
+    "1.3.6.1.2.1.31.1.1.1.12.{port}": (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 12),
+    "1.3.6.1.2.1.31.1.1.1.13.{port}": (1, 3, 6, 1, 2, 1, 31, 1, 1, 1, 13),
+    "1.3.6.1.2.1.10.7.2.1.2.{port}": (1, 3, 6, 1, 2, 1, 10, 7, 2, 1, 2),
+    "1.3.6.1.2.1.10.7.2.1.3.{port}": (1, 3, 6, 1, 2, 1, 10, 7, 2, 1, 3),
+}
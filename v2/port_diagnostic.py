@@ -0,0 +1,180 @@
+#!/usr/bin/python3
+import asyncio
+import argparse
+from typing import Any, Self, TypedDict
+from pprint import pprint
+# local modules
+from const import SNMP, Provider, CitySwitch
+from L2_switch_client import L2SwitchClient, ResponseData
+from snmp_tracing import traced
+
+# data from user card needed for port checks
+class PortUser(TypedDict):
+    ip: str
+    gigabit: bool
+    direct_public_ip: bool
+    # vlan, dhcp relay and acl are checked only when user's subnet is correct
+    correct_subnet: bool
+
+# flags are the same as in v1 city diagnostics, so the result is read the same way
+type PortVerdict = dict[str, Any]
+
+# full diagnostics of user port, all switch data is requested at the same time
+class PortDiagnostic:
+    _client: L2SwitchClient
+    _user: PortUser
+    _verdict: PortVerdict
+
+    def __init__(self, client: L2SwitchClient, user: PortUser) -> None:
+        self._client = client
+        self._user = user
+        self._verdict = {}
+
+    @classmethod
+    async def create(cls, ipaddress: str, port: int, user: PortUser, agent_port: int = SNMP.AGENT_PORT) -> Self:
+        return cls(await L2SwitchClient.create(ipaddress, port, agent_port), user)
+
+    # independent checks are started at once, only cable diagnostic waits for their verdicts
+    @traced
+    async def run(self, cable_diagnostic: bool = True) -> PortVerdict:
+        tasks = [self._client.get_port_summary(), self._client.get_fdb_on_port()]
+        if self._user["correct_subnet"]:
+            tasks += [
+                self._client.get_vlan_on_port(),
+                self._client.get_vlan_names(),
+                self._client.get_dhcp_relay(),
+                self._client.get_acl_for_port()
+            ]
+        port, fdb, *subnet_data = await asyncio.gather(*tasks)
+
+        self._verdict = {}
+        self._check_port(port)
+        self._check_crc(port)
+        # mac and packets make sense only for enabled port with link
+        if not self._verdict["port_disabled"] and not self._verdict["linkdown_status"]:
+            self._check_mac(fdb, port)
+            self._check_packets(port)
+
+        if subnet_data:
+            port_vlans, switch_vlans, dhcp_relay, acl = subnet_data
+            self._check_vlan(port_vlans, switch_vlans, dhcp_relay)
+            self._check_acl(acl)
+
+        if cable_diagnostic and (self._verdict["linkdown_status"] or self._verdict["need_to_cable_diag"]) and not self._verdict["fiber_port"]:
+            self._verdict["cable_diagnostic"] = await self._client.get_cable_diagnostic_for_port()
+
+        return self._verdict
+
+    # port state, speed settings and link
+    def _check_port(self, port: ResponseData) -> None:
+        verdict = self._verdict
+        verdict["fiber_port"] = port["fiber_port"]
+        verdict["port_disabled"] = port["admin_state"] == "disabled"
+        verdict["speed_settings"] = None if port["speed_duplex_settings"] == "auto" else port["speed_duplex_settings"]
+        # link down status is actual only for enabled port
+        verdict["linkdown_status"] = port["link_speed_duplex_status"] if port["link_speed_duplex_status"] == "link_down" and not verdict["port_disabled"] else None
+        verdict["need_to_cable_diag"] = False
+        verdict["lower_speed"] = None
+        verdict["link_ok"] = False
+
+        # if there's link, check speed is satisfying, cable diag needed if not
+        if not verdict["port_disabled"] and not verdict["linkdown_status"]:
+            speed = port["link_speed_duplex_status"]
+            if not (speed == CitySwitch.NORMAL_SPEED[True] or not self._user["gigabit"] and speed == CitySwitch.NORMAL_SPEED[False]):
+                verdict["need_to_cable_diag"] = True
+                verdict["lower_speed"] = speed
+            else:
+                verdict["link_ok"] = True
+
+    def _check_crc(self, port: ResponseData) -> None:
+        self._verdict["crc_errors"] = port["fcs_errors"]
+        self._verdict["crc_ok"] = port["fcs_errors"] == 0
+
+    # mac addresses learned on port and port security
+    def _check_mac(self, fdb: ResponseData, port: ResponseData) -> None:
+        verdict = self._verdict
+        verdict["mac_addresses"] = set(fdb)
+        verdict["mac_flooding"] = len(fdb) >= CitySwitch.MAC_FLOODING_COUNT
+        verdict["no_mac"] = not fdb
+        verdict["many_macs"] = len(fdb) if len(fdb) > 1 else 0
+        verdict["mac_ok"] = len(fdb) == 1
+        verdict["port_security"] = port["port_security_admin_state"] == "enable"
+
+        # no mac on port with link, cable diag needed
+        if verdict["no_mac"]:
+            verdict["need_to_cable_diag"] = True
+
+    def _check_packets(self, port: ResponseData) -> None:
+        self._verdict["rx_bytes"] = port["rx_bytes"]
+        self._verdict["tx_bytes"] = port["tx_bytes"]
+        self._verdict["rx_megabit"] = L2SwitchClient._byte_to_megabit(port["rx_bytes"])
+        self._verdict["tx_megabit"] = L2SwitchClient._byte_to_megabit(port["tx_bytes"])
+        self._verdict["packets_ok"] = True
+
+    # vlans on port, dhcp relay is checked when port has exactly one untagged vlan
+    def _check_vlan(self, port_vlans: ResponseData, switch_vlans: dict[int, str], dhcp_relay: ResponseData) -> None:
+        verdict = self._verdict
+        verdict["port_vlans"] = {status: sorted(vlans) for status, vlans in port_vlans.items() if vlans}
+        verdict["have_direct_public_vlan"] = Provider.DIRECT_PUBLIC_VLAN in switch_vlans
+        verdict["no_untagged_vlan"] = "untagged" not in verdict["port_vlans"]
+        verdict["untagged_vlan_id"] = 0
+        verdict["user_vlan_instead_of_direct_public_vlan"] = False
+        verdict["direct_public_vlan_instead_of_user_vlan"] = False
+        verdict["vlan_ok"] = False
+
+        if verdict["no_untagged_vlan"] or len(verdict["port_vlans"]["untagged"]) != 1:
+            return
+
+        vlan_id = verdict["untagged_vlan_id"] = verdict["port_vlans"]["untagged"][0]
+        if self._user["direct_public_ip"] and verdict["have_direct_public_vlan"] and vlan_id != Provider.DIRECT_PUBLIC_VLAN:
+            verdict["user_vlan_instead_of_direct_public_vlan"] = True
+        elif not self._user["direct_public_ip"] and vlan_id == Provider.DIRECT_PUBLIC_VLAN:
+            verdict["direct_public_vlan_instead_of_user_vlan"] = True
+        # only one untagged vlan and nothing else
+        elif len(verdict["port_vlans"]) == 1:
+            verdict["vlan_ok"] = True
+
+        self._check_dhcp_relay(dhcp_relay, vlan_id)
+
+    # relay is ok when it's enabled and primary and one of secondary servers are set for ipif,
+    # as in v1, switches with relay by vlans also need these servers for user's untagged vlan
+    def _check_dhcp_relay(self, dhcp_relay: ResponseData, vlan_id: int) -> None:
+        def servers_ok(servers: set[str]) -> bool:
+            return Provider.PRIMARY_DHCP_SERVER in servers and bool(servers & Provider.SECONDARY_DHCP_SERVERS)
+
+        relay_ok = dhcp_relay["state"] == "enabled" and any(map(servers_ok, dhcp_relay["ipif_servers"].values()))
+        if "vlan_id_servers" in dhcp_relay:
+            relay_ok = relay_ok and servers_ok(dhcp_relay["vlan_id_servers"].get(vlan_id, set()))
+        self._verdict["dhcp_relay_ok"] = relay_ok
+        self._verdict["incorrect_dhcp_relay"] = not self._verdict["dhcp_relay_ok"]
+
+    # user needs permit rules for source ip, for ipv4 and arp
+    def _check_acl(self, acl: ResponseData) -> None:
+        source_ips = [
+            rule["source_ip"]
+            for profile in acl.values() if profile["type"] == "packet_content"
+            for rule in profile.get("rule_management", {}).values() if rule["permit"] == "permit" and rule["source_ip"]
+        ]
+        self._verdict["no_acl"] = len(source_ips) < 2
+        self._verdict["wrong_acl"] = not self._verdict["no_acl"] and any(ip != self._user["ip"] for ip in source_ips)
+        self._verdict["acl_ok"] = not self._verdict["no_acl"] and not self._verdict["wrong_acl"]
+
+async def diagnose(args: argparse.Namespace) -> PortVerdict:
+    user = PortUser(ip=args.user_ip, gigabit=args.gigabit, direct_public_ip=args.direct_public_ip, correct_subnet=not args.no_subnet)
+    diagnostic = await PortDiagnostic.create(args.switch, args.port, user, args.agent_port)
+    return await diagnostic.run(cable_diagnostic=not args.no_cable_diagnostic)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent diagnostics of user port on L2 switch")
+    parser.add_argument("switch")
+    parser.add_argument("port", type=int)
+    parser.add_argument("user_ip")
+    parser.add_argument("--gigabit", action="store_true")
+    parser.add_argument("--direct-public-ip", action="store_true")
+    parser.add_argument("--no-subnet", action="store_true", help="user's subnet is incorrect, skip vlan, dhcp relay and acl")
+    parser.add_argument("--no-cable-diagnostic", action="store_true")
+    parser.add_argument("--agent-port", type=int, default=SNMP.AGENT_PORT)
+    pprint(asyncio.run(diagnose(parser.parse_args())), sort_dicts=False)
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,8 @@ from pydantic import BaseModel, Field, field_validator, model_validator
 from pydantic_extra_types.mac_address import MacAddress
 from ipaddress import IPv4Address
 from datetime import datetime
-from typing import Annotated, Literal, Self
+from typing import Annotated, Any, Literal, Self
+from snmp_tracing import span
 
 INCLUSIVELY_NECESSARY_FIELD_SCHEMA = {"inclusively_necessary": True}
 EXCLUSIVELY_NECESSARY_FIELD_SCHEMA = {"exclusively_necessary": True}
@@ -14,8 +15,13 @@ MAC_ADDRESS_REGEX = r"^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$"
 ### BASE MODEL CONFIG ###
 
 class RestrictedBaseModel(BaseModel):
-    # disallow any extra fields in configs
-    model_config = {"extra": "forbid"}
+    # disallow any extra fields in configs, validators are built on the first validation instead of import
+    model_config = {"extra": "forbid", "defer_build": True}
+
+    # validation of request config is a separate span in traces
+    def __init__(self, **data: Any) -> None:
+        with span(f"validate {type(self).__name__}"):
+            super().__init__(**data)
 
     @model_validator(mode="after")
     def check_field_groups(self) -> Self:
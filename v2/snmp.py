@@ -2,7 +2,6 @@
 import asyncio
 from time import perf_counter
 from pprint import pprint
-from pysnmp.hlapi.v3arch.asyncio import *
 from const import SNMP
 from snmp_exceptions import SNMPTransportError
 from L2_switch_handler import L2SwitchHandler
@@ -0,0 +1,392 @@
+#!/usr/bin/python3
+import asyncio
+import argparse
+import inspect
+import os
+import random
+import re
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Any, Self
+from pyasn1.codec.ber import decoder, encoder
+from pyasn1.error import PyAsn1Error
+from pysnmp.proto import api
+from pysnmp.proto.api import v2c
+
+# compact fixture format, one varbind per line: oid|type|value
+# value is decimal for numbers, dotted for oid and ip address, hex for octet string
+FIXTURE_TYPES = {
+    "i": v2c.Integer,
+    "s": v2c.OctetString,
+    "o": v2c.ObjectIdentifier,
+    "a": v2c.IpAddress,
+    "c": v2c.Counter32,
+    "g": v2c.Gauge32,
+    "t": v2c.TimeTicks,
+    "C": v2c.Counter64,
+}
+TAG_TO_FIXTURE_TYPE = {value_type.tagSet: code for code, value_type in FIXTURE_TYPES.items()}
+
+# row status values of snmp tables
+ROW_STATUS_ACTIVE = 1
+ROW_STATUS_CREATE_AND_GO = 4
+ROW_STATUS_DESTROY = 6
+
+type Oid = tuple[int, ...]
+
+# sysUpTime is answered by agent itself as time since its start, like real device does
+SYS_UPTIME_OID: Oid = (1, 3, 6, 1, 2, 1, 1, 3, 0)
+
+# get_* methods that start actions on switch: they change its state and stand-in agent can't finish them
+ACTION_METHODS = {"get_cable_diagnostic_for_port"}
+
+# sorted oid -> value storage of one device
+class SNMPFixture:
+    _values: dict[Oid, Any]
+    _oids: list[Oid]
+
+    def __init__(self, values: dict[Oid, Any] | None = None) -> None:
+        self._values = dict(values or {})
+        self._oids = sorted(self._values)
+
+    def __len__(self) -> int:
+        return len(self._oids)
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        values = {}
+
+        with open(path, "r") as F:
+            for line in F:
+                if not (line := line.strip()) or line.startswith("#"):
+                    continue
+                oid, code, value = line.split("|", 2)
+                values[tuple(int(part) for part in oid.split("."))] = SNMPFixture._decode_value(code, value)
+
+        return cls(values)
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as F:
+            for oid in self._oids:
+                code, value = SNMPFixture._encode_value(self._values[oid])
+                F.write(f"{'.'.join(map(str, oid))}|{code}|{value}\n")
+
+    # agents with sets need their own copy, others share one fixture
+    def copy(self) -> Self:
+        return type(self)(self._values)
+
+    def get(self, oid: Oid) -> Any | None:
+        return self._values.get(oid)
+
+    # next oid in lexicographic order, as for getnext/getbulk
+    def get_next(self, oid: Oid) -> tuple[Oid, Any] | None:
+        index = bisect_right(self._oids, oid)
+        if index == len(self._oids):
+            return None
+        next_oid = self._oids[index]
+        return next_oid, self._values[next_oid]
+
+    def set(self, oid: Oid, value: Any) -> None:
+        if oid not in self._values:
+            self._oids.insert(bisect_right(self._oids, oid), oid)
+        self._values[oid] = value
+
+    def delete(self, oid: Oid) -> None:
+        if self._values.pop(oid, None) is not None:
+            self._oids.remove(oid)
+
+    @staticmethod
+    def _decode_value(code: str, value: str) -> Any:
+        value_type = FIXTURE_TYPES[code]
+        match code:
+            case "s":
+                return value_type(hexValue=value)
+            case "o" | "a":
+                return value_type(value)
+            case _:
+                return value_type(int(value))
+
+    @staticmethod
+    def _encode_value(value: Any) -> tuple[str, str]:
+        code = TAG_TO_FIXTURE_TYPE[value.tagSet]
+        match code:
+            case "s":
+                return code, value.asOctets().hex()
+            case "o":
+                return code, str(value)
+            case "a":
+                return code, ".".join(str(octet) for octet in value.asOctets())
+            case _:
+                return code, str(int(value))
+
+
+# collects varbinds received by SNMPClient, one fixture per switch
+class SNMPRecorder:
+    _fixtures: dict[str, SNMPFixture]
+    _models: dict[str, str]
+
+    def __init__(self) -> None:
+        self._fixtures = defaultdict(SNMPFixture)
+        self._models = {}
+
+    def record(self, ipaddress: str, model: str | None, varBinds) -> None:
+        # model is unknown only while the switch is being identified
+        if model is not None:
+            self._models[ipaddress] = model
+
+        fixture = self._fixtures[ipaddress]
+        for oid, value in varBinds:
+            # missing values, end of mib and other exceptions aren't device data
+            if value.tagSet in TAG_TO_FIXTURE_TYPE:
+                fixture.set(tuple(oid), FIXTURE_TYPES[TAG_TO_FIXTURE_TYPE[value.tagSet]](value))
+
+    # save fixtures named by model, return saved paths
+    def save(self, directory: str) -> list[str]:
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+
+        for ipaddress, fixture in self._fixtures.items():
+            model = self._models.get(ipaddress, ipaddress)
+            paths.append(path := os.path.join(directory, f"{model.replace('/', '_')}.snmprec"))
+            fixture.save(path)
+
+        return paths
+
+
+# request/response counters of one agent
+class AgentStats:
+    requests: int
+    responses: int
+    dropped: int
+    bytes_received: int
+    bytes_sent: int
+
+    def __init__(self) -> None:
+        self.requests = self.responses = self.dropped = 0
+        self.bytes_received = self.bytes_sent = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(vars(self))
+
+
+# snmp v2c agent on udp serving one fixture
+class SNMPAgent(asyncio.DatagramProtocol):
+    _fixture: SNMPFixture
+    _is_fixture_shared: bool
+    _latency: float
+    _jitter: float
+    _loss: float
+    drop: set[int]
+    _transport: asyncio.DatagramTransport | None
+    _started: float
+    stats: AgentStats
+
+    # drop: numbers of requests to lose, counting from 1, for exact retry scenarios
+    def __init__(self, fixture: SNMPFixture, latency: float = 0, jitter: float = 0, loss: float = 0, drop: set[int] | None = None) -> None:
+        self._fixture = fixture
+        self._is_fixture_shared = True
+        self._latency = latency
+        self._jitter = jitter
+        self._loss = loss
+        self.drop = drop or set()
+        self._transport = None
+        self._started = time.monotonic()
+        self.stats = AgentStats()
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        self._transport = transport
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+    def datagram_received(self, data: bytes, address: tuple[str, int]) -> None:
+        self.stats.requests += 1
+        self.stats.bytes_received += len(data)
+
+        # emulate lost packet
+        if self.stats.requests in self.drop or self._loss and random.random() < self._loss:
+            self.stats.dropped += 1
+            return
+
+        try:
+            response = self._handle(data)
+        except PyAsn1Error:
+            self.stats.dropped += 1
+            return
+
+        delay = self._latency + (random.uniform(0, self._jitter) if self._jitter else 0)
+        if delay:
+            asyncio.get_running_loop().call_later(delay, self._send, response, address)
+        else:
+            self._send(response, address)
+
+    def _send(self, response: bytes, address: tuple[str, int]) -> None:
+        if self._transport is None or self._transport.is_closing():
+            return
+        self.stats.responses += 1
+        self.stats.bytes_sent += len(response)
+        self._transport.sendto(response, address)
+
+    def _handle(self, data: bytes) -> bytes:
+        if api.decodeMessageVersion(data) != api.SNMP_VERSION_2C:
+            raise PyAsn1Error("only SNMPv2c is supported")
+
+        request, _ = decoder.decode(data, asn1Spec=v2c.Message())
+        response = v2c.apiMessage.get_response(request)
+        request_pdu = v2c.apiMessage.get_pdu(request)
+        response_pdu = v2c.apiMessage.get_pdu(response)
+
+        if request_pdu.isSameTypeWith(v2c.GetRequestPDU()):
+            varBinds = [(oid, self._get(oid)) for oid, _ in v2c.apiPDU.get_varbinds(request_pdu)]
+        elif request_pdu.isSameTypeWith(v2c.GetNextRequestPDU()):
+            varBinds = [self._get_next(oid) for oid, _ in v2c.apiPDU.get_varbinds(request_pdu)]
+        elif request_pdu.isSameTypeWith(v2c.GetBulkRequestPDU()):
+            varBinds = self._get_bulk(request_pdu)
+        elif request_pdu.isSameTypeWith(v2c.SetRequestPDU()):
+            varBinds = self._set(v2c.apiPDU.get_varbinds(request_pdu))
+        else:
+            raise PyAsn1Error("unsupported pdu type")
+
+        v2c.apiPDU.set_varbinds(response_pdu, varBinds)
+        return encoder.encode(response)
+
+    def _get(self, oid) -> Any:
+        if tuple(oid) == SYS_UPTIME_OID:
+            return v2c.TimeTicks(int((time.monotonic() - self._started) * 100))
+        value = self._fixture.get(tuple(oid))
+        return v2c.NoSuchInstance("") if value is None else value
+
+    def _get_next(self, oid) -> tuple[Any, Any]:
+        found = self._fixture.get_next(tuple(oid))
+        return (oid, v2c.EndOfMibView("")) if found is None else (v2c.ObjectIdentifier(found[0]), found[1])
+
+    def _get_bulk(self, request_pdu) -> list[tuple[Any, Any]]:
+        non_repeaters = int(v2c.apiBulkPDU.get_non_repeaters(request_pdu))
+        max_repetitions = int(v2c.apiBulkPDU.get_max_repetitions(request_pdu))
+        request_oids = [oid for oid, _ in v2c.apiBulkPDU.get_varbinds(request_pdu)]
+
+        varBinds = [self._get_next(oid) for oid in request_oids[:non_repeaters]]
+        repeaters = request_oids[non_repeaters:]
+
+        for _ in range(max_repetitions):
+            if not repeaters:
+                break
+            row = [self._get_next(oid) for oid in repeaters]
+            varBinds.extend(row)
+            # all repeaters reached end of mib, no need to go further
+            if all(value.isSameTypeWith(v2c.EndOfMibView()) for _, value in row):
+                break
+            repeaters = [oid for oid, _ in row]
+
+        return varBinds
+
+    def _set(self, varBinds) -> list[tuple[Any, Any]]:
+        # the first set makes agent's own copy of shared fixture
+        if self._is_fixture_shared:
+            self._fixture = self._fixture.copy()
+            self._is_fixture_shared = False
+
+        for oid, value in varBinds:
+            oid = tuple(oid)
+            # table rows are emulated by their row status column only
+            if value.tagSet == v2c.Integer.tagSet and int(value) == ROW_STATUS_DESTROY:
+                self._fixture.delete(oid)
+            elif value.tagSet == v2c.Integer.tagSet and int(value) == ROW_STATUS_CREATE_AND_GO:
+                self._fixture.set(oid, v2c.Integer(ROW_STATUS_ACTIVE))
+            else:
+                self._fixture.set(oid, value)
+
+        return list(varBinds)
+
+
+# start virtual agents on consecutive ports, fixtures are assigned round-robin
+async def start_agents(
+            fixtures: list[SNMPFixture],
+            count: int,
+            base_port: int,
+            host: str = "127.0.0.1",
+            latency: float = 0,
+            jitter: float = 0,
+            loss: float = 0
+        ) -> list[SNMPAgent]:
+    loop = asyncio.get_running_loop()
+    agents = []
+
+    for i in range(count):
+        agent = SNMPAgent(fixtures[i % len(fixtures)], latency, jitter, loss)
+        await loop.create_datagram_endpoint(lambda: agent, local_addr=(host, base_port + i))
+        agents.append(agent)
+
+    return agents
+
+
+# public read methods: get_* without parameters, actions aren't read methods
+def read_methods(obj: Any, pattern: str | None = None) -> list[str]:
+    return [
+        name for name, method in inspect.getmembers(obj, inspect.iscoroutinefunction)
+        if (name.startswith("get_") or name == "scan_available_mibs")
+        and not inspect.signature(method).parameters
+        and name not in ACTION_METHODS
+        and (pattern is None or re.search(pattern, name))
+    ]
+
+# run every public read method of L2SwitchClient on real switch and save what was received
+async def record(ipaddress: str, port: int, directory: str) -> list[str]:
+    from snmp_client import SNMPClient
+    from L2_switch_client import L2SwitchClient
+
+    SNMPClient._recorder = recorder = SNMPRecorder()
+    client = await L2SwitchClient.create(ipaddress, port)
+
+    for name in read_methods(client):
+        try:
+            await getattr(client, name)()
+        # not every model supports every method
+        except Exception as err:
+            print(f"{name}: {type(err).__name__}: {err}")
+
+    SNMPClient._recorder = None
+    return recorder.save(directory)
+
+async def serve(args: argparse.Namespace) -> None:
+    fixtures = [SNMPFixture.load(path) for path in args.fixtures]
+    agents = await start_agents(fixtures, args.count, args.base_port, args.host,
+                                args.latency / 1000, args.jitter / 1000, args.loss)
+    print(f"{len(agents)} agents on {args.host}:{args.base_port}-{args.base_port + len(agents) - 1}")
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for agent in agents:
+            agent.close()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SNMP agent stand-in serving recorded fixtures")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="record fixture from real switch")
+    record_parser.add_argument("ipaddress")
+    record_parser.add_argument("--port", type=int, default=1, help="switch port for port methods")
+    record_parser.add_argument("--directory", default="v2/fixtures")
+
+    serve_parser = commands.add_parser("serve", help="serve fixtures by virtual agents")
+    serve_parser.add_argument("fixtures", nargs="+")
+    serve_parser.add_argument("--count", type=int, default=1)
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--base-port", type=int, default=20161)
+    serve_parser.add_argument("--latency", type=float, default=0, help="response delay, ms")
+    serve_parser.add_argument("--jitter", type=float, default=0, help="random extra delay, ms")
+    serve_parser.add_argument("--loss", type=float, default=0, help="probability of dropped request")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        for path in asyncio.run(record(args.ipaddress, args.port, args.directory)):
+            print("Saved:", path)
+    else:
+        asyncio.run(serve(args))
+
+if __name__ == "__main__":
+    main()
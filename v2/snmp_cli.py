@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+import argparse
+import json
+import socket
+import sys
+from pprint import pprint
+# local modules
+from const import SNMP
+
+# thin client of snmp_daemon.py, doesn't load snmp at all, so it starts and answers in milliseconds
+def send(request: dict, socket_path: str = SNMP.DAEMON_SOCKET) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        with sock.makefile("rb") as F:
+            return json.loads(F.readline())
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Call L2SwitchClient method through snmp_daemon.py")
+    parser.add_argument("method", help="status, metrics or reading L2SwitchClient method, e.g. get_port_status")
+    parser.add_argument("switch", nargs="?")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--agent-port", type=int, default=SNMP.AGENT_PORT)
+    parser.add_argument("--socket", default=SNMP.DAEMON_SOCKET)
+    args = parser.parse_args()
+
+    if args.method not in ("status", "metrics") and args.switch is None:
+        parser.error("switch is required")
+
+    request = {"method": args.method, "switch": args.switch, "port": args.port, "agent_port": args.agent_port}
+
+    try:
+        response = send(request, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        sys.exit(f"Daemon isn't running: {args.socket}")
+
+    if not response["ok"]:
+        sys.exit(response["error"])
+    if isinstance(response["result"], str):
+        print(response["result"])
+    else:
+        pprint(response["result"], sort_dicts=False)
+
+if __name__ == "__main__":
+    main()
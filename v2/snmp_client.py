@@ -2,16 +2,24 @@
 import asyncio
 import yaml
 import struct
-import re
-from typing import Any, Self
+from typing import Any, AsyncIterator, Callable, ClassVar, Self
 from abc import ABC, abstractmethod
 from pprint import pprint
 from copy import deepcopy
-from icmplib import ping
+from time import perf_counter
 from pysnmp.hlapi.v3arch.asyncio import *
 from pyasn1.type.univ import ObjectIdentifier
+from pysnmp.proto import errind
+from pysnmp.proto.rfc1902 import ObjectName
+from pysnmp.hlapi.varbinds import CommandGeneratorVarBinds
 from pysnmp.proto.rfc1902 import OctetString, Integer, IpAddress
 from const import SNMPRequestType, SNMP
+from switch_table_cache import SwitchTableCache
+from device_timeout import DeviceTimeout
+from fingerprint_cache import FingerprintCache, Fingerprint
+from oid_codegen import load_oid_tables
+from snmp_metrics import METRICS, Labels
+from snmp_tracing import traced, span, start_span, end_span, add_span
 from snmp_exceptions import *
 
 type SnmpValue = ObjectIdentifier | OctetString | Integer | IpAddress
@@ -19,6 +27,7 @@ type PayloadData = dict[str, dict[str, Any]]
 
 class SNMPClient(ABC):
     _ipaddress: str
+    _agent_port: int
     _model: str
     _init_lock: asyncio.Lock
     _engine: SnmpEngine
@@ -28,9 +37,22 @@ class SNMPClient(ABC):
     _context: ContextData
     _max_repetitions: int
     _config: dict[str, Any]
+    _shared_config: ClassVar[dict[str, Any] | None] = None
+    # oid template: oid.yaml section, for metrics labels
+    _oid_sections: ClassVar[dict[str, str]] = {}
+    # optional recorder of all received varbinds, used for making agent fixtures
+    _recorder: ClassVar[Any] = None
+    # generated oid factories and walk roots by oid template, see oid_codegen.py
+    _oid_factories: ClassVar[dict[str, Callable[..., tuple[int, ...]]]] = {}
+    _walk_roots: ClassVar[dict[str, tuple[int, ...]]] = {}
+    # oid tuple: identity resolved once, pysnmp doesn't resolve it again for every request
+    _resolved_identities: ClassVar[dict[tuple[int, ...], ObjectIdentity]] = {}
+    # one engine for all clients of the process, when enabled
+    _shared_engine: ClassVar[SnmpEngine | None] = None
 
-    def __init__(self, ipaddress: str) -> None:
+    def __init__(self, ipaddress: str, agent_port: int = SNMP.AGENT_PORT) -> None:
         self._ipaddress = ipaddress
+        self._agent_port = agent_port
         self._model = None
 
         self._init_lock = asyncio.Lock()
@@ -41,18 +63,46 @@ class SNMPClient(ABC):
         self._context = None
         self._max_repetitions = 49   # can be changed
 
-        with open("v2/oid.yaml", "r") as F:
-            self._config = yaml.safe_load(F)
+        self._config = SNMPClient._load_config()
+    
+    # many clients of a fleet poller work through one engine and its socket instead of engine per client
+    @staticmethod
+    def use_shared_engine() -> None:
+        if SNMPClient._shared_engine is None:
+            SNMPClient._shared_engine = SnmpEngine()
+    
+    # oid config is read-only, so it's parsed once and shared by all clients
+    @staticmethod
+    def _load_config() -> dict[str, Any]:
+        if SNMPClient._shared_config is None:
+            with open("v2/oid.yaml", "r") as F:
+                text = F.read()
+            SNMPClient._shared_config = yaml.safe_load(text)
+
+            oid_tables = load_oid_tables(text)
+            SNMPClient._oid_factories = oid_tables.OID_FACTORIES
+            SNMPClient._walk_roots = oid_tables.WALK_ROOTS
+
+            SNMPClient._oid_sections = {data["oid"]: "system" for data in SNMPClient._shared_config["system"].values()}
+            for model_config in SNMPClient._shared_config["models"].values():
+                if not isinstance(model_config, dict):
+                    continue
+                for section, section_config in model_config.get("oids", {}).items():
+                    SNMPClient._oid_sections.update(
+                        (data["oid"], section) for data in section_config.values() if isinstance(data, dict) and "oid" in data
+                    )
+        return SNMPClient._shared_config
     
     @classmethod
     async def create(cls, ipaddress: str, *args, **kwargs) -> Self:
-        self = cls(ipaddress, *args)
+        # if only model assertion needed, post init isn't necessary
+        need_post_init = "assert_switch_models" not in kwargs
+        assert_switch_models = kwargs.pop("assert_switch_models", None)
 
-        assert_switch_models = kwargs.get("assert_switch_models")
+        self = cls(ipaddress, *args, **kwargs)
         await self._initialize(assert_switch_models=assert_switch_models)
 
-        # if only model assertion needed, post init isn't necessary
-        if "assert_switch_models" not in kwargs:
+        if need_post_init:
             self._post_init()
         
         return self
@@ -62,31 +112,63 @@ class SNMPClient(ABC):
             if self._engine is not None:
                 return
             
-            self._engine = SnmpEngine()
+            self._engine = SNMPClient._shared_engine or SnmpEngine()
             self._read_community = CommunityData(SNMP.READ_ONLY)
             self._write_community = CommunityData(SNMP.READ_WRITE)
-            self._transport = await UdpTransportTarget.create((self._ipaddress, 161), retries=2)
+            self._transport = await self._create_transport()
             self._context = ContextData()
 
             await self._identify(assert_switch_models)
     
+    # retries are made by client itself, timeout is updated before every pdu
+    async def _create_transport(self) -> UdpTransportTarget:
+        return await UdpTransportTarget.create(
+            (self._ipaddress, self._agent_port), timeout=DeviceTimeout.for_device(self._ipaddress, self._agent_port).timeout(), retries=0
+        )
+    
     async def _identify(self, assert_switch_models: set[str] | None = None) -> None:
+        # sysObjectID and sysUpTime in one pdu, for known device it's the only request
         task_oid = asyncio.create_task(
             self._get(
-                SNMPClient._compose_request_payload(SNMPRequestType.GET, self._config["system"], ["private_oid"]),
+                SNMPClient._compose_request_payload(SNMPRequestType.GET, self._config["system"], ["private_oid", "uptime"]),
                 skip_init=True
             )
         )
-        task_description = asyncio.create_task(
-            self._get(
-                SNMPClient._compose_request_payload(SNMPRequestType.GET, self._config["system"], ["description"]),
-                skip_init=True
+        fingerprint = FingerprintCache.get(self._fingerprint_key)
+        
+        # description is requested only if there is no fingerprint of this device
+        task_description = None
+        if fingerprint is None:
+            task_description = asyncio.create_task(
+                self._get(
+                    SNMPClient._compose_request_payload(SNMPRequestType.GET, self._config["system"], ["description"]),
+                    skip_init=True
+                )
             )
-        )
-        models, description = await asyncio.gather(task_oid, task_description)
+        try:
+            system = await task_oid
+        # description request isn't left running when identification failed or was cancelled
+        except BaseException:
+            if task_description is not None:
+                task_description.cancel()
+                await asyncio.gather(task_description, return_exceptions=True)
+            raise
+        models = system["private_oid"]
+
+        # fingerprint is used while device has the same model and wasn't rebooted
+        if fingerprint is not None:
+            if fingerprint["model"] in models and FingerprintCache.is_same_boot(fingerprint, system["uptime"]):
+                self._model = fingerprint["model"]
+                METRICS.increment("snmp_fingerprint_total", (("result", "hit"),))
+                self._assert_model(assert_switch_models)
+            else:
+                METRICS.increment("snmp_fingerprint_total", (("result", "stale"),))
+                FingerprintCache.drop(self._fingerprint_key)
+                await self._identify(assert_switch_models)
+            return
 
-        models = next(iter(models.values()))
-        description = next(iter(description.values()))
+        METRICS.increment("snmp_fingerprint_total", (("result", "miss"),))
+        description = next(iter((await task_description).values()))
         
         for model in models:
             if model in description:   # description must contain one of model names from config
@@ -95,19 +177,40 @@ class SNMPClient(ABC):
         else:
             raise AssertionError(f"Switch model with ip {self._ipaddress} was not found in description")
         
-        # check switch model with defined one and print error if assertion failed
+        if system["uptime"] is not None:
+            FingerprintCache.put(self._fingerprint_key, Fingerprint(
+                model=self._model,
+                ports_count=self._config["models"][self._model].get("ports_count"),
+                description=description,
+                boot_time=FingerprintCache.boot_time(system["uptime"])
+            ))
+        
+        self._assert_model(assert_switch_models)
+    
+    # check switch model with defined one and print error if assertion failed, model may come from fingerprint or description
+    def _assert_model(self, assert_switch_models: set[str] | None) -> None:
         if assert_switch_models:
             try:
                 assert self._model in assert_switch_models
             except AssertionError:
                 print(f"AssertionError: the switch model with ip {self._ipaddress} is {self._model}, not {assert_switch_models}")
     
+    # agents on the same host but not standard port are different devices, e.g. stand-in agents
+    @property
+    def _fingerprint_key(self) -> str:
+        if self._agent_port == SNMP.AGENT_PORT:
+            return self._ipaddress
+        return f"{self._ipaddress}:{self._agent_port}"
+    
     @abstractmethod
     def _post_init(self) -> None:
         pass
     
     # helper function waiting for device to be online in the certain time range
     def _wait_for_device_online(self) -> bool:
+        # icmplib is needed only after reboots
+        from icmplib import ping
+
         # 240 seconds of retrying
         for _ in range(240):
             # if alive at any time, return True
@@ -116,19 +219,17 @@ class SNMPClient(ABC):
         # otherwise False
         return False
     
+    @traced
     async def _get(self, payload: PayloadData, skip_init: bool = False) -> dict[str, Any] | None:
         if not skip_init:
             await self._initialize()
         
-        oid_objects = [ObjectType(ObjectIdentity(self._render_get_set_oid(request["oid"], **request["params"])))
-                       for request in payload.values()]
+        with span("render"):
+            oid_objects = [self._object_type(self._render_get_set_oid(request["oid"], **request["params"]))
+                           for request in payload.values()]
         
-        errorIndication, errorStatus, errorIndex, varBinds = await get_cmd(
-            self._engine,
-            self._read_community,
-            self._transport,
-            self._context,
-            *oid_objects
+        errorIndication, errorStatus, errorIndex, varBinds = await self._send(
+            get_cmd, self._read_community, oid_objects, self._metrics_labels(SNMPRequestType.GET, payload)
         )
         
         try:
@@ -138,25 +239,27 @@ class SNMPClient(ABC):
         except SNMPProtocolError:
             raise
         
+        if SNMPClient._recorder is not None:
+            SNMPClient._recorder.record(self._ipaddress, self._model, varBinds)
+        
         results = {}
 
-        for (command_name, data), varBind in zip(payload.items(), varBinds):
-            results[command_name] = SNMPClient._convert_result_value(varBind[1], data)
+        with span("decode"):
+            for (command_name, data), varBind in zip(payload.items(), varBinds):
+                results[command_name] = SNMPClient._convert_result_value(varBind[1], data)
         
         return results
     
+    @traced
     async def _set(self, payload: PayloadData) -> dict[str, Any] | None:
         await self._initialize()
         
-        oid_objects = [ObjectType(ObjectIdentity(self._render_get_set_oid(request["oid"], **request["params"])), request["set_value"])
-                       for request in payload.values()]
+        with span("render"):
+            oid_objects = [self._object_type(self._render_get_set_oid(request["oid"], **request["params"]), request["set_value"])
+                           for request in payload.values()]
         
-        errorIndication, errorStatus, errorIndex, varBinds = await set_cmd(
-            self._engine,
-            self._write_community,
-            self._transport,
-            self._context,
-            *oid_objects
+        errorIndication, errorStatus, errorIndex, varBinds = await self._send(
+            set_cmd, self._write_community, oid_objects, self._metrics_labels(SNMPRequestType.SET, payload)
         )
         
         try:
@@ -166,51 +269,191 @@ class SNMPClient(ABC):
         except SNMPProtocolError:
             raise
         
+        if SNMPClient._recorder is not None:
+            SNMPClient._recorder.record(self._ipaddress, self._model, varBinds)
+        
         results = {}
 
-        for (command_name, data), varBind in zip(payload.items(), varBinds):
-            results[command_name] = SNMPClient._convert_result_value(varBind[1], data)
+        with span("decode"):
+            for (command_name, data), varBind in zip(payload.items(), varBinds):
+                results[command_name] = SNMPClient._convert_result_value(varBind[1], data)
         
         return results
     
+    # send request pdu with timeout by device rtt, retries are spent from device budget
+    async def _send(self, command: Callable, community: CommunityData, oid_objects: list[ObjectType], labels: Labels) -> tuple:
+        device = DeviceTimeout.for_device(self._ipaddress, self._agent_port)
+        # down device fails at once instead of waiting for all timeouts
+        if device.is_down():
+            METRICS.increment("snmp_errors_total", labels + (("kind", "down"),))
+            return errind.RequestTimedOut(), 0, 0, ()
+
+        start = perf_counter()
+        attempt = 0
+
+        while True:
+            # time of waiting for free slot isn't a part of round trip
+            async with device.slot():
+                self._transport.timeout = device.timeout(attempt)
+                pdu_start = perf_counter()
+                with span("pdu", varbinds=len(oid_objects), attempt=attempt, timeout=self._transport.timeout):
+                    # response oids aren't looked up in mibs, values are converted by oid.yaml types
+                    errorIndication, errorStatus, errorIndex, varBinds = await command(
+                        self._engine,
+                        community,
+                        self._transport,
+                        self._context,
+                        *oid_objects,
+                        lookupMib=False
+                    )
+            METRICS.record_pdu(labels, perf_counter() - pdu_start, len(varBinds))
+
+            if not isinstance(errorIndication, errind.RequestTimedOut):
+                device.on_response(perf_counter() - pdu_start, attempt)
+                break
+
+            if not device.take_retry(attempt):
+                device.on_failure()
+                break
+            attempt += 1
+            METRICS.increment("snmp_retries_total", labels)
+        
+        METRICS.record_request(labels, perf_counter() - start, SNMPClient._error_kind(errorIndication, errorStatus))
+        return errorIndication, errorStatus, errorIndex, varBinds
+    
     async def _bulk_walk(self, payload: dict[str, Any]) -> list[tuple[str, Any]] | None:
+        return [result async for result in self._bulk_walk_stream(payload)]
+    
+    # walk results are yielded as soon as each response pdu arrives, without collecting the whole table
+    async def _bulk_walk_stream(self, payload: dict[str, Any]) -> AsyncIterator[tuple[str, Any]]:
         await self._initialize()
 
-        oid_object = ObjectType(ObjectIdentity(self._render_bulk_walk_oid(payload["oid"])))
+        oid_object = self._object_type(SNMPClient._walk_roots[payload["oid"]])
 
-        results = []
+        labels = self._metrics_labels("walk", {"walk": payload})
+        # span isn't made current, consumer of the stream works in its own span between pdus
+        walk_span = start_span("SNMPClient._bulk_walk", section=labels[2][1])
+        walk_start = perf_counter()
+        walk_size = 0
+        error = None
 
-        async for (errorIndication, errorStatus, errorIndex, varBinds) in bulk_walk_cmd(
-            self._engine,
-            self._read_community,
-            self._transport,
-            self._context,
-            0, self._max_repetitions,
-            oid_object,
-            lexicographicMode=False
-        ):
-            try:
-                SNMPClient._check_errors(errorIndication, errorStatus, errorIndex, varBinds, payload)
-            except SNMPTransportError:
-                raise
-            except SNMPProtocolError:
-                raise
-            
-            for varBind in varBinds:
-                oid = str(varBind[0])
-                value = SNMPClient._convert_result_value(varBind[1], payload)
-                results.append((oid, value))
-        
-        return results
+        device = DeviceTimeout.for_device(self._ipaddress, self._agent_port)
+        attempt = 0
+        self._transport.timeout = device.timeout()
+
+        try:
+            if device.is_down():
+                error = "down"
+                raise SNMPTransportError(errind.RequestTimedOut())
+
+            # walk is driven by bulk requests directly, so every lost pdu is one retry and one resend
+            root = ObjectName(SNMPClient._walk_roots[payload["oid"]])
+            request_object = oid_object
+            done = False
+
+            while not done:
+                # slot is held only for round trip, consumer works between pdus
+                async with device.slot():
+                    pdu_start = perf_counter()
+                    errorIndication, errorStatus, errorIndex, varBindTable = await bulk_cmd(
+                        self._engine,
+                        self._read_community,
+                        self._transport,
+                        self._context,
+                        0, self._max_repetitions,
+                        request_object,
+                        lookupMib=False
+                    )
+                pdu_end = perf_counter()
+                METRICS.record_pdu(labels, pdu_end - pdu_start, len(varBindTable))
+                add_span("pdu", pdu_start, pdu_end, walk_span, varbinds=len(varBindTable), attempt=attempt)
+
+                # the same pdu is sent again with longer timeout
+                if isinstance(errorIndication, errind.RequestTimedOut):
+                    if device.take_retry(attempt):
+                        attempt += 1
+                        METRICS.increment("snmp_retries_total", labels)
+                        self._transport.timeout = device.timeout(attempt)
+                        continue
+                    device.on_failure()
+                elif not errorIndication:
+                    device.on_response(pdu_end - pdu_start, attempt)
+                    attempt = 0
+                    self._transport.timeout = device.timeout()
+
+                # snmp v1 noSuchName leaked through proxy means the end of walk, as pysnmp walk treats it
+                if errorStatus == 2:
+                    errorStatus, errorIndex, varBindTable = 0, 0, ()
+
+                # walk ends on error, end of mib or the first oid out of walked subtree
+                varBinds = []
+                done = bool(errorIndication or errorStatus) or not varBindTable
+                for varBind in varBindTable:
+                    if isinstance(varBind[1], (Null, EndOfMibView)) or not root.isPrefixOf(varBind[0]):
+                        done = True
+                        break
+                    varBinds.append(varBind)
+                if varBinds:
+                    request_object = (varBinds[-1][0], Null(""))
+
+                walk_size += len(varBinds)
+                error = SNMPClient._error_kind(errorIndication, errorStatus)
+
+                try:
+                    SNMPClient._check_errors(errorIndication, errorStatus, errorIndex, varBinds, payload)
+                except SNMPTransportError:
+                    raise
+                except SNMPProtocolError:
+                    raise
+                
+                if SNMPClient._recorder is not None:
+                    SNMPClient._recorder.record(self._ipaddress, self._model, varBinds)
+                
+                # the whole pdu is decoded before yielding, so decoding time is measured apart from consumer
+                decoded = [(str(varBind[0]), SNMPClient._convert_result_value(varBind[1], payload)) for varBind in varBinds]
+                add_span("decode", pdu_end, perf_counter(), walk_span)
+
+                for oid, value in decoded:
+                    yield oid, value
+        finally:
+            METRICS.record_walk(labels, perf_counter() - walk_start, walk_size, error)
+            if walk_span is not None:
+                walk_span.set_attribute("varbinds", walk_size)
+            end_span(walk_span)
+    
+    # metrics are labeled by device, model, oid.yaml section of the first requested oid and operation
+    def _metrics_labels(self, operation: str, payload: PayloadData) -> Labels:
+        oid = next(iter(payload.values()))["oid"]
+        return (
+            ("device", self._ipaddress),
+            ("model", self._model or "unknown"),
+            ("section", SNMPClient._oid_sections.get(oid, "unknown")),
+            ("operation", operation)
+        )
+    
+    @staticmethod
+    def _error_kind(errorIndication, errorStatus) -> str | None:
+        if isinstance(errorIndication, errind.RequestTimedOut):
+            return "timeout"
+        if errorIndication:
+            return "transport"
+        if errorStatus:
+            return "protocol"
+        return None
     
     # handle result of switch reboot/reset
     async def _action_after_system_reboot(self, system_reboot_mode: str) -> None:
+        # nothing cached about switch tables is valid after reboot
+        SwitchTableCache.drop(self._ipaddress, self._agent_port)
+        DeviceTimeout.drop(self._ipaddress, self._agent_port)
+        FingerprintCache.drop(self._fingerprint_key)
+
         # for reset system mode, ip address is default now
         if system_reboot_mode == "reset_config_and_reboot":
             self._ipaddress = SNMP.DEFAULT_IP
             # if device was found online, create new transport and continue work
             if self._wait_for_device_online():
-                self._transport = await UdpTransportTarget.create((self._ipaddress, 161), retries=2)
+                self._transport = await self._create_transport()
             # raise an exception otherwise
             else:
                 raise RuntimeError("Failed to establish connection with device with ip:", self._ipaddress)
@@ -236,7 +479,7 @@ class SNMPClient(ABC):
         old_ip = self._ipaddress
         self._ipaddress = ip
         # create new transport
-        self._transport = await UdpTransportTarget.create((self._ipaddress, 161), retries=2)
+        self._transport = await self._create_transport()
 
         try:
             # if identified, everything is fine
@@ -244,11 +487,12 @@ class SNMPClient(ABC):
         except SNMPTransportError:
             # if not, create transport with old ip and raise an exception
             self._ipaddress = old_ip
-            self._transport = await UdpTransportTarget.create((self._ipaddress, 161), retries=2)
+            self._transport = await self._create_transport()
             raise RuntimeError("Failed to identify device with ip:", ip)
     
     # form payload for request from oid fragment by oids list (get request) or dict (set)
     @staticmethod
+    @traced
     def _compose_request_payload(request_type: SNMPRequestType, config_fragment: dict[str, Any], include_params: list[str] | dict[str, Any]) -> PayloadData:
         result = {}
 
@@ -336,9 +580,12 @@ class SNMPClient(ABC):
         return "-".join([octet_string[2*i:2*i+2].upper() for i in range(1, 7)])
 
     @abstractmethod
-    def _render_get_set_oid(self, oid: str, **params) -> str:
+    def _render_get_set_oid(self, oid: str, **params) -> tuple[int, ...]:
         pass
 
-    @staticmethod
-    def _render_bulk_walk_oid(oid: str) -> str:
-        return re.sub(r"\.{.*", "", oid)
\ No newline at end of file
+    # object type with identity resolved once per oid, without mib lookup on every request
+    def _object_type(self, oid: tuple[int, ...], value: Any = None) -> ObjectType:
+        if (identity := SNMPClient._resolved_identities.get(oid)) is None:
+            mib_view_controller = CommandGeneratorVarBinds.get_mib_view_controller(self._engine.cache)
+            identity = SNMPClient._resolved_identities[oid] = ObjectIdentity(ObjectName(oid)).resolve_with_mib(mib_view_controller)
+        return ObjectType(identity) if value is None else ObjectType(identity, value)
\ No newline at end of file
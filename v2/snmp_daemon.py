@@ -0,0 +1,214 @@
+#!/usr/bin/python3
+import asyncio
+import argparse
+import inspect
+import json
+import os
+from collections import OrderedDict
+from enum import Enum
+from typing import Any
+from time import monotonic
+# local modules
+from const import SNMP
+from snmp_client import SNMPClient
+from L2_switch_client import L2SwitchClient
+from switch_table_cache import SwitchTableCache
+from snmp_metrics import METRICS
+from snmp_exceptions import SNMPTransportError
+
+# switch ip, switch port (None for switch-wide methods), agent port
+type ClientKey = tuple[str, int | None, int]
+
+# warm clients cached by switch and port, least recently used ones are dropped
+class ClientPool:
+    _max_clients: int
+    _clients: OrderedDict[ClientKey, L2SwitchClient]
+    _creating: dict[ClientKey, asyncio.Task]
+    _last_used: dict[ClientKey, float]
+    _device_slots: dict[str, asyncio.Semaphore]
+    _device_waiting: dict[str, int]
+    _device_active: dict[str, int]
+    stats: dict[str, int]
+
+    def __init__(self, max_clients: int = SNMP.DAEMON_MAX_CLIENTS) -> None:
+        self._max_clients = max_clients
+        self._clients = OrderedDict()
+        self._creating = {}
+        self._last_used = {}
+        self._device_slots = {}
+        self._device_waiting = {}
+        self._device_active = {}
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "requests": 0, "errors": 0}
+
+    async def get(self, key: ClientKey) -> L2SwitchClient:
+        if (client := self._clients.get(key)) is not None:
+            self._clients.move_to_end(key)
+            self.stats["hits"] += 1
+        else:
+            self.stats["misses"] += 1
+            # concurrent requests to the same new client wait for one identification
+            if (task := self._creating.get(key)) is None:
+                task = self._creating[key] = asyncio.create_task(L2SwitchClient.create(key[0], key[1], key[2]))
+            try:
+                client = await task
+            finally:
+                self._creating.pop(key, None)
+            self._add(key, client)
+
+        self._last_used[key] = monotonic()
+        return client
+
+    def _add(self, key: ClientKey, client: L2SwitchClient) -> None:
+        self._clients[key] = client
+        self._clients.move_to_end(key)
+        while len(self._clients) > self._max_clients:
+            old_key, _ = self._clients.popitem(last=False)
+            self._last_used.pop(old_key, None)
+            self._drop_tables(old_key)
+            self.stats["evictions"] += 1
+
+    # client that failed isn't kept, the next request identifies the switch again
+    def drop(self, key: ClientKey) -> None:
+        self._clients.pop(key, None)
+        self._last_used.pop(key, None)
+        self._drop_tables(key)
+
+    # switch tables are shared by port clients, so they are dropped with the last client of the switch
+    def _drop_tables(self, key: ClientKey) -> None:
+        ipaddress, _, agent_port = key
+        if not any(other[0] == ipaddress and other[2] == agent_port for other in self._clients):
+            SwitchTableCache.drop(ipaddress, agent_port)
+
+    # requests to one switch are limited, others wait in queue
+    def device_slot(self, ipaddress: str) -> asyncio.Semaphore:
+        if (slot := self._device_slots.get(ipaddress)) is None:
+            slot = self._device_slots[ipaddress] = asyncio.Semaphore(SNMP.DAEMON_REQUESTS_PER_DEVICE)
+        return slot
+
+    async def call(self, key: ClientKey, method: str) -> Any:
+        self.stats["requests"] += 1
+        ipaddress = key[0]
+        slot = self.device_slot(ipaddress)
+
+        self._device_waiting[ipaddress] = self._device_waiting.get(ipaddress, 0) + 1
+        try:
+            await slot.acquire()
+        finally:
+            self._device_waiting[ipaddress] -= 1
+
+        self._device_active[ipaddress] = self._device_active.get(ipaddress, 0) + 1
+        try:
+            client = await self.get(key)
+            function = getattr(client, method)
+            return await function()
+        except Exception as err:
+            self.stats["errors"] += 1
+            if isinstance(err, SNMPTransportError):
+                self.drop(key)
+            raise
+        finally:
+            self._device_active[ipaddress] -= 1
+            slot.release()
+
+    # cache state for status command, the most recently used clients first
+    def status(self) -> dict[str, Any]:
+        now = monotonic()
+        return {
+            **self.stats,
+            "clients_count": len(self._clients),
+            "max_clients": self._max_clients,
+            "clients": [
+                {
+                    "switch": ipaddress,
+                    "port": port,
+                    "agent_port": agent_port,
+                    "model": client._model,
+                    "idle_s": round(now - self._last_used[(ipaddress, port, agent_port)], 1)
+                }
+                for (ipaddress, port, agent_port), client in reversed(self._clients.items())
+            ],
+            # only devices with requests in progress
+            "devices": {
+                ipaddress: {"active": active, "waiting": self._device_waiting.get(ipaddress, 0)}
+                for ipaddress, active in self._device_active.items()
+                if active or self._device_waiting.get(ipaddress)
+            }
+        }
+
+# only reading methods of the client can be called, changes of switch config go through L2SwitchHandler with validation
+def is_read_method(method: Any) -> bool:
+    return (isinstance(method, str) and (method.startswith("get_") or method == "scan_available_mibs")
+            and inspect.iscoroutinefunction(getattr(L2SwitchClient, method, None)))
+
+# sets, response codes and other python values in json
+def to_json(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if isinstance(value, Enum):
+        return value.name
+    return str(value)
+
+# one json request per line, one json response per line: {ok, result} or {ok, error}
+class SNMPDaemon:
+    _pool: ClientPool
+    _started: float
+
+    def __init__(self, max_clients: int = SNMP.DAEMON_MAX_CLIENTS) -> None:
+        self._pool = ClientPool(max_clients)
+        self._started = monotonic()
+
+    async def serve(self, socket_path: str = SNMP.DAEMON_SOCKET) -> None:
+        # all clients work through one engine and its socket
+        SNMPClient.use_shared_engine()
+        SNMPClient._load_config()
+
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = await asyncio.start_unix_server(self._handle_connection, path=socket_path)
+        os.chmod(socket_path, 0o600)
+        print("Listening:", socket_path)
+
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                response = await self._handle_request(line)
+                writer.write(json.dumps(response, default=to_json).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, line: bytes) -> dict[str, Any]:
+        try:
+            request = json.loads(line)
+            match request.get("method"):
+                case "status":
+                    result = {"uptime_s": round(monotonic() - self._started, 1), **self._pool.status()}
+                case "metrics":
+                    result = METRICS.to_prometheus()
+                case method if is_read_method(method):
+                    key = (request["switch"], request.get("port"), request.get("agent_port", SNMP.AGENT_PORT))
+                    result = await self._pool.call(key, method)
+                case method:
+                    raise ValueError(f"Unknown method: {method}")
+        except Exception as err:
+            return {"ok": False, "error": f"{type(err).__name__}: {err}"}
+        return {"ok": True, "result": result}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local daemon keeping warm L2SwitchClient instances for snmp_cli.py")
+    parser.add_argument("--socket", default=SNMP.DAEMON_SOCKET)
+    parser.add_argument("--max-clients", type=int, default=SNMP.DAEMON_MAX_CLIENTS)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(SNMPDaemon(args.max_clients).serve(args.socket))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/python3
+from bisect import bisect_left
+from typing import Any
+
+type Labels = tuple[tuple[str, str], ...]
+
+# upper bounds of histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+VARBINDS_PER_PDU_BUCKETS = (1, 2, 5, 10, 20, 30, 40, 50, 100)
+WALK_SIZE_BUCKETS = (1, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+
+# metric name: (type, help)
+METRICS_INFO = {
+    "snmp_request_duration_seconds": ("histogram", "Duration of get/set request or whole walk"),
+    "snmp_pdu_duration_seconds": ("histogram", "Round trip of one request pdu, for walks each getbulk pdu separately"),
+    "snmp_varbinds_per_pdu": ("histogram", "Number of varbinds in response pdu"),
+    "snmp_walk_varbinds": ("histogram", "Number of varbinds received by one walk"),
+    "snmp_requests_total": ("counter", "Number of get/set requests and walks"),
+    "snmp_pdus_total": ("counter", "Number of request pdus sent"),
+    "snmp_retries_total": ("counter", "Number of request pdus sent again after timeout"),
+    "snmp_errors_total": ("counter", "Number of failed requests by error kind"),
+    "snmp_fingerprint_total": ("counter", "Number of device identifications by fingerprint cache result"),
+}
+
+class Histogram:
+    _buckets: tuple[float, ...]
+    _counts: list[int]
+    count: int
+    sum: float
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self._buckets = buckets
+        # the last one is +Inf bucket
+        self._counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    # cumulative counts as prometheus expects, le: count
+    def cumulative(self) -> list[tuple[str, int]]:
+        result = []
+        total = 0
+        for bound, count in zip((*map(str, self._buckets), "+Inf"), self._counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+# in-process registry of snmp metrics labeled by device, model, oid.yaml section and operation
+class SNMPMetrics:
+    _histograms: dict[tuple[str, Labels], Histogram]
+    _counters: dict[tuple[str, Labels], float]
+
+    def __init__(self) -> None:
+        self._histograms = {}
+        self._counters = {}
+
+    def reset(self) -> None:
+        self._histograms.clear()
+        self._counters.clear()
+
+    def observe(self, name: str, labels: Labels, value: float, buckets: tuple[float, ...]) -> None:
+        if (histogram := self._histograms.get((name, labels))) is None:
+            histogram = self._histograms[(name, labels)] = Histogram(buckets)
+        histogram.observe(value)
+
+    def increment(self, name: str, labels: Labels, value: float = 1) -> None:
+        self._counters[(name, labels)] = self._counters.get((name, labels), 0) + value
+
+    # one get/set request after all its pdus including retries
+    def record_request(self, labels: Labels, seconds: float, error: str | None) -> None:
+        self.observe("snmp_request_duration_seconds", labels, seconds, LATENCY_BUCKETS)
+        self.increment("snmp_requests_total", labels)
+        if error is not None:
+            self.increment("snmp_errors_total", labels + (("kind", error),))
+
+    # one pdu sent by a walk or a request, timed out one too
+    def record_pdu(self, labels: Labels, seconds: float, varbinds: int) -> None:
+        self.observe("snmp_pdu_duration_seconds", labels, seconds, LATENCY_BUCKETS)
+        self.observe("snmp_varbinds_per_pdu", labels, varbinds, VARBINDS_PER_PDU_BUCKETS)
+        self.increment("snmp_pdus_total", labels)
+
+    # whole walk after all its pdus
+    def record_walk(self, labels: Labels, seconds: float, varbinds: int, error: str | None) -> None:
+        self.observe("snmp_request_duration_seconds", labels, seconds, LATENCY_BUCKETS)
+        self.observe("snmp_walk_varbinds", labels, varbinds, WALK_SIZE_BUCKETS)
+        self.increment("snmp_requests_total", labels)
+        if error is not None:
+            self.increment("snmp_errors_total", labels + (("kind", error),))
+
+    # plain structure for in-process use: {metric: [{labels, value} or {labels, count, sum, buckets}]}
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        result = {}
+
+        for (name, labels), value in self._counters.items():
+            result.setdefault(name, []).append({"labels": dict(labels), "value": value})
+
+        for (name, labels), histogram in self._histograms.items():
+            result.setdefault(name, []).append({
+                "labels": dict(labels),
+                "count": histogram.count,
+                "sum": histogram.sum,
+                "buckets": dict(histogram.cumulative())
+            })
+
+        return result
+
+    # prometheus text exposition format
+    def to_prometheus(self) -> str:
+        lines = []
+        snapshot = self.snapshot()
+
+        for name, (metric_type, description) in METRICS_INFO.items():
+            if name not in snapshot:
+                continue
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+            for sample in snapshot[name]:
+                labels = sample["labels"]
+                if metric_type == "counter":
+                    lines.append(f"{name}{SNMPMetrics._format_labels(labels)} {sample['value']}")
+                    continue
+                for bound, count in sample["buckets"].items():
+                    lines.append(f"{name}_bucket{SNMPMetrics._format_labels({**labels, 'le': bound})} {count}")
+                lines.append(f"{name}_sum{SNMPMetrics._format_labels(labels)} {sample['sum']}")
+                lines.append(f"{name}_count{SNMPMetrics._format_labels(labels)} {sample['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _format_labels(labels: dict[str, str]) -> str:
+        escaped = (f'{key}="{str(value).replace("\\", "\\\\").replace('"', '\\"')}"' for key, value in labels.items())
+        return "{" + ",".join(escaped) + "}"
+
+
+# registry shared by all clients of the process
+METRICS = SNMPMetrics()
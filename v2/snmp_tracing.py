@@ -0,0 +1,174 @@
+#!/usr/bin/python3
+import os
+import sys
+import json
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+from time import perf_counter
+from typing import Any, Callable, TextIO
+
+# timing of one operation with nested operations inside it
+class Span:
+    __slots__ = ("name", "attributes", "start", "end", "children")
+
+    name: str
+    attributes: dict[str, Any]
+    start: float
+    end: float | None
+    children: list["Span"]
+
+    def __init__(self, name: str, attributes: dict[str, Any], start: float | None = None) -> None:
+        self.name = name
+        self.attributes = attributes
+        self.start = perf_counter() if start is None else start
+        self.end = None
+        self.children = []
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end or perf_counter()) - self.start) * 1000
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "children": [child.as_dict() for child in self.children]
+        }
+
+# the only object returned when tracing is disabled, does nothing
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+NULL_SPAN = _NullSpan()
+
+# span of the current task, child spans are attached to it
+_current_span: ContextVar[Span | None] = ContextVar("snmp_current_span", default=None)
+
+# output mode: None when disabled, "tree" or "json", can be set by SNMP_TRACE env
+_mode: str | None = os.environ.get("SNMP_TRACE") or None
+_output: TextIO = sys.stderr
+
+def enable(mode: str = "tree", output: TextIO | None = None) -> None:
+    global _mode, _output
+    if mode not in ("tree", "json"):
+        raise ValueError("Trace mode must be tree or json")
+    _mode = mode
+    _output = output or sys.stderr
+
+def disable() -> None:
+    global _mode
+    _mode = None
+
+def is_enabled() -> bool:
+    return _mode is not None
+
+# context manager making span current for code inside it
+class _ActiveSpan:
+    __slots__ = ("_span", "_token")
+
+    def __init__(self, name: str, attributes: dict[str, Any]) -> None:
+        self._span = start_span(name, **attributes)
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self._span.set_attribute("error", exc_type.__name__)
+        end_span(self._span)
+
+# usage: with span("name", key=value): ...
+def span(name: str, **attributes: Any) -> _ActiveSpan | _NullSpan:
+    if _mode is None:
+        return NULL_SPAN
+    return _ActiveSpan(name, attributes)
+
+# span that isn't made current, for async generators where context can't be kept between yields
+def start_span(name: str, **attributes: Any) -> Span | None:
+    if _mode is None:
+        return None
+
+    new_span = Span(name, attributes)
+    if (parent := _current_span.get()) is not None:
+        parent.children.append(new_span)
+    else:
+        # root span is marked to be exported when finished
+        new_span.attributes["root"] = True
+    return new_span
+
+def end_span(finished_span: Span | None) -> None:
+    if finished_span is None:
+        return
+
+    finished_span.end = perf_counter()
+    if finished_span.attributes.pop("root", False):
+        _export(finished_span)
+
+# add already measured span, e.g. round trip of one pdu inside walk
+def add_span(name: str, start: float, end: float, parent: Span | None, **attributes: Any) -> None:
+    if parent is None:
+        return
+
+    child = Span(name, attributes, start)
+    child.end = end
+    parent.children.append(child)
+
+# decorator for sync and async functions, span is named by function qualname
+def traced(func: Callable) -> Callable:
+    name = func.__qualname__
+
+    if iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if _mode is None:
+                return await func(*args, **kwargs)
+            with _ActiveSpan(name, {}):
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if _mode is None:
+            return func(*args, **kwargs)
+        with _ActiveSpan(name, {}):
+            return func(*args, **kwargs)
+    return wrapper
+
+# class decorator tracing all public coroutine methods defined in the class
+def trace_methods(cls: type) -> type:
+    for attr_name, value in list(vars(cls).items()):
+        if not attr_name.startswith("_") and iscoroutinefunction(value):
+            setattr(cls, attr_name, traced(value))
+    return cls
+
+def _export(root: Span) -> None:
+    if _mode == "json":
+        print(json.dumps(root.as_dict(), default=str), file=_output, flush=True)
+        return
+
+    lines = []
+    _format_tree(root, 0, lines)
+    print("\n".join(lines), file=_output, flush=True)
+
+# one line per span, children are indented under their parent
+def _format_tree(current: Span, depth: int, lines: list[str]) -> None:
+    attributes = " ".join(f"{key}={value}" for key, value in current.attributes.items())
+    lines.append(f"{current.duration_ms:10.3f} ms  {'  ' * depth}{current.name} {attributes}".rstrip())
+    for child in current.children:
+        _format_tree(child, depth + 1, lines)
@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+import asyncio
+from typing import Any, Awaitable, Callable, ClassVar, Self
+from copy import deepcopy
+from time import monotonic
+# local modules
+from const import SNMP
+
+# standard response data can have int key type
+type ResponseData = dict[str | int, Any]
+type TableLoader = Callable[[], Awaitable[ResponseData]]
+type IndexBuilder = Callable[[ResponseData], Any]
+
+# switch-wide tables cached once and shared by all port clients of the same switch
+class SwitchTableCache:
+    # agents on other ports of the same host are different switches, e.g. stand-in agents
+    _instances: ClassVar[dict[tuple[str, int], Self]] = {}
+
+    _locks: dict[str, asyncio.Lock]
+    _generations: dict[str, int]
+    _indices: dict[str, Any]
+    _loaded_at: dict[str, float]
+
+    def __init__(self) -> None:
+        self._locks = {}
+        self._generations = {}
+        self._indices = {}
+        self._loaded_at = {}
+
+    # get the only cache object for switch ip and agent port
+    @classmethod
+    def for_switch(cls, ipaddress: str, agent_port: int = SNMP.AGENT_PORT) -> Self:
+        if (cache := cls._instances.get((ipaddress, agent_port))) is None:
+            cache = cls._instances[(ipaddress, agent_port)] = cls()
+        return cache
+
+    # forget everything about the switch, e.g. after config reset
+    @classmethod
+    def drop(cls, ipaddress: str, agent_port: int = SNMP.AGENT_PORT) -> None:
+        cls._instances.pop((ipaddress, agent_port), None)
+
+    # common method to read the table once and keep its index until invalidation
+    async def _get_index(self, table: str, load_table: TableLoader, build_index: IndexBuilder) -> Any:
+        lock = self._locks.setdefault(table, asyncio.Lock())
+
+        async with lock:
+            # table changed on switch by someone else is seen after ttl at the latest
+            if monotonic() - self._loaded_at.get(table, 0) > SNMP.TABLE_CACHE_TTL:
+                self._indices.pop(table, None)
+
+            if (index := self._indices.get(table)) is None:
+                generation = self._generations.get(table, 0)
+                started = monotonic()
+                index = build_index(await load_table())
+                # keep index only if the table wasn't changed while it was being read
+                if generation == self._generations.get(table, 0):
+                    self._indices[table] = index
+                    self._loaded_at[table] = started
+
+        return index
+
+    # must be called after any change of the table on switch
+    def _invalidate(self, table: str) -> None:
+        self._generations[table] = self._generations.get(table, 0) + 1
+        self._indices.pop(table, None)
+
+    ### ACL ###
+
+    # get acl profiles affecting the port, the table is read only once for all ports
+    async def get_acl_for_port(self, port: int, load_acl_table: TableLoader) -> ResponseData:
+        acl_ports = await self._get_index("acl", load_acl_table, SwitchTableCache._build_acl_port_index)
+        # copy is needed for keeping shared index safe from caller's changes
+        return deepcopy(acl_ports.get(port, {}))
+
+    def invalidate_acl(self) -> None:
+        self._invalidate("acl")
+
+    # port: {profile_id: {type, mask_management, rule_management: {access_id: config}}}
+    @staticmethod
+    def _build_acl_port_index(acl_table: ResponseData) -> dict[int, ResponseData]:
+        result = {}
+
+        # go through all profile id configs
+        for profile_id, profile_id_config in acl_table.items():
+            # check all access ids' entries in the config
+            for access_id, access_id_config in profile_id_config["rule_management"].items():
+                # add access id rule for every port it works for
+                for port in access_id_config["ports"]:
+                    port_profiles = result.setdefault(port, {})
+                    # for new profile id, add new structure with type and mask
+                    if profile_id not in port_profiles:
+                        port_profiles[profile_id] = {
+                            "type": profile_id_config["type"],
+                            "mask_management": profile_id_config["mask_management"],
+                            "rule_management": {}
+                        }
+                    port_profiles[profile_id]["rule_management"][access_id] = access_id_config
+
+        return result
+
+    ### VLAN ###
+
+    # get tagged/untagged vlans of the port, the table is read only once for all ports
+    async def get_vlan_on_port(self, port: int, load_vlan_table: TableLoader) -> ResponseData:
+        vlan_ports = (await self._get_index("vlan", load_vlan_table, SwitchTableCache._build_vlan_index))["ports"]
+        port_vlans = vlan_ports.get(port)
+
+        # port without vlans has empty tagged/untagged sections
+        if port_vlans is None:
+            return {"tagged": {}, "untagged": {}}
+        return {status: dict(vlans) for status, vlans in port_vlans.items()}
+
+    # get vlan name by vlan id for all vlans
+    async def get_vlan_names(self, load_vlan_table: TableLoader) -> dict[int, str]:
+        vlans = (await self._get_index("vlan", load_vlan_table, SwitchTableCache._build_vlan_index))["vlans"]
+        return {vlan_id: vlan_data["vlan_name"] for vlan_id, vlan_data in vlans.items()}
+
+    def invalidate_vlan(self) -> None:
+        self._invalidate("vlan")
+
+    # vlans: {vlan_id: {vlan_name, tagged_ports, untagged_ports}}
+    # ports: {port: {tagged: {vlan_id: vlan_name}, untagged: {vlan_id: vlan_name}}}
+    @staticmethod
+    def _build_vlan_index(vlan_table: dict[int, dict[str, Any]]) -> dict[str, Any]:
+        ports = {}
+
+        for vlan_id, vlan_data in vlan_table.items():
+            vlan_name = vlan_data["vlan_name"]
+
+            for status in ("tagged", "untagged"):
+                for port in vlan_data[f"{status}_ports"]:
+                    if port not in ports:
+                        ports[port] = {"tagged": {}, "untagged": {}}
+                    ports[port][status][vlan_id] = vlan_name
+
+        return {"vlans": dict(vlan_table), "ports": ports}
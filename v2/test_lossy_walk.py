@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+import asyncio
+import os
+
+# stand-in agent accepts any community, but const needs env values to be set
+os.environ.setdefault("SNMP_READ_ONLY", "public")
+os.environ.setdefault("SNMP_READ_WRITE", "private")
+os.environ.setdefault("COUNTRY_NSERV_NNET", "0")
+
+from benchmark import SIZES, PORT, build_synthetic_fixture
+from snmp_agent import SNMPAgent
+from snmp_metrics import METRICS
+from device_timeout import DeviceTimeout
+from switch_table_cache import SwitchTableCache
+from L2_switch_client import L2SwitchClient
+from snmp_exceptions import SNMPTransportError
+from const import SNMP
+
+HOST = "127.0.0.1"
+AGENT_PORT = 20261
+
+# walk of fdb with given pdus of the walk lost, counting from 1: (fdb, walk pdus sent by client, retries counted)
+async def walk_with_loss(fixture, lost: set[int], agent_port: int) -> tuple[dict | None, int, int]:
+    loop = asyncio.get_running_loop()
+    agent = SNMPAgent(fixture)
+    await loop.create_datagram_endpoint(lambda: agent, local_addr=(HOST, agent_port))
+
+    try:
+        DeviceTimeout.drop(HOST, agent_port)
+        client = await L2SwitchClient.create(HOST, PORT, agent_port)
+        SwitchTableCache.drop(HOST, agent_port)
+        METRICS.reset()
+
+        before = agent.stats.requests
+        agent.drop = {before + number for number in lost}
+        try:
+            fdb = await client.get_fdb_table()
+        except SNMPTransportError:
+            fdb = None
+
+        retries = sum(item["value"] for item in METRICS.snapshot().get("snmp_retries_total", []))
+        return fdb, agent.stats.requests - before, int(retries)
+    finally:
+        agent.close()
+
+async def main() -> None:
+    fixture = build_synthetic_fixture(SIZES["medium"])
+
+    expected, pdus, retries = await walk_with_loss(fixture, set(), AGENT_PORT)
+    assert expected and retries == 0, (pdus, retries)
+
+    # every lost pdu is one resend and one retry
+    for port_offset, lost in enumerate(({2}, {2, 3}, {2, 5}), start=1):
+        fdb, lossy_pdus, retries = await walk_with_loss(fixture, lost, AGENT_PORT + port_offset)
+        assert fdb == expected, f"lost {lost}: walk failed"
+        assert lossy_pdus == pdus + len(lost) and retries == len(lost), f"lost {lost}: pdus {lossy_pdus - pdus}, retries {retries}"
+        print(f"lost {sorted(lost)}: ok, {retries} retries")
+
+    # one loss more than retries of the pdu fails the walk
+    lost = set(range(2, SNMP.MAX_RETRIES + 3))
+    fdb, lossy_pdus, retries = await walk_with_loss(fixture, lost, AGENT_PORT + 4)
+    assert fdb is None and retries == SNMP.MAX_RETRIES, f"lost {lost}: retries {retries}"
+    print(f"lost {sorted(lost)}: failed as expected, {retries} retries")
+
+if __name__ == "__main__":
+    asyncio.run(main())